@@ -1,54 +1,104 @@
 import tkinter as tk
 from tkinter import ttk
-import pandas as pd
+from datetime import datetime
+from ercot_dart.cdr_site import cst, get_next_and_last_four_days
+from ercot_dart.data_bus import default_bus
+from ercot_dart.metrics import span
+from fetch_executor import call_on_tk, run_in_background
+from snapshot_cache import save_snapshot, show_snapshot
+from table_view import VirtualTable
 
-# Function to calculate and display the basis (difference between DAM and RT)
-def calculate_basis(rt_data, dam_data):
-    # Ensure the columns match between the two datasets
-    common_columns = ['Settlement Point'] + [col for col in rt_data.columns if col in dam_data.columns and col != 'Settlement Point']
+# Function to load a day's basis (DAM minus RT, by hour ending) from the shared data
+# bus (runs on the fetch pool). The spreads are computed from the same DAM and RT SPP
+# frames the other tabs show, and only again when one of them changes; refresh=True
+# re-fetches both first
+def load_basis_data(day, refresh=False):
+    with span('load', tab='basis'):
+        return default_bus.get('basis', day, refresh)
 
-    # Merge the two datasets on the 'Settlement Point' column
-    merged_data = pd.merge(rt_data, dam_data, on='Settlement Point', suffixes=('_RT', '_DAM'))
+# Function to show basis data in the GUI (runs on the Tk thread)
+def update_basis_table(table, time_label, basis_data):
+    if basis_data.empty:
+        print("No data available.")
+        return
 
-    # Calculate the basis for each column in common_columns, except 'Settlement Point'
-    for col in common_columns:
-        if col != 'Settlement Point':
-            merged_data[f'Basis_{col}'] = merged_data[f'{col}_RT'] - merged_data[f'{col}_DAM']
+    with span('render', tab='basis'):
+        table.set_data(basis_data)
 
-    # Return only the Settlement Point and the calculated basis columns
-    basis_columns = ['Settlement Point'] + [f'Basis_{col}' for col in common_columns if col != 'Settlement Point']
-    return merged_data[basis_columns]
+    # Update the time label to CST
+    now_cst = datetime.now(cst)
+    time_label.set("Last Updated: " + now_cst.strftime("%H:%M:%S %Z"))
+    save_snapshot('basis', basis_data, now_cst.strftime("%Y-%m-%d %H:%M:%S %Z"))
 
 # Function to create the Basis Data tab and its elements
-def create_basis_tab(frame, rt_data, dam_data):
-    # Calculate the basis
-    basis_data = calculate_basis(rt_data, dam_data)
+def create_basis_tab(frame):
+    # Create a label for the drop-down menu
+    tk.Label(frame, text="Operating Day:", font=("Helvetica", 12)).grid(
+        row=0, column=0, padx=10, pady=10, sticky=tk.W)
 
-    # Create Treeview to display the basis data
-    columns = basis_data.columns.tolist()
+    # Create a Combobox for the Operating Day
+    operating_days = get_next_and_last_four_days()
+    operating_day_combobox = ttk.Combobox(frame, values=operating_days,
+                                          font=("Helvetica", 12))
+    operating_day_combobox.grid(row=0, column=1, padx=10, pady=10, sticky=tk.W)
 
-    style = ttk.Style()
-    style.configure("Treeview.Heading", font=("Helvetica", 12))
-    style.configure("Treeview", font=("Helvetica", 12))
+    # Set the default value to today's date
+    today = datetime.now(cst).strftime('%Y-%m-%d')
+    if today in operating_days:
+        operating_day_combobox.set(today)
+    else:
+        operating_day_combobox.current(0)
 
-    tree = ttk.Treeview(frame, columns=columns, show='headings', height=24)
-    for col in columns:
-        tree.heading(col, text=col)
-        tree.column(col, width=150, anchor=tk.CENTER)
+    # Table of DART spreads (DAM minus RT) by hour ending
+    columns = [
+        'Oper Day', 'Hour Ending', 'HB_BUSAVG', 'HB_HOUSTON', 'HB_HUBAVG', 'HB_NORTH',
+        'HB_PAN', 'HB_SOUTH', 'HB_WEST', 'LZ_AEN', 'LZ_CPS', 'LZ_HOUSTON', 'LZ_LCRA',
+        'LZ_NORTH', 'LZ_RAYBN', 'LZ_SOUTH', 'LZ_WEST'
+    ]
+    table = VirtualTable(frame, columns, column_width=100, height=24,
+                         horizontal_scroll=True)
+    table.grid(row=1, column=0, columnspan=4, sticky=(tk.W, tk.E, tk.N, tk.S))
 
-    tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+    # Add a refresh button and time label
+    time_label = tk.StringVar()
+    tk.Label(frame, textvariable=time_label, font=("Helvetica", 12)).grid(
+        row=2, column=0, sticky=tk.W)
 
-    # Add a scrollbar
-    scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
-    tree.configure(yscroll=scrollbar.set)
-    scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+    # Function to get the day selected in the Combobox
+    def selected_day():
+        return datetime.strptime(operating_day_combobox.get(), '%Y-%m-%d').date()
 
-    # Insert basis data into the treeview
-    for index, row in basis_data.iterrows():
-        values = row.tolist()
-        tree.insert('', tk.END, values=values)
+    # Function to load a day's basis in the background and show it when it arrives
+    def show_basis_data(day, refresh=False):
+        return run_in_background(table.frame, load_basis_data, day, refresh,
+                                 on_done=lambda basis_data: update_basis_table(
+                                     table, time_label, basis_data))
 
-    # Make the frame and treeview expandable
-    frame.grid_rowconfigure(0, weight=1)
+    # Function to handle the refresh button click
+    def refresh_basis_data_button():
+        show_basis_data(selected_day(), refresh=True)
+
+    refresh_button = tk.Button(frame, text="Refresh Now", font=("Helvetica", 12),
+                               command=refresh_basis_data_button)
+    refresh_button.grid(row=3, column=0, pady=10)
+    operating_day_combobox.bind('<<ComboboxSelected>>',
+                                lambda _event: show_basis_data(selected_day()))
+
+    # Function to redraw when the DAM or RT SPP data behind the day on screen changes
+    # (refreshed in any tab)
+    def on_basis_update(day):
+        if day == selected_day():
+            show_basis_data(day)
+
+    # Make the frame and table expandable
+    frame.grid_rowconfigure(1, weight=1)
     frame.grid_columnconfigure(0, weight=1)
-    tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+    # Function to load the tab when first shown: last snapshot, then the selected day
+    def load():
+        show_snapshot(table, time_label, 'basis')
+        default_bus.subscribe('basis',
+                              lambda _view, day: call_on_tk(on_basis_update, day))
+        show_basis_data(selected_day())
+
+    return load
@@ -0,0 +1,70 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cdr_fixtures import FixtureSet  # noqa: E402
+
+from ercot_dart.bulk_ingest import find_pages, iter_parsed_pages  # noqa: E402
+from ercot_dart.price_store import PriceStore  # noqa: E402
+
+# Measures how bulk re-parsing scales with worker processes over a local page archive
+#
+#   python benchmarks/bench_ingest.py --days 365 --workers 1,2,4,8
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark process-pool bulk ingestion")
+    parser.add_argument('--days', type=int, default=365,
+                        help="days of DAM + RT SPP pages in the archive")
+    parser.add_argument('--workers', default=None,
+                        help="comma separated worker counts "
+                             "(default: 1 up to the core count)")
+    parser.add_argument('--chunk-size', type=int, default=16)
+    parser.add_argument('--store', action='store_true',
+                        help="also write each page to a scratch price store")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    if args.workers:
+        counts = [int(n) for n in args.workers.split(',')]
+    else:
+        counts = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+
+    fixtures = FixtureSet()
+    end = fixtures.pages['spp'][0]
+    with tempfile.TemporaryDirectory(prefix='ercot-ingest-') as workdir:
+        for i in range(args.days):
+            day = end - timedelta(days=i)
+            for kind, feed in (('dam_spp', 'dam'), ('real_time_spp', 'spp')):
+                path = os.path.join(workdir, f"{day:%Y%m%d}_{kind}.html")
+                with open(path, 'wb') as f:
+                    f.write(fixtures.day_page(feed, day))
+        pages = find_pages(workdir)
+        print(f"{len(pages)} pages, {cores} cores")
+
+        print(f"{'workers':>8}{'seconds':>10}{'pages/s':>10}{'speedup':>9}")
+        baseline = None
+        for n in counts:
+            store = None
+            if args.store:
+                store = PriceStore(os.path.join(workdir, f'store-{n}'))
+            start = time.perf_counter()
+            rows = 0
+            parsed = iter_parsed_pages(pages, workers=n, chunk_size=args.chunk_size)
+            for feed, day, long_df, error in parsed:
+                if error is None:
+                    rows += len(long_df)
+                    if store is not None:
+                        store.write_day(feed, day, long_df)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(f"{n:>8}{seconds:>10.2f}{len(pages) / seconds:>10.0f}"
+                  f"{baseline / seconds:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import sys
+import timeit
+from io import StringIO
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cdr_fixtures import load_fixture  # noqa: E402
+
+from ercot_dart.cdr_parser import parse_cdr_table  # noqa: E402
+
+# Compares the single-pass CDR table parser against the old BeautifulSoup +
+# pd.read_html path
+#
+#   python benchmarks/bench_parse.py --rt hb_lz.html \
+#       --dam 20240801_dam_spp.html --spp 20240801_real_time_spp.html
+#
+# Any page type not given falls back to its copy in benchmarks/fixtures.
+
+# Function with the parse steps the scrapers used before cdr_parser
+def old_parse(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    table = soup.find('table')
+    return pd.read_html(StringIO(str(table)))[0]
+
+# Function to load a saved page, or the fixture for its feed when no path was given
+def load_page(path, feed):
+    if path:
+        with open(path, 'rb') as f:
+            return f.read()
+    return load_fixture(feed)[1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CDR table parsing")
+    parser.add_argument('--rt', help="saved copy of hb_lz.html")
+    parser.add_argument('--dam', help="saved copy of a {date}_dam_spp.html page")
+    parser.add_argument('--spp', help="saved copy of a {date}_real_time_spp.html page")
+    parser.add_argument('--repeat', type=int, default=50, help="parses per timing run")
+    args = parser.parse_args()
+
+    pages = [
+        ('RT LMP', load_page(args.rt, 'rt'), ()),
+        ('DAM SPP', load_page(args.dam, 'dam'), ()),
+        ('RT SPP', load_page(args.spp, 'spp'), ('Interval Ending',)),
+    ]
+
+    print(f"{'page':<10}{'bytes':>10}{'rows':>7}"
+          f"{'old ms':>10}{'new ms':>10}{'speedup':>10}")
+    for name, content, text_columns in pages:
+        old_df = old_parse(content)
+        new_df = parse_cdr_table(content, text_columns=text_columns)
+        if old_df.shape != new_df.shape:
+            print(f"{name}: shape mismatch old={old_df.shape} new={new_df.shape}")
+
+        def best_time(parse):
+            return min(timeit.repeat(parse, number=args.repeat, repeat=3)) / args.repeat
+
+        old_time = best_time(lambda c=content: old_parse(c))
+        new_time = best_time(lambda c=content, t=text_columns: parse_cdr_table(c, t))
+        print(f"{name:<10}{len(content):>10}{len(new_df):>7}{old_time * 1000:>10.2f}"
+              f"{new_time * 1000:>10.2f}{old_time / new_time:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
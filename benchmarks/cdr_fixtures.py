@@ -0,0 +1,138 @@
+import argparse
+import glob
+import os
+import random
+import re
+import sys
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cdr_pages import dam_spp_page, real_time_lmp_page, real_time_spp_page  # noqa: E402
+
+# Saved copies of the three CDR pages the app reads, and "expansions" of them to any
+# other operating day, so the benchmarks never have to touch www.ercot.com
+#
+# The fixtures checked in under fixtures/ are NOT recordings of the live site: they
+# were built offline with --generate 2024-08-01 from the page builders in cdr_pages,
+# which copy the CDR markup (table classes, header row, "Last Updated" line) with
+# made-up prices. Every operating day has 96 RT SPP intervals and 24 DAM hours, so
+# the DST days are not laid out as ERCOT publishes them. Run --record on a machine
+# that can reach the CDR site to replace them with real pages.
+#
+#   python benchmarks/cdr_fixtures.py --record               # today's live pages
+#   python benchmarks/cdr_fixtures.py --generate 2024-08-01  # offline, from cdr_pages
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+_dated_name = re.compile(r'^(\d{8})_(dam_spp|real_time_spp)\.html$')
+_price_cell = re.compile(rb'(<td[^>]*>\s*)(-?\d+\.\d+)(\s*</td>)')
+
+# Function to find the saved page for a feed ('rt', 'dam' or 'spp'); returns
+# (operating day or None, bytes)
+def load_fixture(feed, fixture_dir=FIXTURE_DIR):
+    if feed == 'rt':
+        with open(os.path.join(fixture_dir, 'hb_lz.html'), 'rb') as f:
+            return None, f.read()
+    suffix = 'dam_spp' if feed == 'dam' else 'real_time_spp'
+    paths = sorted(glob.glob(os.path.join(fixture_dir, f'*_{suffix}.html')))
+    if not paths:
+        raise FileNotFoundError(f"No {suffix} fixture in {fixture_dir}")
+    match = _dated_name.match(os.path.basename(paths[-1]))
+    with open(paths[-1], 'rb') as f:
+        return datetime.strptime(match.group(1), '%Y%m%d').date(), f.read()
+
+# Function to turn a saved page for one operating day into a plausible page for
+# another: the dates are swapped and every price is scaled by a random per-page level
+# and per-cell noise
+def expand_page(content, source_day, target_day, seed=0):
+    rng = random.Random(seed)
+    level = rng.lognormvariate(0, 0.35)
+    content = content.replace(source_day.strftime('%m/%d/%Y').encode(),
+                              target_day.strftime('%m/%d/%Y').encode())
+
+    def jitter(match):
+        price = float(match.group(2)) * level * rng.uniform(0.85, 1.15)
+        return match.group(1) + f"{price:.2f}".encode() + match.group(3)
+
+    return _price_cell.sub(jitter, content)
+
+# Function to get a feed's page for any operating day, expanded from the saved copy
+class FixtureSet:
+    def __init__(self, fixture_dir=FIXTURE_DIR):
+        self.pages = {feed: load_fixture(feed, fixture_dir)
+                      for feed in ('rt', 'dam', 'spp')}
+
+    def real_time_page(self):
+        return self.pages['rt'][1]
+
+    def day_page(self, feed, day):
+        source_day, content = self.pages[feed]
+        if day == source_day:
+            return content
+        seed = day.toordinal() * 2 + (feed == 'spp')
+        return expand_page(content, source_day, day, seed=seed)
+
+    # Function to map a CDR page name (as in the url) to its content, or None if it
+    # is not a CDR page
+    def page_for_name(self, name):
+        if name == 'hb_lz.html':
+            return self.real_time_page()
+        match = _dated_name.match(name)
+        if match is None:
+            return None
+        day = datetime.strptime(match.group(1), '%Y%m%d').date()
+        return self.day_page('dam' if match.group(2) == 'dam_spp' else 'spp', day)
+
+# Function to save live copies of today's pages as the fixtures
+def record_fixtures(fixture_dir=FIXTURE_DIR):
+    from ercot_dart.cdr_site import cdr_base, cst
+    from ercot_dart.http_client import default_client
+
+    day = datetime.now(cst).date()
+    names = ['hb_lz.html', f"{day:%Y%m%d}_dam_spp.html",
+             f"{day:%Y%m%d}_real_time_spp.html"]
+    for old in glob.glob(os.path.join(fixture_dir, '*_spp.html')):
+        os.remove(old)
+    for name in names:
+        response = default_client.get(f"{cdr_base}/{name}")
+        response.raise_for_status()
+        with open(os.path.join(fixture_dir, name), 'wb') as f:
+            f.write(response.content)
+        print(f"Recorded {name} ({len(response.content)} bytes)")
+
+# Function to rebuild the fixtures offline from the page builders in cdr_pages
+def generate_fixtures(day, fixture_dir=FIXTURE_DIR):
+    updated = datetime(day.year, day.month, day.day, 10, 25, 13)
+    updated = updated.strftime('%b %d, %Y %H:%M:%S')
+    pages = {
+        'hb_lz.html': real_time_lmp_page(seed=1, updated=updated),
+        f"{day:%Y%m%d}_dam_spp.html": dam_spp_page(day, seed=1, updated=updated),
+        f"{day:%Y%m%d}_real_time_spp.html": real_time_spp_page(day, seed=1,
+                                                                 updated=updated),
+    }
+    for old in glob.glob(os.path.join(fixture_dir, '*_spp.html')):
+        os.remove(old)
+    for name, page in pages.items():
+        with open(os.path.join(fixture_dir, name), 'w') as f:
+            f.write(page)
+        print(f"Generated {name}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record or regenerate the CDR page fixtures")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--record', action='store_true',
+                       help="save today's live pages from the CDR site")
+    group.add_argument('--generate', metavar='YYYY-MM-DD',
+                       help="build pages for this day offline")
+    args = parser.parse_args()
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    if args.record:
+        record_fixtures()
+    else:
+        generate_fixtures(date.fromisoformat(args.generate))
+
+if __name__ == "__main__":
+    main()
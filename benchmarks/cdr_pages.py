@@ -0,0 +1,68 @@
+import random
+from datetime import datetime, timedelta
+
+# Builders for pages laid out like the ERCOT CDR html reports, used when no
+# saved copy of a page is available to benchmark against
+
+SETTLEMENT_POINTS = [
+    'HB_BUSAVG', 'HB_HOUSTON', 'HB_HUBAVG', 'HB_NORTH', 'HB_PAN', 'HB_SOUTH', 'HB_WEST',
+    'LZ_AEN', 'LZ_CPS', 'LZ_HOUSTON', 'LZ_LCRA',
+    'LZ_NORTH', 'LZ_RAYBN', 'LZ_SOUTH', 'LZ_WEST'
+]
+
+PAGE_HEAD = ('<!DOCTYPE html>\n'
+             '<html><head><title>{title}</title>'
+             '<link rel="stylesheet" href="/content/cdr/css/cdr.css"></head>\n'
+             '<body><div id="container">'
+             '<div class="schedTime rightAlign">Last Updated: {updated}</div>\n'
+             '<table class="tableStyle">\n')
+PAGE_TAIL = """</table>
+</div></body></html>
+"""
+
+# Function to render a header row and data rows as a CDR-style page
+def render_page(title, header, rows, updated=None):
+    updated = updated or datetime.now().strftime('%b %d, %Y %H:%M:%S')
+    parts = [PAGE_HEAD.format(title=title, updated=updated)]
+    cells = ''.join(f'<th class="headerValueClass">{name}</th>' for name in header)
+    parts.append(f'<tr>{cells}</tr>\n')
+    for row in rows:
+        cells = ''.join(f'<td class="labelClassCenter">{value}</td>' for value in row)
+        parts.append(f'<tr>{cells}</tr>\n')
+    parts.append(PAGE_TAIL)
+    return ''.join(parts)
+
+# Function to build a hb_lz.html style page (one row per settlement point)
+def real_time_lmp_page(seed=0, updated=None):
+    rng = random.Random(seed)
+    rows = [(point, f"{rng.uniform(15, 60):.2f}", f"{rng.uniform(-3, 3):.2f}")
+            for point in SETTLEMENT_POINTS]
+    return render_page('Real-Time LMPs for Hubs and Load Zones',
+                       ['Settlement Point', 'LMP', '5 Min Change to LMP'], rows,
+                       updated)
+
+# Function to build a {date}_dam_spp.html style page (one row per hour ending)
+def dam_spp_page(oper_day, seed=0, updated=None):
+    rng = random.Random(seed)
+    day = oper_day.strftime('%m/%d/%Y')
+    rows = []
+    for hour in range(1, 25):
+        prices = [f"{rng.uniform(15, 80):.2f}" for _ in SETTLEMENT_POINTS]
+        rows.append([day, f"{hour:02d}"] + prices)
+    return render_page('DAM Settlement Point Prices',
+                       ['Oper Day', 'Hour Ending'] + SETTLEMENT_POINTS, rows, updated)
+
+# Function to build a {date}_real_time_spp.html style page (one row per interval)
+def real_time_spp_page(oper_day, seed=0, intervals=96, updated=None):
+    rng = random.Random(seed)
+    day = oper_day.strftime('%m/%d/%Y')
+    start = datetime(oper_day.year, oper_day.month, oper_day.day)
+    rows = []
+    for i in range(1, intervals + 1):
+        ending = start + timedelta(minutes=15 * i)
+        label = '2400' if ending.day != start.day else ending.strftime('%H%M')
+        prices = [f"{rng.uniform(10, 120):.2f}" for _ in SETTLEMENT_POINTS]
+        rows.append([day, label] + prices)
+    return render_page('Real-Time Settlement Point Prices',
+                       ['Oper Day', 'Interval Ending'] + SETTLEMENT_POINTS, rows,
+                       updated)
@@ -0,0 +1,166 @@
+import argparse
+import gzip
+import hashlib
+import random
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cdr_fixtures import FixtureSet
+
+# Local stand-in for www.ercot.com/content/cdr/html, serving the fixtures (and their
+# expansions to any operating day) with optional latency and injected errors
+#
+#   python benchmarks/mock_cdr_server.py --port 8765 --latency 80 --jitter 40 \
+#       --error-rate 0.05
+#   ERCOT_CDR_BASE=http://127.0.0.1:8765/content/cdr/html python main.py
+
+CDR_PATH = '/content/cdr/html/'
+
+class MockCdrServer:
+    def __init__(self, fixtures=None, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, seed=0, max_pages=256):
+        self.fixtures = fixtures or FixtureSet()
+        self.latency = latency  # Seconds added to every response
+        self.jitter = jitter  # Extra random 0..jitter seconds
+        self.error_rate = error_rate  # Share of requests answered with a 503
+        self.rng = random.Random(seed)
+        self.max_pages = max_pages
+        self.pages = OrderedDict()  # name -> (etag, gzipped body), most recent last
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{CDR_PATH.rstrip('/')}"
+
+    # Function to get a page's ETag and gzipped body, building and caching it once
+    def page(self, name):
+        with self.lock:
+            if name in self.pages:
+                self.pages.move_to_end(name)
+                return self.pages[name]
+        content = self.fixtures.page_for_name(name)
+        if content is None:
+            return None
+        entry = (hashlib.sha1(content).hexdigest(),
+                 gzip.compress(content, compresslevel=6))
+        with self.lock:
+            self.pages[name] = entry
+            while len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+        return entry
+
+    # Function to decide how a request is answered: (delay in seconds, inject an error?)
+    def plan_response(self):
+        with self.lock:
+            self.requests += 1
+            delay = self.latency
+            if self.jitter:
+                delay += self.rng.uniform(0, self.jitter)
+            error = self.rng.random() < self.error_rate
+            if error:
+                self.errors += 1
+        return delay, error
+
+    def stats(self):
+        with self.lock:
+            return {'requests': self.requests, 'errors': self.errors,
+                    'not_modified': self.not_modified}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real site
+            # Headers and body go out as separate writes; with Nagle on, the body waits
+            # for the client's delayed ACK and every response gains ~40 ms
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                delay, error = server.plan_response()
+                if delay:
+                    time.sleep(delay)
+                if error:
+                    self._reply(503, b'Service Unavailable', {'Retry-After': '0'})
+                    return
+
+                name = self.path.split('?', 1)[0]
+                entry = None
+                if name.startswith(CDR_PATH):
+                    entry = server.page(name[len(CDR_PATH):])
+                if entry is None:
+                    self._reply(404, b'Not Found')
+                    return
+
+                etag, body = entry
+                if self.headers.get('If-None-Match') == f'"{etag}"':
+                    with server.lock:
+                        server.not_modified += 1
+                    self._reply(304, b'', {'ETag': f'"{etag}"'})
+                    return
+
+                headers = {'ETag': f'"{etag}"',
+                           'Content-Type': 'text/html; charset=utf-8'}
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    headers['Content-Encoding'] = 'gzip'
+                else:
+                    body = gzip.decompress(body)
+                self._reply(200, body, headers)
+
+            def _reply(self, status, body, headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body and status != 304:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
+
+    # Function to serve from a background thread (for use inside a benchmark run)
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       name='mock-cdr-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the CDR page fixtures locally")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="milliseconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help="up to this many extra random milliseconds")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="share of requests answered with a 503 (0-1)")
+    args = parser.parse_args()
+
+    server = MockCdrServer(host=args.host, port=args.port, latency=args.latency / 1000,
+                           jitter=args.jitter / 1000, error_rate=args.error_rate)
+    print(f"Serving CDR fixtures at {server.base_url} (set ERCOT_CDR_BASE to this)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
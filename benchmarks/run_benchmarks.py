@@ -0,0 +1,382 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cdr_fixtures import FixtureSet  # noqa: E402
+from mock_cdr_server import MockCdrServer  # noqa: E402
+
+from ercot_dart.aggregation import resample_prices  # noqa: E402
+from ercot_dart.basis_engine import dart_spreads  # noqa: E402
+from ercot_dart.cdr_parser import parse_cdr_table  # noqa: E402
+from ercot_dart.decimate import minmax_decimate  # noqa: E402
+from ercot_dart.export import default_export_name, export_range  # noqa: E402
+from ercot_dart.http_client import HttpClient  # noqa: E402
+from ercot_dart.page_cache import PageCache  # noqa: E402
+from ercot_dart.price_frames import dam_to_long, spp_to_long  # noqa: E402
+from ercot_dart.price_store import PriceStore  # noqa: E402
+from ercot_dart.series import load_series  # noqa: E402
+
+# Offline benchmark of every stage between the CDR site and the screen, run
+# against the fixtures served by a local mock server
+#
+#   python benchmarks/run_benchmarks.py --years 2 --latency 20 --error-rate 0.02
+#
+# Each run is saved to benchmarks/results/<commit>.json and compared with the
+# previous run (or --baseline), so a slower stage shows up between commits.
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Function to name the commit being measured ("-dirty" when tracked files have local
+# changes)
+def current_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True)
+        commit = commit.stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+# Function to call func(*args) `repeat` times; returns per-call seconds and last result
+def time_calls(func, *args, repeat=1):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+# Function to measure the peak Python/NumPy memory one call allocates
+def peak_memory(func, *args):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+# Function to turn samples into the numbers that get reported and saved
+def summarize(samples, units, unit, peak_bytes):
+    samples = np.asarray(samples)
+    return {
+        'n': int(len(samples)),
+        'p50_ms': float(np.percentile(samples, 50) * 1000),
+        'p99_ms': float(np.percentile(samples, 99) * 1000),
+        'mean_ms': float(samples.mean() * 1000),
+        'throughput': float(units / samples.sum()) if samples.sum() else 0.0,
+        'unit': unit,
+        'peak_mb': peak_bytes / 2 ** 20,
+    }
+
+# Function to build the synthetic history: one DAM and one RT SPP page per day,
+# expanded from the fixtures
+def build_pages(fixtures, days):
+    return {day: (fixtures.day_page('dam', day), fixtures.day_page('spp', day))
+            for day in days}
+
+# --- Stages ---------------------------------------------------------------------
+
+def stage_fetch(server, days, workdir):
+    client = HttpClient(backoff_base=0.05, backoff_max=0.5)
+    urls = [f"{server.base_url}/hb_lz.html"]
+    urls += [f"{server.base_url}/{day:%Y%m%d}_{kind}.html"
+             for day in days for kind in ('dam_spp', 'real_time_spp')]
+
+    def fetch_all():
+        total = 0
+        for url in urls:
+            response = client.get(url)
+            response.raise_for_status()
+            total += len(response.content)
+        return total
+
+    results = {}
+    samples = []
+    total_bytes = 0
+    for url in urls:
+        (sample,), response = time_calls(client.get, url)
+        response.raise_for_status()
+        samples.append(sample)
+        total_bytes += len(response.content)
+    megabytes = total_bytes / 2 ** 20
+    results['fetch'] = summarize(samples, megabytes, 'MB/s', peak_memory(fetch_all))
+    retries = sum(stats['retries'] for stats in client.stats().values())
+
+    # Same pages through the on-disk page cache: the first pass fills it, the second
+    # is all hits
+    cache = PageCache(os.path.join(workdir, 'pages'), client=client)
+    for url in urls:
+        cache.fetch(url)
+    samples = [time_calls(cache.fetch, url)[0][0] for url in urls]
+    peak = peak_memory(lambda: [cache.fetch(url) for url in urls])
+    results['fetch_cached'] = summarize(samples, megabytes, 'MB/s', peak)
+    client.close()
+    return results, retries
+
+def stage_parse(pages):
+    samples = []
+    rows = 0
+    dam_frames, spp_frames = [], []
+    for dam_page, spp_page in pages.values():
+        start = time.perf_counter()
+        dam = parse_cdr_table(dam_page)
+        samples.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        spp = parse_cdr_table(spp_page, text_columns=('Interval Ending',))
+        samples.append(time.perf_counter() - start)
+        rows += len(dam) + len(spp)
+        dam_frames.append(dam)
+        spp_frames.append(spp)
+
+    sample_page = next(iter(pages.values()))[1]
+    peak = peak_memory(parse_cdr_table, sample_page, ('Interval Ending',))
+    dam = pd.concat(dam_frames, ignore_index=True)
+    spp = pd.concat(spp_frames, ignore_index=True)
+    spp['Interval Ending'] = spp['Interval Ending'].str.zfill(4)
+    return summarize(samples, rows, 'rows/s', peak), dam, spp
+
+def stage_to_long(dam, spp, repeat):
+    def convert():
+        return dam_to_long(dam), spp_to_long(spp)
+
+    samples, (dam_long, spp_long) = time_calls(convert, repeat=repeat)
+    rows = (len(dam) + len(spp)) * repeat
+    return summarize(samples, rows, 'rows/s', peak_memory(convert)), dam_long, spp_long
+
+def stage_aggregate(spp, granularity, repeat):
+    samples, result = time_calls(resample_prices, spp, granularity, repeat=repeat)
+    peak = peak_memory(resample_prices, spp, granularity)
+    return summarize(samples, len(spp) * repeat, 'rows/s', peak), result
+
+def stage_basis(dam_long, spp_long, repeat):
+    samples, _ = time_calls(dart_spreads, dam_long, spp_long, repeat=repeat)
+    peak = peak_memory(dart_spreads, dam_long, spp_long)
+    return summarize(samples, len(spp_long) * repeat, 'rows/s', peak)
+
+# Function to time VirtualTable refreshes and scrolling; None when there is no display
+def stage_render(hourly, repeat):
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        print(f"Skipping render stage: {e}")
+        return None
+    from table_view import VirtualTable
+
+    root.geometry("1200x800")
+    table = VirtualTable(root, list(hourly.columns), height=24, horizontal_scroll=True)
+    table.grid(row=0, column=0)
+    root.update()
+
+    def refresh_and_scroll():
+        table.set_data(hourly)
+        for row in range(0, len(hourly), max(1, len(hourly) // 50)):
+            table.scroll_to(row)
+        root.update_idletasks()
+
+    samples, _ = time_calls(refresh_and_scroll, repeat=repeat)
+    peak = peak_memory(refresh_and_scroll)
+    root.destroy()
+    return summarize(samples, len(hourly) * repeat, 'rows/s', peak)
+
+# Function to time the chart tab's work: reading a whole range of hub prices back from
+# the store, and min/max decimating them to a 1200 pixel wide axes
+def stage_chart(store, days, repeat,
+                points=('HB_HOUSTON', 'HB_NORTH', 'HB_SOUTH', 'HB_WEST')):
+    def load():
+        return load_series('spp', days[0], days[-1], list(points), store=store,
+                           fetch_recent=False)
+
+    samples, series = time_calls(load, repeat=repeat)
+    n_prices = sum(len(x) for x, _ in series.values())
+    results = {'chart_load': summarize(samples, n_prices * repeat, 'prices/s',
+                                       peak_memory(load))}
+
+    def decimate():
+        return [minmax_decimate(x, y, 1200) for x, y in series.values()]
+
+    samples, _ = time_calls(decimate, repeat=repeat)
+    results['chart_decimate'] = summarize(samples, n_prices * repeat, 'prices/s',
+                                          peak_memory(decimate))
+    return results
+
+# Function to find the latest days (up to `days[-1]`) whose DAM and RT SPP rows are all
+# in the store; export_range would scrape any other day from the live site
+def complete_days(store, days):
+    complete = []
+    for day in reversed(days):
+        if not all(store.has_complete_day(feed, day) for feed in ('dam', 'spp')):
+            break
+        complete.insert(0, day)
+    return complete
+
+# Function to time the app's export path: filling the store, then export_range streaming
+# hourly settlements and DAM prices back out of it as CSV and Parquet
+def stage_export(dam_long, spp_long, days, workdir, repeat):
+    store = PriceStore(os.path.join(workdir, 'store'))
+    samples, _ = time_calls(store.write_days, 'spp', spp_long, repeat=repeat)
+    results = {'store_write': summarize(samples, len(spp_long) * repeat, 'rows/s',
+                                        peak_memory(store.write_days, 'spp', spp_long))}
+    store.write_days('dam', dam_long)
+
+    # The expanded fixtures have no repeated hour, so fall-back days are never complete
+    export_days = complete_days(store, days)
+    if not export_days:
+        print(f"export: skipped, {days[-1]} is not complete in the store")
+        return results
+    first, last = export_days[0], export_days[-1]
+    print(f"export: {first} to {last} ({len(export_days)} days)")
+    for name, kind, fmt in (('export_csv', 'hourly', 'csv'),
+                            ('export_parquet', 'hourly', 'parquet'),
+                            ('export_dam', 'dam', 'csv')):
+        path = os.path.join(workdir, default_export_name(kind, first, last, fmt))
+
+        def export(kind=kind, fmt=fmt, path=path):
+            return export_range(kind, first, last, path, fmt, store=store)
+
+        samples, rows = time_calls(export, repeat=repeat)
+        results[name] = summarize(samples, rows * repeat, 'rows/s', peak_memory(export))
+    return results
+
+# --- Reporting ------------------------------------------------------------------
+
+# Function to find the result file to compare against
+def find_baseline(baseline, current_path):
+    if baseline:
+        path = baseline
+        if not os.path.exists(path):
+            path = os.path.join(RESULTS_DIR, f"{baseline}.json")
+        return path if os.path.exists(path) else None
+    current_path = os.path.abspath(current_path)
+    paths = [path for path in glob.glob(os.path.join(RESULTS_DIR, '*.json'))
+             if os.path.abspath(path) != current_path]
+    return max(paths, key=os.path.getmtime) if paths else None
+
+def print_report(result, baseline, threshold):
+    base_stages = baseline['stages'] if baseline else {}
+    base_commit = baseline['commit'] if baseline else '-'
+    print(f"\n{'stage':<16}{'n':>6}{'p50 ms':>10}{'p99 ms':>10}{'throughput':>18}"
+          f"{'peak MB':>9}  vs {base_commit}")
+    regressions = []
+    for name, stage in result['stages'].items():
+        line = (f"{name:<16}{stage['n']:>6}"
+                f"{stage['p50_ms']:>10.2f}{stage['p99_ms']:>10.2f}"
+                f"{stage['throughput']:>12.1f} {stage['unit']:<5}"
+                f"{stage['peak_mb']:>9.1f}")
+        base = base_stages.get(name)
+        if base and base['p50_ms'] > 0:
+            change = stage['p50_ms'] / base['p50_ms'] - 1
+            line += f"  {change:+7.1%}"
+            if change > threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark fetch, parse, aggregate, basis, render and export "
+                    "offline")
+    parser.add_argument('--years', type=float, default=2,
+                        help="years of synthetic history to expand the fixtures to")
+    parser.add_argument('--end', type=date.fromisoformat, default=None,
+                        help="last operating day (default: the fixture day)")
+    parser.add_argument('--fetch-days', type=int, default=20,
+                        help="days of pages to fetch through the mock server")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="mock server latency in milliseconds")
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help="mock server extra random latency in milliseconds")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="share of mock responses that are 503s")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="runs per whole-dataset stage")
+    parser.add_argument('--baseline',
+                        help="result file or commit to compare with "
+                             "(default: the latest saved run)")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="p50 slow-down reported as a regression")
+    parser.add_argument('--no-save', action='store_true',
+                        help="don't write the result file")
+    args = parser.parse_args()
+
+    fixtures = FixtureSet()
+    end = args.end or fixtures.pages['spp'][0]
+    days = [end - timedelta(days=i) for i in range(int(args.years * 365) - 1, -1, -1)]
+    print(f"Expanding fixtures to {len(days)} days ({days[0]} to {days[-1]})")
+    pages = build_pages(fixtures, days)
+
+    stages = {}
+    with tempfile.TemporaryDirectory(prefix='ercot-bench-') as workdir:
+        server = MockCdrServer(fixtures, latency=args.latency / 1000,
+                               jitter=args.jitter / 1000,
+                               error_rate=args.error_rate).start()
+        try:
+            fetch_days = days[-args.fetch_days:]
+            fetch_results, retries = stage_fetch(server, fetch_days, workdir)
+        finally:
+            server.stop()
+        stages.update(fetch_results)
+        stats = server.stats()
+        print(f"fetch: {stats['requests']} requests, "
+              f"{stats['errors']} injected errors, {retries} retries")
+
+        stages['parse'], dam, spp = stage_parse(pages)
+        stages['to_long'], dam_long, spp_long = stage_to_long(dam, spp, args.repeat)
+        stages['aggregate_hour'], hourly = stage_aggregate(spp, 'hour', args.repeat)
+        stages['aggregate_month'], _ = stage_aggregate(spp, 'month', args.repeat)
+        stages['basis'] = stage_basis(dam_long, spp_long, args.repeat)
+        render = stage_render(hourly, args.repeat)
+        if render is not None:
+            stages['render'] = render
+        stages.update(stage_export(dam_long, spp_long, days, workdir, args.repeat))
+        store = PriceStore(os.path.join(workdir, 'store'))
+        stages.update(stage_chart(store, days, args.repeat))
+
+    result = {
+        'commit': current_commit(),
+        'run_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'args': {key: str(value) for key, value in vars(args).items()},
+        'days': len(days),
+        'stages': stages,
+    }
+
+    result_path = os.path.join(RESULTS_DIR, f"{result['commit']}.json")
+    baseline_path = find_baseline(args.baseline, result_path)
+    baseline = None
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    regressions = print_report(result, baseline, args.threshold)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(result_path, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"\nSaved {result_path}")
+    if regressions:
+        print(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+import tkinter as tk
+from datetime import datetime, timedelta
+from tkinter import ttk
+
+from ercot_dart.cdr_site import cst
+from ercot_dart.metrics import span
+from fetch_executor import run_in_background
+
+# Chart tab: RT LMP, RT SPP, DAM SPP or DART basis for a few hubs / load zones over any
+# date range. Only the visible window (plus one window either side, for panning) is
+# read from the price store; the lines are min/max decimated to the axes' pixel width
+# and redrawn by blitting, so live updates never redraw the axes, ticks or legend.
+# matplotlib itself is imported the first time the tab is shown.
+
+SERIES = {'RT LMP': 'lmp', 'RT SPP': 'spp', 'DAM SPP': 'dam', 'DART Basis': 'basis'}
+
+CHART_POINTS = [
+    'HB_BUSAVG', 'HB_HOUSTON', 'HB_HUBAVG', 'HB_NORTH', 'HB_PAN', 'HB_SOUTH', 'HB_WEST',
+    'LZ_AEN', 'LZ_CPS', 'LZ_HOUSTON', 'LZ_LCRA', 'LZ_NORTH', 'LZ_RAYBN', 'LZ_SOUTH',
+    'LZ_WEST'
+]
+DEFAULT_POINTS = ('HB_HOUSTON', 'HB_NORTH', 'HB_SOUTH', 'HB_WEST')
+
+# View widths offered, in days
+VIEW_DAYS = ('1', '3', '7', '30', '90', '365')
+
+# How often (in ms) live mode reloads the latest days of each series
+LIVE_INTERVAL_MS = {
+    'lmp': 5 * 60 * 1000,
+    'spp': 15 * 60 * 1000,
+    'dam': 60 * 60 * 1000,
+    'basis': 15 * 60 * 1000,
+}
+
+# Wait (in ms) for panning / zooming to settle before re-decimating or loading
+SETTLE_MS = 150
+
+# Function to turn a matplotlib date number into the operating day it falls on (CST)
+def day_of(x):
+    return datetime.fromtimestamp(x * 86400, cst).date()
+
+# Function to turn a datetime into a matplotlib date number (days since 1970 UTC)
+def date_number(moment):
+    return moment.timestamp() / 86400
+
+# Price lines for one series, blitted onto a cached background
+class PriceChart:
+    def __init__(self, frame, status):
+        from matplotlib.backends.backend_tkagg import (
+            FigureCanvasTkAgg,
+            NavigationToolbar2Tk,
+        )
+        from matplotlib.dates import AutoDateLocator, ConciseDateFormatter
+        from matplotlib.figure import Figure
+
+        self.status = status
+        self.figure = Figure(figsize=(10, 6), dpi=100, layout='constrained')
+        self.ax = self.figure.add_subplot()
+        locator = AutoDateLocator(tz=cst)
+        self.ax.xaxis.set_major_locator(locator)
+        self.ax.xaxis.set_major_formatter(ConciseDateFormatter(locator, tz=cst))
+        self.ax.set_ylabel("$/MWh")
+        self.ax.grid(True, alpha=0.3)
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=frame)
+        self.widget = self.canvas.get_tk_widget()
+        self.widget.grid(row=1, column=0, columnspan=8, sticky=(tk.W, tk.E, tk.N, tk.S))
+        toolbar_frame = ttk.Frame(frame)
+        toolbar_frame.grid(row=2, column=0, columnspan=8, sticky=tk.W)
+        toolbar = NavigationToolbar2Tk(self.canvas, toolbar_frame, pack_toolbar=False)
+        toolbar.pack(side=tk.LEFT)
+        # Live loads are tracked apart from window loads (one pending fetch per widget)
+        self.live_widget = toolbar_frame
+
+        self.feed = None
+        self.points = ()
+        self.lines = {}  # Settlement point -> Line2D, animated so only blits draw it
+        self.data = {}  # Settlement point -> (x, y) for the loaded window
+        self.loaded = None  # (feed, points, first day, last day) of self.data
+        self.loading = None  # Same key for the load in flight
+        self.decimated_width = None  # View width (days) the lines were decimated for
+        self.background = None
+        self.settle_id = None
+        self.live_id = None
+        self.live = False
+
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('resize_event',
+                                lambda _event: self._schedule_update(force=True))
+        self.ax.callbacks.connect('xlim_changed', lambda _ax: self._schedule_update())
+
+    # Function to show a series for some points over the last `days` days
+    def show(self, feed, points, days):
+        self.feed = feed
+        self.points = tuple(points)
+        self.ax.set_title(next(name for name, value in SERIES.items() if value == feed))
+        end = datetime.now(cst) + timedelta(days=1 if feed == 'dam' else 0)
+        end = date_number(end)
+        self.ax.set_xlim(end - days, end)  # Loads the window through xlim_changed
+        self._schedule_update(force=True)
+        self._restart_live()
+
+    # Function to turn live updates of the latest days on or off
+    def set_live(self, live):
+        self.live = live
+        self._restart_live()
+
+    def _schedule_update(self, force=False):
+        if self.settle_id is not None:
+            self.widget.after_cancel(self.settle_id)
+        self.settle_id = self.widget.after(SETTLE_MS, lambda: self._update_view(force))
+
+    # Function to load the window around the view if it is not loaded yet, and
+    # re-decimate after zooming
+    def _update_view(self, force=False):
+        self.settle_id = None
+        if self.feed is None:
+            return
+        x0, x1 = self.ax.get_xlim()
+        width = x1 - x0
+        needed = (day_of(x0), day_of(x1))
+        if (self.loaded is None or self.loaded[:2] != (self.feed, self.points)
+                or needed[0] < self.loaded[2] or needed[1] > self.loaded[3]):
+            last_day = (datetime.now(cst) + timedelta(days=1)).date()
+            key = (self.feed, self.points, day_of(x0 - width),
+                   min(day_of(x1 + width), last_day))
+            if key != self.loading:
+                self._load(key)
+        if (force or self.decimated_width is None
+                or abs(width - self.decimated_width) > 0.2 * self.decimated_width):
+            self._decimate_lines()
+            self.canvas.draw_idle()
+
+    def _load(self, key):
+        from ercot_dart.series import load_series
+        feed, points, start, end = key
+        self.loading = key
+        self.status.set(f"Loading {start} to {end}...")
+        run_in_background(self.widget, load_series, feed, start, end, list(points),
+                          on_done=lambda series: self._on_loaded(key, series),
+                          on_error=self._on_error)
+
+    def _on_loaded(self, key, series):
+        self.loading = None
+        if key[:2] != (self.feed, self.points):
+            return  # The series or points changed while loading
+        self.loaded = key
+        self.data = series
+        for point in list(self.lines):
+            if point not in series:
+                self.lines.pop(point).remove()
+        for point in series:
+            if point not in self.lines:
+                drawstyle = 'steps-post' if self.feed == 'lmp' else 'default'
+                self.lines[point], = self.ax.plot([], [], label=point, linewidth=1,
+                                                  animated=True, drawstyle=drawstyle)
+        self.ax.legend(loc='upper left', fontsize='small')
+        n_points = sum(len(x) for x, _ in series.values())
+        if n_points:
+            self.status.set(f"{key[2]} to {key[3]}: {n_points} prices")
+        else:
+            self.status.set(f"No stored prices for {key[2]} to {key[3]}")
+        self._decimate_lines()
+        self._fit_y()
+        self.canvas.draw_idle()
+        self._schedule_update()  # The view may have moved on while loading
+
+    def _on_error(self, error):
+        self.loading = None
+        self.status.set(f"Error loading chart data: {error}")
+
+    # Function to decimate every loaded line for the current zoom level; the whole
+    # loaded window is decimated, so panning within it needs no further work
+    def _decimate_lines(self):
+        from ercot_dart.decimate import minmax_decimate
+        x0, x1 = self.ax.get_xlim()
+        width = x1 - x0
+        pixels = max(int(self.ax.bbox.width), 100)
+        with span('render', tab='chart'):
+            for point, line in self.lines.items():
+                x, y = self.data.get(point, ((), ()))
+                if len(x):
+                    n_pixels = int(pixels * (x[-1] - x[0]) / width) + 1
+                    x, y = minmax_decimate(x, y, n_pixels)
+                line.set_data(x, y)
+        self.decimated_width = width
+
+    # Function to fit the y axis to the prices in view
+    def _fit_y(self):
+        import numpy as np
+
+        from ercot_dart.decimate import visible_slice
+        x0, x1 = self.ax.get_xlim()
+        values = [y[visible_slice(x, x0, x1)] for x, y in self.data.values() if len(x)]
+        values = np.concatenate(values) if values else np.empty(0)
+        if not len(values) or np.isnan(values).all():
+            return
+        low, high = np.nanmin(values), np.nanmax(values)
+        margin = max(high - low, 1.0) * 0.05
+        self.ax.set_ylim(low - margin, high + margin)
+
+    # A full draw leaves the lines out (they are animated): keep that as the background,
+    # then blit the lines on
+    def _on_draw(self, _event):
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        for line in self.lines.values():
+            self.ax.draw_artist(line)
+        self.canvas.blit(self.figure.bbox)
+
+    # Function to redraw just the lines over the saved background (no axes, ticks or
+    # legend work)
+    def _blit(self):
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_lines()
+
+    def _restart_live(self):
+        if self.live_id is not None:
+            self.widget.after_cancel(self.live_id)
+            self.live_id = None
+        if self.live and self.feed is not None:
+            self.live_id = self.widget.after(LIVE_INTERVAL_MS[self.feed],
+                                             self._poll_live)
+
+    # Function to reload the latest days and splice them onto the loaded lines (the load
+    # runs on the fetch pool)
+    def _poll_live(self):
+        from ercot_dart.series import load_series
+        self.live_id = None
+        key = (self.feed, self.points)
+        today = datetime.now(cst).date()
+        end = today + timedelta(days=1) if self.feed == 'dam' else today
+        run_in_background(self.live_widget, load_series, self.feed,
+                          today - timedelta(days=1), end, list(self.points),
+                          on_done=lambda series: self._on_live(key, series),
+                          on_error=self._on_error)
+        self._restart_live()
+
+    def _on_live(self, key, series):
+        import numpy as np
+
+        from ercot_dart.decimate import break_gaps
+        from ercot_dart.series import MAX_STEP
+        yesterday = datetime.now(cst).date() - timedelta(days=1)
+        if (key != (self.feed, self.points) or self.loaded is None
+                or self.loaded[3] < yesterday):
+            return  # Looking at older history: loaded when the view gets there
+
+        low, high = self.ax.get_ylim()
+        fits = True
+        for point, (new_x, new_y) in series.items():
+            if not len(new_x):
+                continue
+            x, y = self.data.get(point, (np.empty(0), np.empty(0)))
+            keep = int(np.searchsorted(x, new_x[0]))
+            # The last kept price, to check the join for a gap
+            head = slice(max(keep - 1, 0), keep)
+            tail_x, tail_y = break_gaps(np.r_[x[head], new_x], np.r_[y[head], new_y],
+                                        MAX_STEP[self.feed])
+            self.data[point] = (np.r_[x[:head.start], tail_x],
+                                np.r_[y[:head.start], tail_y])
+            fits &= bool(np.nanmin(new_y) >= low and np.nanmax(new_y) <= high)
+        last_day = max(self.loaded[3], last_day_of(series) or self.loaded[3])
+        self.loaded = self.loaded[:3] + (last_day,)
+
+        self._decimate_lines()
+        if fits:
+            self._blit()  # Same axes: only the lines are redrawn
+        else:
+            self._fit_y()
+            self.canvas.draw_idle()
+
+# Function to find the operating day of the latest price in a loaded series
+def last_day_of(series):
+    ends = [x[-1] for x, _ in series.values() if len(x)]
+    return day_of(max(ends)) if ends else None
+
+# Function to create the Chart tab: the controls are built now, the figure when the tab
+# is first shown
+def create_chart_tab(frame):
+    tk.Label(frame, text="Series:", font=("Helvetica", 12)).grid(
+        row=0, column=0, padx=10, pady=10, sticky=tk.W)
+    series_combobox = ttk.Combobox(frame, values=list(SERIES), state='readonly',
+                                   width=12, font=("Helvetica", 12))
+    series_combobox.set('RT SPP')
+    series_combobox.grid(row=0, column=1, padx=10, pady=10, sticky=tk.W)
+
+    # Hubs / load zones to plot, picked from a drop-down of check boxes
+    point_vars = {point: tk.BooleanVar(value=point in DEFAULT_POINTS)
+                  for point in CHART_POINTS}
+    points_button = ttk.Menubutton(frame, text="Points")
+    points_menu = tk.Menu(points_button, tearoff=False)
+    points_button['menu'] = points_menu
+    points_button.grid(row=0, column=2, padx=10, pady=10, sticky=tk.W)
+
+    tk.Label(frame, text="Days:", font=("Helvetica", 12)).grid(
+        row=0, column=3, padx=10, pady=10, sticky=tk.W)
+    days_combobox = ttk.Combobox(frame, values=VIEW_DAYS, state='readonly', width=5,
+                                 font=("Helvetica", 12))
+    days_combobox.set('7')
+    days_combobox.grid(row=0, column=4, padx=10, pady=10, sticky=tk.W)
+
+    live = tk.BooleanVar(value=True)
+    status = tk.StringVar()
+    tk.Label(frame, textvariable=status, font=("Helvetica", 12)).grid(
+        row=3, column=0, columnspan=8, sticky=tk.W)
+
+    frame.grid_rowconfigure(1, weight=1)
+    frame.grid_columnconfigure(7, weight=1)
+
+    chart = []
+
+    # Function to (re)draw the chart for the chosen series, points and days
+    def show_chart(*_args):
+        if not chart:
+            return
+        points = [point for point in CHART_POINTS if point_vars[point].get()]
+        chart[0].show(SERIES[series_combobox.get()], points, int(days_combobox.get()))
+
+    for point in CHART_POINTS:
+        points_menu.add_checkbutton(label=point, variable=point_vars[point],
+                                    command=show_chart)
+    series_combobox.bind('<<ComboboxSelected>>', show_chart)
+    days_combobox.bind('<<ComboboxSelected>>', show_chart)
+    tk.Checkbutton(frame, text="Live", variable=live, font=("Helvetica", 12),
+                   command=lambda: chart and chart[0].set_live(live.get())).grid(
+        row=0, column=5, padx=10, pady=10)
+
+    # Function to build the figure the first time the tab is shown (this is when
+    # matplotlib is imported)
+    def load():
+        with span('load', tab='chart_setup'):
+            chart.append(PriceChart(frame, status))
+        chart[0].live = live.get()
+        show_chart()
+
+    return load
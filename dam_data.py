@@ -1,57 +1,40 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import tkinter as tk
 from tkinter import ttk
-from datetime import datetime, timedelta
-import pytz
-
-# Define the base URL for DAM data
-dam_url_base = "https://www.ercot.com/content/cdr/html/{date}_dam_spp.html"
-
-# Define the CST timezone
-cst = pytz.timezone('US/Central')
-
-# Function to scrape DAM ERCOT data
-def scrape_dam_data(url):
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # Check for HTTP errors
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Find the table in the HTML
-        table = soup.find('table')
-        if table is None:
-            print("Error: Could not find table in the HTML")
-            return pd.DataFrame()  # Return an empty DataFrame if no table is found
-
-        # Parse the table into a DataFrame
-        df = pd.read_html(str(table))[0]
-        return df
-    except Exception as e:
-        print(f"Error scraping DAM data: {e}")
-        return pd.DataFrame()  # Return an empty DataFrame on error
-
-# Function to refresh DAM data and update the GUI
-def refresh_dam_data(tree, time_label, url):
-    df = scrape_dam_data(url)
-
+from datetime import datetime
+from ercot_dart.cdr_site import cst, get_next_and_last_four_days
+from ercot_dart.data_bus import default_bus
+from ercot_dart.metrics import span
+from export_dialog import open_export_dialog
+from fetch_executor import call_on_tk, run_in_background
+from snapshot_cache import save_snapshot, show_snapshot
+from table_view import VirtualTable
+
+# Function to load a day of DAM data from the shared data bus (runs on the fetch pool,
+# so pandas is first imported off the Tk thread); refresh=True re-fetches it instead
+# of reusing the copy already loaded
+def load_dam_data(day, refresh=False):
+    with span('load', tab='dam'):
+        return default_bus.get('dam', day, refresh)
+
+# Function to refresh DAM data in the background and update the GUI when it arrives
+def refresh_dam_data(table, time_label, day, refresh=False):
+    return run_in_background(table.frame, load_dam_data, day, refresh,
+                             on_done=lambda df: update_dam_table(table, time_label, df))
+
+# Function to show DAM data in the GUI (runs on the Tk thread)
+def update_dam_table(table, time_label, df):
     if df.empty:
         print("No data available.")
         return
 
-    # Clear the tree
-    for row in tree.get_children():
-        tree.delete(row)
-
-    # Insert new data
-    for index, row in df.iterrows():
-        values = row.tolist()
-        tree.insert('', tk.END, values=values)
+    # Only the cells that changed since the last refresh are redrawn
+    with span('render', tab='dam'):
+        table.set_data(df)
 
     # Update the time label to CST
     now_cst = datetime.now(cst)
     time_label.set("Last Updated: " + now_cst.strftime("%H:%M:%S %Z"))
+    save_snapshot('dam', df, now_cst.strftime("%Y-%m-%d %H:%M:%S %Z"))
 
 # Function to create the DAM Data tab and its elements
 def create_dam_tab(frame):
@@ -70,51 +53,57 @@ def create_dam_tab(frame):
     else:
         operating_day_combobox.current(0)
 
-    # Treeview for displaying DAM data
+    # Table for displaying DAM data
     columns = [
         'Oper Day', 'Hour Ending', 'HB_BUSAVG', 'HB_HOUSTON', 'HB_HUBAVG', 'HB_NORTH', 'HB_PAN',
         'HB_SOUTH', 'HB_WEST', 'LZ_AEN', 'LZ_CPS', 'LZ_HOUSTON', 'LZ_LCRA', 'LZ_NORTH', 'LZ_RAYBN', 'LZ_SOUTH', 'LZ_WEST'
     ]
-    tree = ttk.Treeview(frame, columns=columns, show='headings', height=24)
-    for col in columns:
-        tree.heading(col, text=col)
-        tree.column(col, width=100, anchor=tk.CENTER)
-
-    tree.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S))
-
-    # Add a scrollbar
-    scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
-    tree.configure(yscroll=scrollbar.set)
-    scrollbar.grid(row=1, column=3, sticky=(tk.N, tk.S))
+    table = VirtualTable(frame, columns, column_width=100, height=24)
+    table.grid(row=1, column=0, columnspan=4, sticky=(tk.W, tk.E, tk.N, tk.S))
 
     # Add a refresh button and time label
     time_label = tk.StringVar()
     tk.Label(frame, textvariable=time_label, font=("Helvetica", 12)).grid(row=2, column=0, sticky=tk.W)
-    now_cst = datetime.now(cst)
-    time_label.set("Last Updated: " + now_cst.strftime("%H:%M:%S %Z"))
+
+    # Function to get the day selected in the Combobox
+    def selected_day():
+        return datetime.strptime(operating_day_combobox.get(), '%Y-%m-%d').date()
 
     # Function to handle the refresh button click
     def refresh_dam_data_button():
-        selected_day = operating_day_combobox.get()
-        formatted_date = selected_day.replace("-", "")
-        dam_url = dam_url_base.format(date=formatted_date)
-        print(f"Fetching DAM data from URL: {dam_url}")
-        refresh_dam_data(tree, time_label, dam_url)
+        print(f"Loading DAM data for {selected_day()}")
+        refresh_dam_data(table, time_label, selected_day(), refresh=True)
 
     refresh_button = tk.Button(frame, text="Refresh Now", font=("Helvetica", 12), command=refresh_dam_data_button)
     refresh_button.grid(row=3, column=0, pady=10)
 
-    # Make the frame and treeview expandable
+    # Switching days shows the data bus's copy of the day, fetched only the first time
+    # it is selected
+    operating_day_combobox.bind(
+        '<<ComboboxSelected>>',
+        lambda _event: refresh_dam_data(table, time_label, selected_day()))
+
+    # Function to redraw when a new version of the day on screen is loaded (by any tab)
+    def on_dam_update(day):
+        if day == selected_day():
+            refresh_dam_data(table, time_label, day)
+
+    # Export the selected day (or any range) to CSV / Parquet without blocking the GUI
+    def export_dam_data_button():
+        open_export_dialog(frame, 'dam', selected_day())
+
+    export_button = tk.Button(frame, text="Export...", font=("Helvetica", 12),
+                              command=export_dam_data_button)
+    export_button.grid(row=3, column=1, pady=10, sticky=tk.W)
+
+    # Make the frame and table expandable
     frame.grid_rowconfigure(1, weight=1)
     frame.grid_columnconfigure(0, weight=1)
-    tree.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S))
 
-    # Initial load of data
-    refresh_dam_data_button()  # Use the selected operating day to load data
+    # Function to load the tab when first shown: last snapshot, then the selected day
+    def load():
+        show_snapshot(table, time_label, 'dam')
+        default_bus.subscribe('dam', lambda _feed, day: call_on_tk(on_dam_update, day))
+        refresh_dam_data(table, time_label, selected_day())
 
-# Function to get the next day and the last four days
-def get_next_and_last_four_days():
-    today = datetime.now(cst)
-    days = [(today + timedelta(days=1)).strftime('%Y-%m-%d')]  # Next day
-    days += [(today - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(4)]  # Previous 4 days
-    return days
+    return load
@@ -0,0 +1,3 @@
+# GUI-free core of ercot-dart: scraping, parsing, storage and aggregation of ERCOT CDR
+# prices. The Tk app in the repo root only reads from here; `ercot-dart` (cli.py) runs
+# the same code headless.
@@ -0,0 +1,6 @@
+import sys
+
+from ercot_dart.cli import main
+
+# Allows `python -m ercot_dart collect ...` without installing the ercot-dart script
+sys.exit(main())
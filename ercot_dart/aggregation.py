@@ -0,0 +1,105 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from ercot_dart.price_frames import (
+    ERCOT_TZ,
+    interval_ending_index,
+    price_columns,
+    repeated_hour_flag,
+)
+
+# Resampling of 15-minute settlement point prices to hour-ending, peak-block,
+# daily and monthly averages. The interval-ending timestamps are built once,
+# every row gets an integer bucket code, and all settlement point columns are
+# averaged together in one groupby pass. The input frame is never modified.
+
+GRANULARITIES = ('hour', 'block', 'day', 'month')
+
+# ERCOT on-peak hours are hour ending 7 through 22
+PEAK_HOURS = range(7, 23)
+
+_hour_ns = 3600 * 10 ** 9
+
+# Function to find the observed NERC holidays of a year (off-peak all day)
+def nerc_holidays(year):
+    def nth_weekday(month, weekday, n):
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+    def observed(day):
+        # Sunday holidays move to Monday
+        return day + timedelta(days=1) if day.weekday() == 6 else day
+
+    last_may = date(year, 5, 31)
+    return {
+        observed(date(year, 1, 1)),
+        last_may - timedelta(days=last_may.weekday()),  # Memorial Day
+        observed(date(year, 7, 4)),
+        nth_weekday(9, 0, 1),  # Labor Day
+        nth_weekday(11, 3, 4),  # Thanksgiving
+        observed(date(year, 12, 25)),
+    }
+
+# Function to label each hour as 5x16 (weekday peak), 2x16 (weekend/holiday peak) or
+# 7x8 (off-peak nights)
+def peak_block(oper_days, hour_ending):
+    days = pd.DatetimeIndex(oper_days)
+    holidays = set()
+    for year in np.unique(days.year):
+        holidays |= nerc_holidays(int(year))
+    is_holiday = np.isin(days.date, list(holidays))
+    is_weekend = days.weekday >= 5
+    is_peak_hour = np.isin(hour_ending, list(PEAK_HOURS))
+    peak = np.where(is_weekend | is_holiday, '2x16', '5x16')
+    return np.where(~is_peak_hour, '7x8', peak)
+
+# Function to average 15-minute prices up to hour ending, peak block, day or month
+def resample_prices(df, granularity='hour', label_column='Interval Ending',
+                    interval_minutes=15):
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity {granularity!r}, "
+                         f"expected one of {GRANULARITIES}")
+
+    points = price_columns(df)
+    oper_day = pd.to_datetime(df['Oper Day'].astype(str), format='%m/%d/%Y')
+    interval_end = interval_ending_index(df['Oper Day'], df[label_column],
+                                         interval_minutes, repeated_hour_flag(df))
+
+    # Hour-ending bucket in UTC nanoseconds: an interval ending exactly on the hour
+    # belongs to that hour
+    end_ns = interval_end.as_unit('ns').asi8
+    hour_end_ns = (end_ns - 1) // _hour_ns * _hour_ns + _hour_ns
+    hour_end = pd.DatetimeIndex(hour_end_ns, tz='UTC').tz_convert(ERCOT_TZ)
+    hour_start_local = (hour_end - pd.Timedelta(hours=1)).tz_localize(None)
+    hour_ending = hour_start_local.hour + 1  # Spring-forward HE3 never appears
+
+    day_labels = df['Oper Day'].to_numpy()
+    if granularity == 'hour':
+        keys = pd.DataFrame({'Oper Day': day_labels, 'Interval End': hour_end})
+    elif granularity == 'block':
+        blocks = peak_block(oper_day, hour_ending)
+        keys = pd.DataFrame({'Oper Day': day_labels, 'Block': blocks})
+    elif granularity == 'day':
+        keys = pd.DataFrame({'Oper Day': day_labels})
+    else:
+        keys = pd.DataFrame({'Month': oper_day.dt.to_period('M')})
+
+    # One integer code per bucket (numbered in order of appearance), then a single
+    # grouped mean over every price column at once
+    codes = keys.groupby(list(keys.columns), sort=False).ngroup().to_numpy()
+    averages = df[points].groupby(codes, sort=True).mean()
+    first = np.unique(codes, return_index=True)[1]  # First row of each bucket
+
+    result = keys.iloc[first].reset_index(drop=True)
+    if granularity == 'hour':
+        result['Hour Ending'] = np.asarray(hour_ending)[first]
+        # The second pass through a repeated (fall-back) hour has the same local start
+        # time as the first
+        repeated = pd.Index(hour_start_local[first]).duplicated()
+        result['Repeated Hour Flag'] = np.where(repeated, 'Y', 'N')
+        columns = ['Oper Day', 'Hour Ending', 'Repeated Hour Flag', 'Interval End']
+        result = result[columns]
+
+    return pd.concat([result, averages.reset_index(drop=True).round(2)], axis=1)
@@ -0,0 +1,325 @@
+import gzip
+import hashlib
+import json
+import signal
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from ercot_dart.aggregation import resample_prices
+from ercot_dart.basis_engine import BasisCache, default_basis_cache
+from ercot_dart.cdr_site import cst, real_time_url
+from ercot_dart.lmp_history import LmpHistory
+from ercot_dart.lmp_tracker import LmpChangeTracker
+from ercot_dart.metrics import add_collector, default_metrics, inc, span
+from ercot_dart.page_cache import is_final_day
+from ercot_dart.price_frames import dam_to_long, long_to_wide, spp_to_long
+from ercot_dart.price_store import default_store
+from ercot_dart.scrapers import load_dam_day, load_real_time_spp_day
+from ercot_dart.singleflight import SingleFlight
+
+# Local read-only HTTP/JSON API over the same scrapers, price store and aggregation
+# as the GUI, so other scripts can share one copy of the data instead of scraping
+# ERCOT themselves. Every day is loaded once however many requests ask for it at the
+# same time (SingleFlight), settled days stay in memory, and days still changing are
+# re-read at most every LIVE_TTL seconds.
+#
+#   ercot-dart serve --port 8088
+#   curl --compressed 'http://127.0.0.1:8088/spp?start=2024-08-01&end=2024-08-07&points=HB_NORTH,HB_WEST'
+#
+# Endpoints (GET; start/end are operating days YYYY-MM-DD, end defaults to start,
+# points is a comma separated list and defaults to all; add format=csv for CSV):
+#   /rt                  latest RT LMP snapshot, with spike flags (not stored)
+#   /lmp?start=&end=     stored RT LMP snapshots
+#   /dam?start=&end=     DAM settlement point prices
+#   /spp?start=&end=     RT settlement point prices (15-minute)
+#   /hourly?start=&end=  RT settlement point prices averaged to hour ending
+#   /basis?start=&end=   DART spreads (DAM minus hourly RT)
+#   /health, /metrics, /metrics.json
+
+DAY_FEEDS = ('lmp', 'dam', 'spp', 'hourly', 'basis')
+
+MAX_DAYS = 366  # Longest range one request may ask for
+# Seconds a day that is not final is served from memory before it is loaded again
+LIVE_TTL = 60
+# Seconds the latest RT LMP snapshot is served before the page is checked again
+RT_TTL = 15
+MIN_GZIP_BYTES = 1024
+DAY_WORKERS = 4  # Days of one range request loaded at the same time
+
+# Function to turn an hourly settlement table (from resample_prices) into long rows
+def hourly_to_long(hourly):
+    skip = ('Oper Day', 'Hour Ending', 'Repeated Hour Flag', 'Interval End')
+    points = [col for col in hourly.columns if col not in skip]
+    n_rows, n_points = len(hourly), len(points)
+    oper_days = pd.to_datetime(hourly['Oper Day'], format='%m/%d/%Y').to_numpy()
+    codes = np.tile(np.arange(n_points), n_rows)
+    return pd.DataFrame({
+        'oper_day': np.repeat(oper_days, n_points),
+        'interval_end': pd.DatetimeIndex(hourly['Interval End']).repeat(n_points),
+        'hour_ending': np.repeat(hourly['Hour Ending'].to_numpy(), n_points),
+        'settlement_point': pd.Categorical.from_codes(codes, categories=points),
+        'price': hourly[points].to_numpy(dtype=np.float64).ravel(),
+    })
+
+# Function to make long rows JSON / CSV friendly: plain dates, UTC times, cent prices
+def _for_output(df):
+    out = df.copy()
+    for col in out.columns:
+        if col == 'oper_day':
+            out[col] = pd.DatetimeIndex(out[col]).strftime('%Y-%m-%d')
+        elif isinstance(out[col].dtype, pd.DatetimeTZDtype):
+            out[col] = out[col].dt.tz_convert('UTC').dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+        elif out[col].dtype.kind == 'f':
+            out[col] = out[col].astype(np.float64).round(2)
+        elif isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype(str)
+    return out
+
+class PriceApi:
+    def __init__(self, store=None, max_days=512, live_ttl=LIVE_TTL):
+        self.store = store or default_store
+        if self.store is default_store:
+            self.basis_cache = default_basis_cache
+        else:
+            self.basis_cache = BasisCache(self.store)
+        self.max_days = max_days
+        self.live_ttl = live_ttl
+        self.flight = SingleFlight()
+        # (feed, day) -> (expires at or None when settled, long rows); least recently
+        # used first
+        self.days = OrderedDict()
+        self.lock = threading.Lock()
+        # /rt only reads the page; recording snapshots is the collector's job
+        self.tracker = LmpChangeTracker(store_history=False, history=LmpHistory())
+        self.rt = None  # (checked at, snapshot, timestamp, spike flags)
+        self.pool = ThreadPoolExecutor(max_workers=DAY_WORKERS,
+                                       thread_name_prefix='ercot-api-day')
+        add_collector(self.metrics)
+
+    # Function to get one day of a feed as long rows: from memory, or loaded once for
+    # every waiting request
+    def day(self, feed, day):
+        key = (feed, day)
+        with self.lock:
+            entry = self.days.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self.days.move_to_end(key)
+                inc('api_cache_hits_total', feed=feed)
+                return entry[1]
+        return self.flight.do(key, self._load_day, feed, day)
+
+    def _load_day(self, feed, day):
+        with span('load', tab='api', feed=feed):
+            if feed == 'dam':
+                wide = load_dam_day(day, store=self.store)
+                rows = dam_to_long(wide) if not wide.empty else None
+            elif feed == 'spp':
+                wide = load_real_time_spp_day(day, store=self.store)
+                rows = spp_to_long(wide) if not wide.empty else None
+            elif feed == 'hourly':
+                # Shares the RT SPP load (and its cache entry) with /spp
+                spp = self.day('spp', day)
+                rows = None
+                if not spp.empty:
+                    wide = long_to_wide(spp, 'Interval Ending', 15)
+                    rows = hourly_to_long(resample_prices(wide, 'hour'))
+            elif feed == 'basis':
+                # Going through self.day() means the DAM and RT SPP inputs are shared
+                # with other requests
+                rows = self.basis_cache.get_day(
+                    day,
+                    fetch_missing=lambda missing: (self.day('dam', missing),
+                                                   self.day('spp', missing)),
+                )
+            else:
+                rows = self.store.load('lmp', day, day)
+        if rows is None:
+            rows = pd.DataFrame(columns=['oper_day', 'interval_end',
+                                         'settlement_point', 'price'])
+        final = is_final_day(day) if feed != 'lmp' else day < datetime.now(cst).date()
+        # The scrapers return an empty frame when a fetch fails, so an empty day is kept
+        # only as long as a live one and then tried again
+        final = final and not rows.empty
+        with self.lock:
+            expires = None if final else time.monotonic() + self.live_ttl
+            self.days[(feed, day)] = (expires, rows)
+            self.days.move_to_end((feed, day))
+            while len(self.days) > self.max_days:
+                self.days.popitem(last=False)
+        return rows
+
+    # Function to get a date range of a feed as long rows, optionally for some points
+    def load_range(self, feed, start, end, points=None):
+        if feed not in DAY_FEEDS:
+            raise ValueError(f"Unknown feed {feed!r}, expected one of {DAY_FEEDS}")
+        if end < start:
+            raise ValueError("end is before start")
+        if (end - start).days + 1 > MAX_DAYS:
+            raise ValueError(f"At most {MAX_DAYS} days per request")
+        n_days = (end - start).days + 1
+        days = [start + timedelta(days=offset) for offset in range(n_days)]
+        frames = []
+        for rows in self.pool.map(lambda day: self.day(feed, day), days):
+            if points is not None and not rows.empty:
+                rows = rows[rows['settlement_point'].isin(points)]
+            if not rows.empty:
+                frames.append(rows)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    # Function to get the latest RT LMP snapshot, checking the page at most every
+    # RT_TTL seconds
+    def latest_rt(self):
+        rt = self.rt
+        if rt is not None and time.monotonic() - rt[0] < RT_TTL:
+            return rt
+        return self.flight.do('rt', self._check_rt)
+
+    def _check_rt(self):
+        result = self.tracker.poll(real_time_url)
+        if result is not None:
+            snapshot, _, timestamp = result
+            spikes = self.tracker.history.latest_spikes()
+            self.rt = (time.monotonic(), snapshot, timestamp, spikes)
+        elif self.rt is not None:
+            # Page unchanged: the last snapshot is still current
+            self.rt = (time.monotonic(),) + self.rt[1:]
+        return self.rt
+
+    # Function to answer one GET request: returns (status, content type, body bytes)
+    def handle(self, path, query):
+        params = {key: values[-1] for key, values in parse_qs(query).items()}
+        fmt = params.get('format', 'json')
+        if fmt not in ('json', 'csv'):
+            return error_response(400, "format must be json or csv")
+        try:
+            if path == '/health':
+                health = {'status': 'ok', 'days_cached': len(self.days)}
+                return 200, 'application/json', json.dumps(health).encode()
+            if path == '/rt':
+                rt = self.latest_rt()
+                if rt is None:
+                    return error_response(503, "No RT LMP snapshot yet")
+                _, snapshot, timestamp, spikes = rt
+                rows = snapshot
+                if len(spikes) == len(snapshot):
+                    rows = snapshot.assign(Spike=spikes)
+                return table_response(rows, fmt, {'timestamp': timestamp.isoformat()})
+            feed = path.strip('/')
+            if feed not in DAY_FEEDS:
+                return error_response(404, f"Unknown path {path}")
+            if 'start' not in params:
+                return error_response(400, "start=YYYY-MM-DD is required")
+            start = datetime.strptime(params['start'], '%Y-%m-%d').date()
+            end = start
+            if 'end' in params:
+                end = datetime.strptime(params['end'], '%Y-%m-%d').date()
+            points = None
+            if params.get('points'):
+                points = [point.strip() for point in params['points'].split(',')
+                          if point.strip()]
+            rows = self.load_range(feed, start, end, points)
+            meta = {'feed': feed, 'start': start.isoformat(), 'end': end.isoformat()}
+            return table_response(_for_output(rows), fmt, meta)
+        except ValueError as e:
+            return error_response(400, str(e))
+
+    # Metrics collector: days held in memory and requests that shared another's load
+    def metrics(self):
+        stats = self.flight.stats()
+        return [
+            ('api_days_cached', {}, len(self.days), 'gauge'),
+            ('api_loads_in_flight', {}, stats['in_flight'], 'gauge'),
+            ('api_coalesced_total', {}, stats['coalesced'], 'counter'),
+        ]
+
+def error_response(status, message):
+    return status, 'application/json', json.dumps({'error': message}).encode()
+
+# Function to serialize rows as {"...meta", "count": n, "data": [records]} or as CSV
+def table_response(rows, fmt, meta):
+    if fmt == 'csv':
+        return 200, 'text/csv', rows.to_csv(index=False).encode()
+    # Splice the records in without re-parsing them
+    head = json.dumps({**meta, 'count': len(rows)})[:-1]
+    records = rows.to_json(orient='records', date_format='iso') if len(rows) else '[]'
+    return 200, 'application/json', f'{head}, "data": {records}}}'.encode()
+
+# Function to serve the API (and /metrics) from background threads; returns the server
+def serve_api(port=8088, host='127.0.0.1', store=None):
+    api = PriceApi(store)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            start = time.perf_counter()
+            if url.path == '/metrics':
+                status, content_type = 200, 'text/plain; version=0.0.4'
+                body = default_metrics.prometheus_text().encode()
+            elif url.path == '/metrics.json':
+                status, content_type = 200, 'application/json'
+                body = json.dumps(default_metrics.snapshot()).encode()
+            else:
+                try:
+                    status, content_type, body = api.handle(url.path, url.query)
+                except Exception as e:
+                    print(f"Error serving {self.path}: {e}")
+                    message = f"{type(e).__name__}: {e}"
+                    status, content_type, body = error_response(500, message)
+
+            # Same body, same ETag: a client that already has it gets an empty 304.
+            # The gzip body gets its own tag, so a cache never serves one encoding's
+            # bytes for the other
+            accepts_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+            encoding = None
+            if len(body) >= MIN_GZIP_BYTES and accepts_gzip:
+                encoding = 'gzip'
+            digest = hashlib.sha1(body).hexdigest()
+            etag = f'"{digest}-gz"' if encoding else f'"{digest}"'
+            if status == 200 and self.headers.get('If-None-Match') == etag:
+                status, body, encoding = 304, b'', None
+            elif encoding:
+                body = gzip.compress(body, compresslevel=5)
+
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.end_headers()
+            self.wfile.write(body)
+            inc('api_requests_total', path=url.path, status=status)
+            default_metrics.observe('api_request', time.perf_counter() - start,
+                                    status >= 500, path=url.path)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    httpd.api = api
+    threading.Thread(target=httpd.serve_forever, name='ercot-api', daemon=True).start()
+    print(f"Serving the ERCOT price API at http://{host}:{httpd.server_address[1]}/")
+    return httpd
+
+# Function to serve the API in the foreground until SIGINT/SIGTERM
+def run_api_server(port=8088, host='127.0.0.1', store=None):
+    httpd = serve_api(port, host, store)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_args: stop.set())
+    signal.signal(signal.SIGINT, lambda *_args: stop.set())
+    while not stop.wait(1):
+        pass
+    httpd.shutdown()
+    print("API server stopped")
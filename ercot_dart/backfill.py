@@ -0,0 +1,105 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from ercot_dart.page_cache import is_final_day
+from ercot_dart.price_frames import dam_to_long, spp_to_long
+from ercot_dart.scrapers import (
+    dam_url_base,
+    real_time_spp_url_base,
+    scrape_dam_data,
+    scrape_real_time_spp_data,
+)
+
+# Headless backfill of DAM and RT SPP history over a date range
+#
+#   ercot-dart backfill --start 2024-01-01 --end 2024-12-31 --feeds dam,spp \
+#       --workers 4 --rate 2
+#
+# Each finished day is written to the price store straight away, and settled days
+# already complete in the store are skipped, so an interrupted run picks up where it
+# stopped. Days stored only in part (e.g. by the GUI mid-day) are fetched again.
+
+# Feeds that can be backfilled: (url template, scrape function, long-format conversion)
+FEEDS = {
+    'dam': (dam_url_base, scrape_dam_data, dam_to_long),
+    'spp': (real_time_spp_url_base, scrape_real_time_spp_data, spp_to_long),
+}
+
+# Token bucket shared by the worker threads to cap requests per second
+class RateLimiter:
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                refill = (now - self.last) * self.rate
+                self.tokens = min(self.capacity, self.tokens + refill)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+# Function to list every day from start to end inclusive
+def date_range(start, end):
+    days = []
+    day = start
+    while day <= end:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+# Function to fetch, parse and store one feed for one day
+def backfill_day(feed, day, store, limiter):
+    url_base, scrape, to_long = FEEDS[feed]
+    limiter.acquire()
+    df = scrape(url_base.format(date=day.strftime('%Y%m%d')))
+    if df.empty:
+        return False  # Left unstored so the next run tries again
+    store.write_day(feed, day, to_long(df))
+    return True
+
+# Function to check whether a (feed, day) needs no fetch: settled, every interval stored
+def is_done(store, feed, day):
+    return is_final_day(day) and store.has_complete_day(feed, day)
+
+# Function to backfill every missing or partial (feed, day) pair in a range concurrently
+def run_backfill(start, end, feeds, store, workers=4, rate=2.0):
+    days = date_range(start, end)
+    jobs = [(feed, day) for day in days for feed in feeds
+            if not is_done(store, feed, day)]
+    skipped = len(days) * len(feeds) - len(jobs)
+    print(f"Backfilling {len(jobs)} feed-days ({skipped} already complete) "
+          f"with {workers} workers at {rate}/s")
+
+    limiter = RateLimiter(rate)
+    stored = 0
+    failed = []
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ercot-backfill")
+    with pool:
+        futures = {pool.submit(backfill_day, feed, day, store, limiter): (feed, day)
+                   for feed, day in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            feed, day = futures[future]
+            try:
+                ok = future.result()
+            except Exception as e:
+                print(f"Error backfilling {feed} {day}: {e}")
+                ok = False
+            if ok:
+                stored += 1
+            else:
+                failed.append((feed, day))
+            print(f"[{done}/{len(jobs)}] {feed} {day}: {'stored' if ok else 'no data'}")
+
+    print(f"Done: {stored} stored, {len(failed)} without data, {skipped} skipped")
+    return stored, failed
@@ -0,0 +1,170 @@
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from ercot_dart.metrics import span
+from ercot_dart.page_cache import is_final_day
+from ercot_dart.price_frames import ERCOT_TZ, dam_to_long, spp_to_long
+from ercot_dart.price_store import default_store
+
+# DART (day-ahead minus real-time) spreads by operating day, hour ending and
+# settlement point. RT SPP intervals and DAM hours are both taken in the long
+# format from price_frames, laid out on one (hour x settlement point) grid, and
+# the spread is a single array subtraction.
+
+_hour_ns = 3600 * 10 ** 9
+
+# Function to get the hour-ending bucket (UTC ns) of each interval end
+def _hour_end_ns(interval_end):
+    end_ns = pd.DatetimeIndex(interval_end).as_unit('ns').asi8
+    return (end_ns - 1) // _hour_ns * _hour_ns + _hour_ns
+
+# Function to average long-format values onto an (hour x point) grid in one bincount
+def _grid(hour_ns, points, values, hours_index, points_index):
+    rows = hours_index.get_indexer(hour_ns)
+    cols = points_index.get_indexer(points)
+    keep = (rows >= 0) & (cols >= 0) & ~np.isnan(values)
+    flat = rows[keep] * len(points_index) + cols[keep]
+    size = len(hours_index) * len(points_index)
+    sums = np.bincount(flat, weights=values[keep], minlength=size)
+    counts = np.bincount(flat, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        grid = sums / counts  # NaN where an hour has no data for a point
+    return grid.reshape(len(hours_index), len(points_index))
+
+# Function to compute DART spreads from long-format DAM and RT SPP rows over any range
+def dart_spreads(dam_long, spp_long):
+    if dam_long is None or spp_long is None or dam_long.empty or spp_long.empty:
+        return pd.DataFrame(columns=['oper_day', 'interval_end', 'hour_ending',
+                                     'settlement_point', 'dam', 'rt', 'dart'])
+
+    dam_hours = _hour_end_ns(dam_long['interval_end'])
+    rt_hours = _hour_end_ns(spp_long['interval_end'])
+
+    # Hours and settlement points present in both markets
+    hours_index = pd.Index(np.intersect1d(np.unique(dam_hours), np.unique(rt_hours)))
+    dam_points = dam_long['settlement_point'].astype(str)
+    rt_points = spp_long['settlement_point'].astype(str)
+    points_index = pd.Index(np.intersect1d(dam_points.unique(), rt_points.unique()))
+
+    dam = _grid(dam_hours, dam_points, dam_long['price'].to_numpy(np.float64),
+                hours_index, points_index)
+    rt = _grid(rt_hours, rt_points, spp_long['price'].to_numpy(np.float64),
+               hours_index, points_index)
+    dart = dam - rt  # Every hour and settlement point in one pass
+
+    # Back to long format: one row per (hour, settlement point)
+    n_hours, n_points = dart.shape
+    interval_end = pd.DatetimeIndex(hours_index.to_numpy(), tz='UTC')
+    interval_end = interval_end.tz_convert(ERCOT_TZ)
+    hour_start = (interval_end - pd.Timedelta(hours=1)).tz_localize(None)
+    # HE24 belongs to the day before
+    oper_day = (interval_end - pd.Timedelta(minutes=1)).tz_localize(None).normalize()
+    result = pd.DataFrame({
+        'oper_day': np.repeat(oper_day.to_numpy(), n_points),
+        'interval_end': interval_end.repeat(n_points),
+        'hour_ending': np.repeat(hour_start.hour.to_numpy() + 1, n_points),
+        'settlement_point': pd.Categorical.from_codes(
+            np.tile(np.arange(n_points), n_hours), categories=points_index),
+        'dam': dam.ravel().astype(np.float32),
+        'rt': rt.ravel().astype(np.float32),
+        'dart': dart.ravel().astype(np.float32),
+    })
+    empty = np.isnan(dam.ravel()) & np.isnan(rt.ravel())
+    return result[~empty].reset_index(drop=True)
+
+# Function to compute DART spreads straight from scraped wide DAM and RT SPP tables
+def dart_from_tables(rt_spp_data, dam_data):
+    return dart_spreads(dam_to_long(dam_data), spp_to_long(rt_spp_data))
+
+# Function to lay long-format spreads out like the other tabs: Oper Day, Hour Ending,
+# one column per point
+def dart_to_wide(dart_long, value='dart'):
+    if dart_long.empty:
+        return pd.DataFrame(columns=['Oper Day', 'Hour Ending'])
+    wide = dart_long.pivot_table(index=['interval_end'], columns='settlement_point',
+                                 values=value, observed=True, sort=True)
+    interval_end = pd.DatetimeIndex(wide.index)
+    oper_day = (interval_end - pd.Timedelta(minutes=1)).tz_localize(None)
+    hour_start = (interval_end - pd.Timedelta(hours=1)).tz_localize(None)
+    labels = pd.DataFrame({
+        'Oper Day': oper_day.strftime('%m/%d/%Y'),
+        'Hour Ending': hour_start.hour + 1,
+    })
+    prices = wide.reset_index(drop=True).astype(np.float64).round(2)
+    return pd.concat([labels, prices], axis=1)
+
+# Per-day cache of DART spreads: memory first, then the price store, then a fresh
+# compute.
+# Only settled days whose DAM and RT SPP inputs are both complete in the store are
+# cached; any other day is recomputed from its latest inputs.
+class BasisCache:
+    def __init__(self, store=default_store, max_days=64):
+        self.store = store
+        self.max_days = max_days
+        self.days = OrderedDict()  # Least recently used first
+        self.lock = threading.Lock()
+
+    def _remember(self, day, df):
+        with self.lock:
+            self.days[day] = df
+            self.days.move_to_end(day)
+            while len(self.days) > self.max_days:
+                self.days.popitem(last=False)
+
+    # Function to check whether a day's spreads are final: settled, with every DAM hour
+    # and RT SPP interval stored
+    def _settled(self, day):
+        return (is_final_day(day) and self.store.has_complete_day('dam', day)
+                and self.store.has_complete_day('spp', day))
+
+    # Function to get spreads for every day in a range, computing missing days at once
+    def get_range(self, start, end, fetch_missing=None):
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        results = {}
+        missing = []
+        for day in days:
+            with self.lock:
+                cached = self.days.get(day)
+                if cached is not None:
+                    self.days.move_to_end(day)
+            if cached is not None:
+                results[day] = cached
+            elif self.store.has_day('basis', day):
+                results[day] = self.store.load('basis', day, day)
+                self._remember(day, results[day])
+            else:
+                missing.append(day)
+
+        if missing:
+            # Make sure the inputs are in the store, then load them all at once
+            if fetch_missing is not None:
+                for day in missing:
+                    fetch_missing(day)
+            dam_long = self.store.load('dam', missing[0], missing[-1])
+            spp_long = self.store.load('spp', missing[0], missing[-1])
+            with span('basis'):
+                spreads = dart_spreads(dam_long, spp_long)
+            for day in missing:
+                day_rows = spreads[spreads['oper_day'] == pd.Timestamp(day)]
+                day_rows = day_rows.reset_index(drop=True)
+                results[day] = day_rows
+                if not day_rows.empty and self._settled(day):
+                    self._remember(day, day_rows)
+                    # Settled: never recomputed
+                    self.store.write_day('basis', day, day_rows)
+
+        frames = [results[day] for day in days if not results[day].empty]
+        if not frames:
+            return dart_spreads(None, None)
+        return pd.concat(frames, ignore_index=True)
+
+    # Function to get spreads for one day
+    def get_day(self, day, fetch_missing=None):
+        return self.get_range(day, day, fetch_missing)
+
+# Shared cache used by the basis tab
+default_basis_cache = BasisCache()
@@ -0,0 +1,214 @@
+import glob
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+from ercot_dart.cdr_parser import convert_column, parse_table_columns
+from ercot_dart.metrics import inc, span
+from ercot_dart.page_cache import (
+    default_cache_dir,
+    is_final_day,
+    operating_day_from_url,
+)
+from ercot_dart.price_frames import (
+    ERCOT_TZ,
+    LABEL_COLUMNS,
+    REPEATED_HOUR_COLUMNS,
+    interval_ending_index,
+    intervals_in_day,
+)
+from ercot_dart.price_store import default_store
+
+# Bulk re-parsing of saved DAM / RT SPP pages into the price store. Parsing is
+# CPU-bound pure Python, so pages are parsed in a process pool; each worker packs
+# a chunk's results (interval ends as int64 UTC ns, prices as float32) into one
+# shared memory block and only sends back a few offsets, never a pickled DataFrame.
+# Only complete days are stored: page cache entries must be final, and a page missing
+# intervals (saved while its day was in progress) never replaces what is stored.
+#
+#   ercot-dart ingest ~/.cache/ercot-dart/pages --workers 8
+
+# Page name suffix -> (feed, label column, interval minutes)
+PAGE_KINDS = {
+    'dam_spp': ('dam', 'Hour Ending', 60),
+    'real_time_spp': ('spp', 'Interval Ending', 15),
+}
+FEED_LAYOUT = {feed: (label_column, minutes)
+               for feed, label_column, minutes in PAGE_KINDS.values()}
+
+_page_name = re.compile(r'(\d{8})_(dam_spp|real_time_spp)\.html$')
+
+# Function to find the DAM / RT SPP pages in a folder of saved pages or in the page
+# cache (final entries only); returns (feed, day, path)
+def find_pages(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        name = os.path.basename(path)
+        match = _page_name.search(name)
+        if match is None:
+            # Page cache entries are <sha256>.html with the url in <sha256>.json
+            try:
+                with open(path[:-len('.html')] + '.json') as f:
+                    meta = json.load(f)
+                url = meta['url']
+            except (OSError, ValueError, KeyError):
+                continue
+            if not meta.get('final'):
+                continue  # Fetched while the day could still change
+            match = _page_name.search(url)
+            if match is None or operating_day_from_url(url) is None:
+                continue
+        feed = PAGE_KINDS[match.group(2)][0]
+        pages.append((feed, datetime.strptime(match.group(1), '%Y%m%d').date(), path))
+    return pages
+
+# Function to parse one page into (points, interval ends in UTC ns, row-major float32
+# prices)
+def _parse_page(feed, path):
+    with open(path, 'rb') as f:
+        header, columns = parse_table_columns(f.read())
+    if header is None:
+        raise ValueError("no table on the page")
+
+    label_column, minutes = FEED_LAYOUT[feed]
+    table = dict(zip(header, columns, strict=True))
+    flag = next((table[col] for col in REPEATED_HOUR_COLUMNS if col in table), None)
+    ends = interval_ending_index(table['Oper Day'], table[label_column], minutes, flag)
+    ends = ends.as_unit('ns').asi8
+
+    points = [col for col in header
+              if col not in LABEL_COLUMNS and col not in REPEATED_HOUR_COLUMNS]
+    prices = np.empty((len(ends), len(points)), dtype=np.float32)
+    for j, point in enumerate(points):
+        prices[:, j] = convert_column(table[point]).astype(np.float32)
+    return points, ends, prices.ravel()
+
+# Function run in a worker: parse a chunk of pages and pack the arrays into one shared
+# memory block
+def _parse_chunk(tasks):
+    metas = []
+    parsed = []
+    for feed, day, path in tasks:
+        try:
+            points, ends, prices = _parse_page(feed, path)
+        except Exception as e:
+            metas.append({'feed': feed, 'day': day, 'path': path,
+                          'error': f"{type(e).__name__}: {e}"})
+            continue
+        metas.append({'feed': feed, 'day': day, 'path': path, 'points': points,
+                      'rows': len(ends)})
+        parsed.append((ends, prices))
+
+    size = sum(ends.nbytes + prices.nbytes for ends, prices in parsed)
+    if size == 0:
+        return None, metas
+
+    block = shared_memory.SharedMemory(create=True, size=size)
+    offset = 0
+    ok = [meta for meta in metas if 'error' not in meta]
+    for meta, (ends, prices) in zip(ok, parsed, strict=True):
+        # int64 ends first, then float32 prices, so every array starts suitably aligned
+        meta['ends_offset'] = offset
+        block.buf[offset:offset + ends.nbytes] = ends.tobytes()
+        offset += ends.nbytes
+        meta['prices_offset'] = offset
+        block.buf[offset:offset + prices.nbytes] = prices.tobytes()
+        offset += prices.nbytes
+    name = block.name
+    block.close()  # The parent reads the block, then unlinks it
+    return name, metas
+
+# Function to rebuild one page's long-format rows from a shared memory block (copies
+# out of the block)
+def _long_from_block(buf, meta):
+    n_rows, points = meta['rows'], meta['points']
+    ends = np.frombuffer(buf, dtype=np.int64, count=n_rows, offset=meta['ends_offset'])
+    prices = np.frombuffer(buf, dtype=np.float32, count=n_rows * len(points),
+                           offset=meta['prices_offset'])
+    interval_end = pd.DatetimeIndex(ends.copy(), tz='UTC').tz_convert(ERCOT_TZ)
+    return pd.DataFrame({
+        'oper_day': np.repeat(np.datetime64(meta['day'], 'ns'), n_rows * len(points)),
+        'interval_end': interval_end.repeat(len(points)),
+        'settlement_point': pd.Categorical.from_codes(
+            np.tile(np.arange(len(points)), n_rows), categories=points),
+        'price': prices.copy(),
+    })
+
+# Function to parse pages in a process pool, yielding (feed, day, long-format rows or
+# None, error or None)
+def iter_parsed_pages(pages, workers=None, chunk_size=16):
+    chunks = [pages[i:i + chunk_size] for i in range(0, len(pages), chunk_size)]
+    if workers == 1:
+        results = map(_parse_chunk, chunks)  # No pool: handy for profiling, small runs
+        pool = None
+    else:
+        # Start the parent's resource tracker first so the workers share it: a block
+        # registered by a worker is then unregistered by the parent's unlink instead of
+        # "leaking" at worker exit
+        resource_tracker.ensure_running()
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_parse_chunk, chunks)
+    try:
+        for name, metas in results:
+            block = shared_memory.SharedMemory(name=name) if name else None
+            try:
+                for meta in metas:
+                    if 'error' in meta:
+                        yield meta['feed'], meta['day'], None, meta['error']
+                    else:
+                        long_df = _long_from_block(block.buf, meta)
+                        yield meta['feed'], meta['day'], long_df, None
+            finally:
+                if block is not None:
+                    block.close()
+                    block.unlink()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+# Function to check whether a page's rows cover every interval of its operating day
+def is_complete(feed, day, long_df):
+    minutes = FEED_LAYOUT[feed][1]
+    return long_df['interval_end'].nunique() >= intervals_in_day(day, minutes)
+
+# Function to re-parse a folder of saved pages (or the page cache) into the price store.
+# Days already complete in the store are skipped unless overwrite is set; pages missing
+# intervals are never stored, so they can't replace a complete day.
+def bulk_ingest(directory=default_cache_dir, store=None, workers=None, chunk_size=16,
+                overwrite=False, progress=None):
+    store = store or default_store
+    pages = find_pages(directory)
+    if not overwrite:
+        pages = [(feed, day, path) for feed, day, path in pages
+                 if not (is_final_day(day) and store.has_complete_day(feed, day))]
+    print(f"Ingesting {len(pages)} pages from {directory} "
+          f"with {workers or os.cpu_count()} workers")
+
+    stored = 0
+    incomplete = 0
+    failed = []
+    parsed = iter_parsed_pages(pages, workers, chunk_size)
+    with span('bulk_ingest'):
+        for done, (feed, day, long_df, error) in enumerate(parsed, 1):
+            if error is not None:
+                print(f"Error parsing {feed} {day}: {error}")
+                failed.append((feed, day))
+                inc('scrape_errors_total', feed=feed, reason='bulk_parse')
+            elif not is_complete(feed, day, long_df):
+                incomplete += 1  # Saved mid-day; the backfill or GUI fetches it whole
+            else:
+                store.write_day(feed, day, long_df)
+                stored += 1
+                inc('rows_parsed_total', len(long_df), feed=feed)
+            if progress is not None:
+                progress(done, len(pages), feed, day)
+
+    print(f"Done: {stored} pages stored, {incomplete} incomplete pages skipped, "
+          f"{len(failed)} failed")
+    return stored, failed
@@ -0,0 +1,112 @@
+import html
+import re
+
+import numpy as np
+import pandas as pd
+
+# Parser for ERCOT CDR pages. The pages are one flat <table> with a header row
+# of <th> cells followed by <td> rows, so a single regex tokenizing pass over
+# the table is enough to pull out the cells; no soup tree or second pd.read_html parse.
+
+_table_tag = re.compile(r'<(/?)table\b[^>]*>', re.IGNORECASE)
+_row_start = re.compile(r'<tr\b[^>]*>', re.IGNORECASE)
+_cell = re.compile(r'<t([dh])\b[^>]*>(.*?)(?=<t[dh]\b|</tr\s*>|\Z)',
+                   re.IGNORECASE | re.DOTALL)
+_inner_tag = re.compile(r'<[^>]*>')
+
+# Function to cut the first top-level <table> out of the page
+def _first_table(text):
+    depth = 0
+    start = None
+    for match in _table_tag.finditer(text):
+        if match.group(1):
+            depth -= 1
+            if depth == 0 and start is not None:
+                return text[start:match.start()]
+        else:
+            if depth == 0:
+                start = match.end()
+            depth += 1
+    return text[start:] if start is not None else None
+
+# Function to clean the text of one cell the way read_html would
+def _cell_text(raw):
+    if '<' in raw:
+        raw = _inner_tag.sub('', raw)
+    if '&' in raw:
+        raw = html.unescape(raw)
+    return ' '.join(raw.split())
+
+# Function to read the first table of a CDR page into a header and text columns
+def parse_table_columns(content):
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+
+    table = _first_table(content)
+    if table is None:
+        return None, None  # No table on the page
+
+    header = None
+    rows = []
+    for row_html in _row_start.split(table)[1:]:
+        cells = _cell.findall(row_html)
+        if not cells:
+            continue
+        row = [_cell_text(raw) for _, raw in cells]
+        is_header = all(kind.lower() == 'h' for kind, _ in cells)
+        if header is None and not rows and is_header:
+            header = row
+        else:
+            rows.append(row)
+
+    if header is None and not rows:
+        return None, None
+
+    width = len(header) if header is not None else max(len(row) for row in rows)
+    if header is None:
+        header = list(range(width))
+
+    # Transpose rows into columns, padding short rows with empty cells
+    for i, row in enumerate(rows):
+        if len(row) != width:
+            rows[i] = (row + [''] * width)[:width]
+    if rows:
+        columns = [list(column) for column in zip(*rows, strict=True)]
+    else:
+        columns = [[] for _ in range(width)]
+
+    return header, columns
+
+# Function to turn a column of cell text into an int64/float64 array when it is numeric
+def convert_column(values):
+    if not values:
+        return np.array([], dtype=np.float64)
+
+    # Match read_html: strip thousands separators and treat blank cells as missing
+    cleaned = [v.replace(',', '') if v else 'nan' for v in values]
+    try:
+        numbers = np.array(cleaned, dtype=np.float64)
+    except ValueError:
+        # Text column (dates, settlement points, ...)
+        return np.array(values, dtype=object)
+
+    has_missing = '' in values
+    is_integral = not any('.' in v or 'e' in v or 'E' in v or 'n' in v for v in cleaned)
+    if is_integral and not has_missing:
+        return numbers.astype(np.int64)
+    return numbers
+
+# Function to parse the first table of a CDR page straight into a typed DataFrame
+def parse_cdr_table(content, text_columns=()):
+    header, columns = parse_table_columns(content)
+    if header is None:
+        return None
+
+    data = {}
+    for name, values in zip(header, columns, strict=True):
+        if name in text_columns:
+            # Keep as text (e.g. zero-padded "0015")
+            data[name] = np.array(values, dtype=object)
+        else:
+            data[name] = convert_column(values)
+    return pd.DataFrame(data, columns=header)
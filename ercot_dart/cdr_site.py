@@ -0,0 +1,26 @@
+import os
+from datetime import datetime, timedelta
+
+import pytz
+
+# Where the CDR reports live and which operating days they cover. Kept free of
+# pandas/requests so the GUI can build its widgets before any of those load.
+
+# Base of the CDR report urls (override with ERCOT_CDR_BASE, e.g. for a local mirror)
+cdr_base = os.environ.get('ERCOT_CDR_BASE', "https://www.ercot.com/content/cdr/html")
+
+# Define the URLs for real-time, DAM and Real-Time Settlement Points data
+real_time_url = f"{cdr_base}/hb_lz.html"
+dam_url_base = f"{cdr_base}/{{date}}_dam_spp.html"
+real_time_spp_url_base = f"{cdr_base}/{{date}}_real_time_spp.html"
+
+# Define the CST timezone
+cst = pytz.timezone('US/Central')
+
+# Function to get the next day and the last four days
+def get_next_and_last_four_days():
+    today = datetime.now(cst)
+    days = [(today + timedelta(days=1)).strftime('%Y-%m-%d')]  # Next day
+    # Previous 4 days
+    days += [(today - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(4)]
+    return days
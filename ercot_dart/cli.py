@@ -0,0 +1,192 @@
+import argparse
+import re
+import sys
+from datetime import datetime
+
+# Command line entry point for the headless side of ercot-dart (no tkinter import below)
+#
+#   ercot-dart collect --feeds rt,dam,spp --interval 5m
+#   ercot-dart backfill --start 2024-01-01 --end 2024-12-31 --feeds dam,spp
+#   ercot-dart export hourly --start 2024-01-01 --end 2024-12-31 --format csv.gz
+#   ercot-dart ingest ~/saved-cdr-pages --workers 8
+#   ercot-dart serve --port 8088
+
+_duration = re.compile(r'^(\d+(?:\.\d+)?)([smh]?)$')
+_units = {'': 1, 's': 1, 'm': 60, 'h': 3600}
+
+# Function to parse a duration like 90, 90s, 5m or 1h into seconds
+def parse_duration(value):
+    match = _duration.match(value.strip().lower())
+    if match is None:
+        raise argparse.ArgumentTypeError(
+            f"invalid duration {value!r} (use e.g. 30s, 5m, 1h)")
+    return float(match.group(1)) * _units[match.group(2)]
+
+# Function to parse a YYYY-MM-DD argument into a date
+def parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            f"invalid date {value!r} (use YYYY-MM-DD)") from e
+
+# Function to parse a comma separated feed list against the allowed names
+def parse_feeds(value, allowed):
+    feeds = [feed.strip() for feed in value.split(',') if feed.strip()]
+    unknown = [feed for feed in feeds if feed not in allowed]
+    if unknown or not feeds:
+        raise argparse.ArgumentTypeError(
+            f"unknown feed(s) {', '.join(unknown) or value!r}; "
+            f"choose from {', '.join(allowed)}")
+    return feeds
+
+# Function to open the store named on the command line, or the shared default one
+def open_store(path):
+    from ercot_dart.price_store import PriceStore, default_store
+    return PriceStore(path) if path else default_store
+
+def run_collect(args):
+    from ercot_dart.collector import run_collector
+    run_collector(args.feeds, args.interval, open_store(args.store))
+    return 0
+
+def run_backfill_command(args):
+    from ercot_dart.backfill import run_backfill
+    if args.end < args.start:
+        print("Error: --end is before --start")
+        return 2
+    _, failed = run_backfill(args.start, args.end, args.feeds, open_store(args.store),
+                             args.workers, args.rate)
+    return 1 if failed else 0
+
+def run_export(args):
+    from ercot_dart.export import default_export_name, export_range
+    end = args.end or args.start
+    output = args.output or default_export_name(args.kind, args.start, end,
+                                                args.format or 'csv')
+    points = None
+    if args.points:
+        points = [point.strip() for point in args.points.split(',')]
+
+    def progress(done, total, day):
+        print(f"[{done}/{total}] {day}")
+
+    try:
+        rows = export_range(args.kind, args.start, end, output, fmt=args.format,
+                            points=points, store=open_store(args.store),
+                            progress=progress)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    print(f"Wrote {rows} rows to {output}")
+    return 0
+
+def run_ingest(args):
+    from ercot_dart.bulk_ingest import bulk_ingest
+    from ercot_dart.page_cache import default_cache_dir
+    _, failed = bulk_ingest(args.directory or default_cache_dir, open_store(args.store),
+                            args.workers, args.chunk_size, args.overwrite)
+    return 1 if failed else 0
+
+def run_serve(args):
+    from ercot_dart.api_server import run_api_server
+    run_api_server(args.port, args.host, open_store(args.store))
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='ercot-dart',
+        description="Collect and store ERCOT CDR prices without the GUI")
+    parser.add_argument('--store', default=None,
+                        help="price store directory (default: $ERCOT_DART_STORE or "
+                             "~/.local/share/ercot-dart/prices)")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="serve Prometheus metrics on this port "
+                             "(default: $ERCOT_DART_METRICS_PORT)")
+    parser.add_argument('--metrics-log', default=None,
+                        help="append a JSON metrics snapshot to this file ('-' for "
+                             "stdout) every $ERCOT_DART_METRICS_INTERVAL seconds")
+    parser.add_argument('--profile', choices=('cprofile', 'tracemalloc'), default=None,
+                        help="profile the run and print a report at exit "
+                             "(default: $ERCOT_DART_PROFILE)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    collect = commands.add_parser(
+        'collect', help="keep polling the CDR pages and write new prices to the store")
+    collect.add_argument('--feeds', default='rt,dam,spp',
+                         type=lambda value: parse_feeds(value, ('rt', 'dam', 'spp')),
+                         help="comma separated feeds: rt, dam, spp (default: all)")
+    collect.add_argument('--interval', default='5m', type=parse_duration,
+                         help="how often to check the DAM and RT SPP pages, "
+                              "e.g. 30s, 5m, 1h (default: 5m)")
+    collect.set_defaults(func=run_collect)
+
+    backfill = commands.add_parser(
+        'backfill', help="fetch and store DAM / RT SPP history for a date range")
+    backfill.add_argument('--start', required=True, type=parse_date,
+                          help="first operating day (YYYY-MM-DD)")
+    backfill.add_argument('--end', required=True, type=parse_date,
+                          help="last operating day (YYYY-MM-DD)")
+    backfill.add_argument('--feeds', default='dam,spp',
+                          type=lambda value: parse_feeds(value, ('dam', 'spp')),
+                          help="comma separated feeds: dam, spp (default: both)")
+    backfill.add_argument('--workers', type=int, default=4,
+                          help="concurrent downloads (default: 4)")
+    backfill.add_argument('--rate', type=float, default=2.0,
+                          help="max requests per second (default: 2)")
+    backfill.set_defaults(func=run_backfill_command)
+
+    export = commands.add_parser(
+        'export',
+        help="write hourly settlement or DAM prices for a date range to CSV / Parquet")
+    export.add_argument('kind', choices=('hourly', 'dam'))
+    export.add_argument('--start', required=True, type=parse_date,
+                        help="first operating day (YYYY-MM-DD)")
+    export.add_argument('--end', type=parse_date, default=None,
+                        help="last operating day (default: --start)")
+    export.add_argument('--output', default=None,
+                        help="file to write (default: e.g. "
+                             "Hourly_Settlement_Data_<start>_<end>.csv in the current "
+                             "directory)")
+    export.add_argument('--format', choices=('csv', 'csv.gz', 'parquet'), default=None,
+                        help="file format (default: from the --output extension, "
+                             "else csv)")
+    export.add_argument('--points', default=None,
+                        help="comma separated settlement points to keep "
+                             "(default: all)")
+    export.set_defaults(func=run_export)
+
+    ingest = commands.add_parser(
+        'ingest',
+        help="re-parse saved DAM / RT SPP pages into the store using every core")
+    ingest.add_argument('directory', nargs='?', default=None,
+                        help="folder of saved {date}_dam_spp.html / "
+                             "{date}_real_time_spp.html pages "
+                             "(default: the page cache)")
+    ingest.add_argument('--workers', type=int, default=None,
+                        help="parser processes (default: one per core)")
+    ingest.add_argument('--chunk-size', type=int, default=16,
+                        help="pages per worker task (default: 16)")
+    ingest.add_argument('--overwrite', action='store_true',
+                        help="re-parse days already complete in the store")
+    ingest.set_defaults(func=run_ingest)
+
+    serve = commands.add_parser(
+        'serve',
+        help="serve the prices as a local read-only JSON API for other scripts")
+    serve.add_argument('--host', default='127.0.0.1',
+                       help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument('--port', type=int, default=8088,
+                       help="port to listen on (default: 8088)")
+    serve.set_defaults(func=run_serve)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    from ercot_dart.metrics import start_from_env
+    start_from_env(args.metrics_port, args.metrics_log, args.profile)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
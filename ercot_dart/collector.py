@@ -0,0 +1,105 @@
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+
+from ercot_dart.lmp_history import LmpHistory
+from ercot_dart.lmp_tracker import LmpChangeTracker, PollSchedule
+from ercot_dart.price_store import default_store
+from ercot_dart.scrapers import cst, load_dam_day, load_real_time_spp_day, real_time_url
+
+# Long-running headless collector that keeps the price store current
+#
+#   ercot-dart collect --feeds rt,dam,spp --interval 5m
+#
+# RT LMPs are polled on the SCED cadence (see lmp_tracker); DAM and RT SPP pages are
+# checked every --interval. Nothing is kept in memory between passes apart from the
+# last RT LMP snapshot and a fixed-size ring buffer of recent LMPs (for spike
+# reporting), so the process stays small however long it runs.
+
+COLLECT_FEEDS = ('rt', 'dam', 'spp')
+
+# Function to list the operating days worth checking for a feed right now
+def days_to_collect(feed, today):
+    if feed == 'dam':
+        return [today, today + timedelta(days=1)]  # Tomorrow's DAM posts mid-afternoon
+    if feed == 'spp':
+        # Yesterday's last intervals settle after midnight
+        return [today - timedelta(days=1), today]
+    return []
+
+class Collector:
+    def __init__(self, feeds=COLLECT_FEEDS, interval=300, store=None):
+        self.feeds = list(feeds)
+        self.interval = interval
+        self.store = store or default_store
+        history = LmpHistory() if 'rt' in self.feeds else None
+        self.tracker = LmpChangeTracker(store=self.store, history=history)
+        self.schedule = PollSchedule()
+        self.stop_event = threading.Event()
+        self.next_run = dict.fromkeys(self.feeds, 0.0)
+
+    # Function to ask the collect loop to finish (safe from a signal handler)
+    def stop(self, *_args):
+        self.stop_event.set()
+
+    # Function to poll the RT LMP page once; returns the seconds until the next poll
+    def collect_rt(self):
+        result = self.tracker.poll(real_time_url)
+        if result is None:
+            return self.schedule.after_no_change()
+        snapshot, delta, timestamp = result
+        print(f"{timestamp:%Y-%m-%d %H:%M:%S} rt: {len(delta)} changed points")
+        spikes = snapshot[self.tracker.history.latest_spikes()]
+        if not spikes.empty:
+            pairs = zip(spikes['Settlement Point'], spikes['LMP'], strict=True)
+            spiking = ", ".join(f"{point} {lmp:.2f}" for point, lmp in pairs)
+            print(f"  spiking: {spiking}")
+        return self.schedule.after_change()
+
+    # Function to bring the DAM or RT SPP days in play up to date; returns the delay
+    def collect_daily(self, feed):
+        load_day = load_dam_day if feed == 'dam' else load_real_time_spp_day
+        for day in days_to_collect(feed, datetime.now(cst).date()):
+            df = load_day(day, store=self.store)  # Stored settled days aren't refetched
+            print(f"{datetime.now(cst):%Y-%m-%d %H:%M:%S} {feed} {day}: {len(df)} rows")
+        return self.interval
+
+    # Function to run one feed, keeping the loop alive through any error
+    def collect(self, feed):
+        try:
+            if feed == 'rt':
+                return self.collect_rt()
+            return self.collect_daily(feed)
+        except Exception as e:
+            print(f"Error collecting {feed} data: {e}")
+            return self.schedule.after_no_change() if feed == 'rt' else self.interval
+
+    # Function to run until stopped, sleeping until whichever feed is due next
+    def run(self):
+        feeds = ', '.join(self.feeds)
+        print(f"Collecting {feeds} into {self.store.root} every {self.interval}s")
+        if self.tracker.history is not None:
+            try:
+                history = self.tracker.history
+                snapshots = history.load_store(self.store, datetime.now(cst))
+                print(f"Loaded {snapshots} recent RT LMP snapshots for spike detection")
+            except Exception as e:
+                print(f"Error loading RT LMP history: {e}")
+        while not self.stop_event.is_set():
+            now = time.time()
+            for feed in self.feeds:
+                if self.next_run[feed] <= now:
+                    self.next_run[feed] = time.time() + self.collect(feed)
+                if self.stop_event.is_set():
+                    break
+            self.stop_event.wait(max(0.0, min(self.next_run.values()) - time.time()))
+        print("Collector stopped")
+
+# Function to run a collector in the foreground until SIGINT/SIGTERM
+def run_collector(feeds=COLLECT_FEEDS, interval=300, store=None):
+    collector = Collector(feeds, interval, store)
+    signal.signal(signal.SIGTERM, collector.stop)
+    signal.signal(signal.SIGINT, collector.stop)
+    collector.run()
+    return collector
@@ -0,0 +1,199 @@
+import threading
+from collections import OrderedDict
+
+from ercot_dart.metrics import add_collector, inc, span
+from ercot_dart.singleflight import SingleFlight
+
+# In-process data manager shared by the tabs: each (feed, operating day) is loaded and
+# parsed once, kept in an LRU, and handed out as a read-only view (a shallow frame over
+# the same arrays, never a copy). Derived views (hourly averages, DART basis) are
+# recomputed only when the versions of their inputs change, and subscribers hear about
+# every new version of a feed and of the views built on it.
+#
+#   bus = default_bus
+#   # callbacks run on the loading thread
+#   unsubscribe = bus.subscribe('hourly', lambda feed, day: ...)
+#   # loads RT SPP for the day if needed, then averages it
+#   hourly = bus.get('hourly', day)
+#   # re-fetch; 'hourly' subscribers are told if it changed
+#   spp = bus.get('spp', day, refresh=True)
+#
+# Nothing here imports pandas or tkinter, so the GUI can subscribe before either loads.
+
+# Function to load a day of DAM prices (the scraped wide table)
+def load_dam(day):
+    from ercot_dart.scrapers import load_dam_day
+    return load_dam_day(day)
+
+# Function to load a day of Real-Time Settlement Point prices (the scraped wide table)
+def load_spp(day):
+    from ercot_dart.scrapers import load_real_time_spp_day
+    return load_real_time_spp_day(day)
+
+# Function to average a day of 15-minute RT SPP intervals to hour ending
+def hourly_view(spp):
+    from ercot_dart.aggregation import resample_prices
+    return resample_prices(spp, 'hour') if not spp.empty else spp
+
+# Function to compute a day's DART spreads (DAM minus hourly RT) from the DAM and RT
+# SPP tables
+def basis_view(dam, spp):
+    from ercot_dart.basis_engine import dart_from_tables, dart_spreads, dart_to_wide
+    if dam.empty or spp.empty:
+        return dart_to_wide(dart_spreads(None, None))
+    return dart_to_wide(dart_from_tables(spp, dam))
+
+# Function to rebuild a frame over read-only views of its column arrays (no data is
+# copied), so a stray write raises instead of changing every tab's data. Extension
+# columns (categoricals, tz-aware times) are passed through as they are.
+def _freeze(df):
+    import numpy as np
+    import pandas as pd
+    columns = {}
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        if isinstance(column.dtype, np.dtype):
+            values = column.to_numpy(copy=False).view()
+            values.flags.writeable = False
+            column = values
+        columns[i] = column
+    frozen = pd.DataFrame(columns, index=df.index, copy=False)
+    frozen.columns = df.columns
+    return frozen
+
+class DataBus:
+    def __init__(self, max_entries=64):
+        # Feed -> function(day) returning a frame
+        self.feeds = {'dam': load_dam, 'spp': load_spp}
+        # Name -> (inputs, function)
+        self.views = {
+            'hourly': (('spp',), hourly_view),
+            'basis': (('dam', 'spp'), basis_view),
+        }
+        self.max_entries = max_entries
+        # (feed or view, day) -> (version, input versions, frame); least recently used
+        # first
+        self.entries = OrderedDict()
+        self.subscribers = {}  # Feed or view -> [callback(name, day)]
+        self.version = 0
+        self.lock = threading.Lock()
+        self.flight = SingleFlight()
+        add_collector(self.metrics)
+
+    # Function to add a feed (a function day -> frame) or a view computed from other
+    # feeds / views
+    def add_feed(self, name, load):
+        self.feeds[name] = load
+
+    def add_view(self, name, inputs, compute):
+        self.views[name] = (tuple(inputs), compute)
+
+    # Function to call callback(name, day) whenever a new version of a feed or view may
+    # be available. It runs on whichever thread loaded the data; returns a function
+    # that unsubscribes.
+    def subscribe(self, name, callback):
+        with self.lock:
+            self.subscribers.setdefault(name, []).append(callback)
+
+        def unsubscribe():
+            with self.lock:
+                self.subscribers[name].remove(callback)
+
+        return unsubscribe
+
+    # Function to get a read-only view of a feed or derived view for one day;
+    # refresh=True re-fetches the feed(s)
+    def get(self, name, day, refresh=False):
+        return self._entry(name, day, refresh)[2].copy(deep=False)
+
+    def _cached(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def _remember(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def _entry(self, name, day, refresh=False):
+        if name in self.views:
+            inputs, compute = self.views[name]
+            input_entries = [self._entry(input_name, day, refresh)
+                             for input_name in inputs]
+            versions = tuple(entry[0] for entry in input_entries)
+            entry = self._cached((name, day))
+            if entry is not None and entry[1] == versions:
+                inc('bus_hits_total', feed=name)
+                return entry
+            frames = [entry[2] for entry in input_entries]
+            return self.flight.do((name, day, versions), self._compute,
+                                  name, day, versions, compute, frames)
+        if name not in self.feeds:
+            raise KeyError(f"Unknown feed or view {name!r}")
+        entry = self._cached((name, day))
+        if entry is not None and not refresh:
+            inc('bus_hits_total', feed=name)
+            return entry
+        return self.flight.do((name, day), self._load, name, day)
+
+    def _compute(self, name, day, versions, compute, frames):
+        with span('aggregate', feed=name):
+            frame = _freeze(compute(*frames))
+        with self.lock:
+            self.version += 1
+            entry = (self.version, versions, frame)
+        self._remember((name, day), entry)
+        return entry
+
+    def _load(self, name, day):
+        frame = self.feeds[name](day)
+        if frame.empty:
+            # Nothing published yet (or the fetch failed): not kept, so the next get
+            # tries again
+            return (0, (), frame)
+        old = self._cached((name, day))
+        if old is not None and old[2].equals(frame):
+            # Same data as before: keep the version, so nothing built on it is
+            # recomputed
+            return old
+        with self.lock:
+            self.version += 1
+            entry = (self.version, (), _freeze(frame))
+        self._remember((name, day), entry)
+        inc('bus_loads_total', feed=name)
+        self._notify(name, day)
+        return entry
+
+    # Function to tell the subscribers of a feed, and of every view built on it, that
+    # a day changed
+    def _notify(self, name, day):
+        names = [name]
+        while True:
+            more = [view for view, (inputs, _) in self.views.items()
+                    if view not in names and any(i in names for i in inputs)]
+            if not more:
+                break
+            names += more
+        with self.lock:
+            callbacks = [(subscribed, callback) for subscribed in names
+                         for callback in self.subscribers.get(subscribed, ())]
+        for subscribed, callback in callbacks:
+            try:
+                callback(subscribed, day)
+            except Exception as e:
+                print(f"Error in {subscribed} subscriber: {e}")
+
+    # Metrics collector: entries held and loads shared between callers
+    def metrics(self):
+        return [
+            ('bus_entries', {}, len(self.entries), 'gauge'),
+            ('bus_coalesced_total', {}, self.flight.stats()['coalesced'], 'counter'),
+        ]
+
+# Shared bus used by the GUI tabs
+default_bus = DataBus()
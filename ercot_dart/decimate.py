@@ -0,0 +1,53 @@
+import numpy as np
+
+# Min/max decimation of price series for plotting. A line drawn through more
+# points than the axes has pixels looks the same as one drawn through the lowest
+# and highest point of every pixel column, so each bin keeps just those two (in
+# time order, plus any gap marker). Spikes survive, unlike with plain striding or
+# averaging.
+#
+#   x, y = minmax_decimate(x, y, bins=int(ax.bbox.width))
+
+# Function to reduce (x, y) to the min and max of `bins` equal-count bins; short series
+# are returned as is. A bin holding a gap marker (a NaN from break_gaps) keeps it too,
+# so the line still breaks at every gap however far the view is zoomed out.
+def minmax_decimate(x, y, bins):
+    n = len(x)
+    if bins < 1 or n <= 2 * bins:
+        return x, y
+
+    per_bin = -(-n // bins)
+    bins = -(-n // per_bin)
+    padded = np.full(bins * per_bin, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(bins, per_bin)
+
+    # NaNs (gaps, padding) never win the min or max; a bin of only NaNs keeps a NaN
+    missing = np.isnan(padded)
+    low = np.where(missing, np.inf, padded).argmin(axis=1)
+    high = np.where(missing, -np.inf, padded).argmax(axis=1)
+
+    # The bin's first gap marker (padding after the last point doesn't count),
+    # otherwise the max again; the three are then put back in time order
+    gaps = missing & (np.arange(bins * per_bin).reshape(bins, per_bin) < n)
+    gap = np.where(gaps.any(axis=1), gaps.argmax(axis=1), high)
+    start = np.arange(bins)[:, None] * per_bin
+    index = (start + np.sort(np.stack([low, high, gap], axis=1), axis=1)).ravel()
+    index = np.minimum(index, n - 1)
+    return x[index], y[index]
+
+# Function to put a NaN wherever consecutive x values are further apart than max_step,
+# so the line breaks at gaps
+def break_gaps(x, y, max_step):
+    gaps = np.flatnonzero(np.diff(x) > max_step) + 1
+    if len(gaps) == 0:
+        return x, y
+    return (np.insert(x, gaps, x[gaps - 1] + max_step / 2),
+            np.insert(y.astype(np.float64), gaps, np.nan))
+
+# Function to find the slice of a sorted x array covering [x0, x1], plus one point
+# either side so lines reach the edges
+def visible_slice(x, x0, x1):
+    start = max(int(np.searchsorted(x, x0, side='left')) - 1, 0)
+    stop = min(int(np.searchsorted(x, x1, side='right')) + 1, len(x))
+    return slice(start, stop)
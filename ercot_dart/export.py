@@ -0,0 +1,157 @@
+import gzip
+import os
+from datetime import timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ercot_dart.aggregation import resample_prices
+from ercot_dart.metrics import inc, span
+from ercot_dart.price_frames import price_columns, repeated_hour_flag
+from ercot_dart.scrapers import load_dam_day, load_real_time_spp_day
+
+# Streaming export of hourly settlement and DAM prices over any date range. Days are
+# loaded (from the price store when settled, scraped otherwise), converted and
+# written one at a time, so memory stays at about one day whatever the range.
+#
+#   export_range('hourly', date(2024, 1, 1), date(2024, 12, 31),
+#                'Hourly_Settlement_Data_2024-01-01_2024-12-31.csv.gz')
+
+EXPORT_KINDS = ('hourly', 'dam')
+EXPORT_FORMATS = ('csv', 'csv.gz', 'parquet')
+
+# File name prefixes, as in Hourly_Settlement_Data_YYYY-MM-DD.csv
+FILE_PREFIXES = {'hourly': 'Hourly_Settlement_Data', 'dam': 'DAM_Settlement_Data'}
+
+# Function to build the default export file name from the flow date(s)
+def default_export_name(kind, start, end=None, fmt='csv'):
+    dates = start.isoformat()
+    if end is not None and end != start:
+        dates += f"_{end.isoformat()}"
+    return f"{FILE_PREFIXES[kind]}_{dates}.{fmt}"
+
+# Function to work out the format from a file name (.csv, .csv.gz or .parquet)
+def format_from_path(path):
+    for fmt in sorted(EXPORT_FORMATS, key=len, reverse=True):
+        if path.lower().endswith('.' + fmt):
+            return fmt
+    raise ValueError(
+        f"Can't tell the export format of {path!r}; use .csv, .csv.gz or .parquet")
+
+# Function to get one day of hourly settlement averages (Oper Day, Hour Ending,
+# Repeated Hour Flag, points)
+def hourly_day(day, store=None):
+    spp = load_real_time_spp_day(day, store=store)
+    if spp.empty:
+        return spp
+    return resample_prices(spp, 'hour').drop(columns=['Interval End'])
+
+# Function to get one day of DAM settlement point prices (Oper Day, Hour Ending,
+# Repeated Hour Flag, points). Only fall-back days come with a flag column, so the
+# other days get one too and every day has the same layout.
+def dam_day(day, store=None):
+    df = load_dam_day(day, store=store)
+    if df.empty or repeated_hour_flag(df) is not None:
+        return df
+    columns = ['Oper Day', 'Hour Ending', 'Repeated Hour Flag'] + price_columns(df)
+    return df.assign(**{'Repeated Hour Flag': 'N'})[columns]
+
+# Function to yield (day, frame) for every day in the range, one day in memory at a time
+def iter_export_days(kind, start, end, points=None, store=None):
+    load_day = hourly_day if kind == 'hourly' else dam_day
+    day = start
+    while day <= end:
+        df = load_day(day, store=store)
+        if not df.empty and points is not None:
+            prices = set(price_columns(df))
+            df = df[[col for col in df.columns if col not in prices or col in points]]
+        yield day, df
+        day += timedelta(days=1)
+
+# Writes day frames to CSV (optionally gzipped) as they arrive; the header comes from
+# the first day
+class CsvDayWriter:
+    def __init__(self, path, compress=False):
+        if compress:
+            self.file = gzip.open(path, 'wt', newline='')  # noqa: SIM115 (kept open)
+        else:
+            self.file = open(path, 'w', newline='')  # noqa: SIM115 (kept open)
+        self.columns = None
+
+    def write(self, df):
+        if self.columns is None:
+            self.columns = list(df.columns)
+            df.to_csv(self.file, index=False)
+        else:
+            df = df.reindex(columns=self.columns)
+            df.to_csv(self.file, index=False, header=False)
+
+    def close(self):
+        self.file.close()
+
+# Writes day frames to one Parquet file, a row group per day; the schema comes from
+# the first day
+class ParquetDayWriter:
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+        self.columns = None
+
+    def write(self, df):
+        if self.writer is None:
+            self.columns = list(df.columns)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self.writer = pq.ParquetWriter(self.path, table.schema, compression='zstd')
+        else:
+            df = df.reindex(columns=self.columns)
+            table = pa.Table.from_pandas(df, schema=self.writer.schema,
+                                         preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+# Function to stream a date range to a file. progress(done, total, day) is called after
+# each day; cancel() returning True stops the export and removes the partial file.
+# Returns the rows written.
+def export_range(kind, start, end, path, fmt=None, points=None, store=None,
+                 progress=None, cancel=None):
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"Unknown export {kind!r}, expected one of {EXPORT_KINDS}")
+    if end < start:
+        raise ValueError("The export range ends before it starts")
+    fmt = fmt or format_from_path(path)
+
+    tmp_path = os.path.join(os.path.dirname(os.path.abspath(path)),
+                            '.' + os.path.basename(path) + '.tmp')
+    if fmt == 'parquet':
+        writer = ParquetDayWriter(tmp_path)
+    else:
+        writer = CsvDayWriter(tmp_path, compress=(fmt == 'csv.gz'))
+    total = (end - start).days + 1
+    rows = 0
+    try:
+        days = iter_export_days(kind, start, end, points, store)
+        for done, (day, df) in enumerate(days, 1):
+            if cancel is not None and cancel():
+                raise InterruptedError("Export cancelled")
+            if not df.empty:
+                with span('export', kind=kind, format=fmt):
+                    writer.write(df)
+                rows += len(df)
+                inc('rows_exported_total', len(df), kind=kind)
+            else:
+                print(f"No {kind} data for {day}; skipped in the export")
+            if progress is not None:
+                progress(done, total, day)
+        writer.close()
+        if rows == 0:
+            raise ValueError(f"No {kind} data between {start} and {end}")
+        os.replace(tmp_path, path)  # Only a finished export appears under the real name
+    except BaseException:
+        writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return rows
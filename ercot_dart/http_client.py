@@ -0,0 +1,139 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ercot_dart.metrics import add_collector
+
+# Status codes worth retrying: server-side errors and throttling
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Per-host request counters and latency totals
+class HostStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0  # Connection errors, timeouts and retryable status codes
+        self.retries = 0
+        self.bytes = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_error = None
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'bytes': self.bytes,
+            'avg_latency': self.total_latency / self.requests if self.requests else 0.0,
+            'max_latency': self.max_latency,
+            'last_error': self.last_error,
+        }
+
+# Pooled HTTP client shared by all scrapers: keep-alive connections, timeouts and
+# jittered retries
+class HttpClient:
+    def __init__(self, connect_timeout=5.0, read_timeout=30.0, max_retries=3,
+                 backoff_base=0.5, backoff_max=10.0, pool_size=8, sleep=time.sleep):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.host_stats = {}
+
+        # One session means one connection pool, so repeat fetches reuse the TLS
+        # connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+
+    # Function to work out how long to wait before retry number `attempt` (full jitter)
+    def backoff(self, attempt, response=None):
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        delay = random.uniform(0, ceiling)
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = max(delay, min(self.backoff_max, float(retry_after)))
+        return delay
+
+    def _record(self, host, latency, response=None, error=None, retry=False):
+        with self.lock:
+            stats = self.host_stats.setdefault(host, HostStats())
+            stats.requests += 1
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+            if response is not None:
+                stats.bytes += len(response.content)
+            if error is not None:
+                stats.errors += 1
+                stats.last_error = error
+            if retry:
+                stats.retries += 1
+
+    # Function to GET a url, retrying connection errors, timeouts and 5xx responses
+    def get(self, url, headers=None, timeout=None):
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers,
+                                            timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                retry = attempt < self.max_retries
+                self._record(host, time.perf_counter() - start,
+                             error=f"{type(e).__name__}: {e}", retry=retry)
+                if not retry:
+                    raise
+                self.sleep(self.backoff(attempt))
+                attempt += 1
+                continue
+
+            latency = time.perf_counter() - start
+            if response.status_code in RETRY_STATUSES:
+                retry = attempt < self.max_retries
+                self._record(host, latency, response,
+                             error=f"HTTP {response.status_code}", retry=retry)
+                if retry:
+                    self.sleep(self.backoff(attempt, response))
+                    attempt += 1
+                    continue
+                return response  # Out of retries; raise_for_status reports it
+
+            self._record(host, latency, response)
+            return response
+
+    # Function to report latency and error statistics per host
+    def stats(self):
+        with self.lock:
+            return {host: stats.as_dict() for host, stats in self.host_stats.items()}
+
+    def close(self):
+        self.session.close()
+
+    # Function to report the per-host counters as metrics samples
+    def metrics(self):
+        samples = []
+        for host, stats in self.stats().items():
+            labels = {'host': host}
+            samples += [
+                ('http_requests_total', labels, stats['requests'], 'counter'),
+                ('http_errors_total', labels, stats['errors'], 'counter'),
+                ('http_retries_total', labels, stats['retries'], 'counter'),
+                ('http_downloaded_bytes_total', labels, stats['bytes'], 'counter'),
+                ('http_max_latency_seconds', labels, stats['max_latency'], 'gauge'),
+            ]
+        return samples
+
+# Shared client used by the page cache and every scraper
+default_client = HttpClient()
+add_collector(default_client.metrics)
@@ -0,0 +1,187 @@
+import os
+import threading
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+# Fixed-size in-memory history of RT LMP snapshots: one float32 row per SCED snapshot,
+# one column per settlement point, written into a ring buffer so an append is O(1) and
+# the memory use never grows (3 days x 288 snapshots x ~1,000 points is about 3.5 MB).
+#
+#   history = LmpHistory(days=3)
+#   history.append(timestamp, snapshot['Settlement Point'], snapshot['LMP'])
+#   flags = history.latest_spikes()   # bool per row of the snapshot just appended
+#
+# Spike thresholds (override with the environment):
+#   ERCOT_DART_SPIKE_WINDOW=12    snapshots in the rolling baseline (12 = the last hour)
+#   ERCOT_DART_SPIKE_Z=3          flag prices this many standard deviations above the
+#                                 baseline
+#   ERCOT_DART_SPIKE_PRICE=1000   flag any price at or above this ($/MWh; 0 = off)
+#   ERCOT_DART_SPIKE_JUMP=100     flag a rise of at least this much since the last
+#                                 snapshot (0 = off)
+
+SNAPSHOTS_PER_DAY = 288  # SCED runs every 5 minutes
+DEFAULT_DAYS = 3
+
+SPIKE_WINDOW = int(os.environ.get('ERCOT_DART_SPIKE_WINDOW', 12))
+SPIKE_Z = float(os.environ.get('ERCOT_DART_SPIKE_Z', 3.0))
+SPIKE_PRICE = float(os.environ.get('ERCOT_DART_SPIKE_PRICE', 1000.0))
+SPIKE_JUMP = float(os.environ.get('ERCOT_DART_SPIKE_JUMP', 100.0))
+MIN_SAMPLES = 6  # Baseline snapshots needed before the z-score rule applies
+# Floor on the baseline std ($/MWh), so a flat price moving a few dollars is not a spike
+MIN_STD = 5.0
+
+_no_time = np.iinfo(np.int64).min
+
+class LmpHistory:
+    def __init__(self, days=DEFAULT_DAYS, snapshots_per_day=SNAPSHOTS_PER_DAY):
+        self.capacity = days * snapshots_per_day
+        # Snapshot time (UTC ns) and prices; price columns are allocated ahead
+        self.times = np.full(self.capacity, _no_time, dtype=np.int64)
+        self.prices = np.full((self.capacity, 64), np.nan, dtype=np.float32)
+        self.points = []  # Settlement point of each column
+        self.columns = {}  # Settlement point -> column
+        self.head = 0  # Row the next snapshot goes into
+        self.count = 0
+        # Points of the last append and their columns, reused while the layout holds
+        self.last_points = None
+        self.last_columns = None
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    # Function to get the columns for a list of points, adding columns for new points
+    def _columns_for(self, points):
+        points = np.asarray(points, dtype=object)
+        if self.last_points is not None and np.array_equal(points, self.last_points):
+            return self.last_columns
+        for point in points:
+            if point not in self.columns:
+                self.columns[point] = len(self.points)
+                self.points.append(point)
+        if len(self.points) > self.prices.shape[1]:
+            width = max(len(self.points), 2 * self.prices.shape[1])
+            grown = np.full((self.capacity, width), np.nan, dtype=np.float32)
+            grown[:, :self.prices.shape[1]] = self.prices
+            self.prices = grown
+        self.last_points = points
+        self.last_columns = np.fromiter((self.columns[point] for point in points),
+                                        dtype=np.intp, count=len(points))
+        return self.last_columns
+
+    def _write_row(self, time_ns, columns, values):
+        if self.count and self.times[(self.head - 1) % self.capacity] == time_ns:
+            row = (self.head - 1) % self.capacity  # Same snapshot again: overwrite it
+        else:
+            row = self.head
+            self.head = (self.head + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+            self.prices[row] = np.nan
+        self.times[row] = time_ns
+        self.prices[row, columns] = values
+
+    # Function to add one snapshot (timestamp, point names, prices); points missing from
+    # it are NaN
+    def append(self, timestamp, points, prices):
+        time_ns = _as_ns(timestamp)
+        values = np.asarray(prices, dtype=np.float32)
+        with self.lock:
+            self._write_row(time_ns, self._columns_for(points), values)
+
+    # Function to add many snapshots at once: times (n,), points (m,), prices (n, m)
+    def extend(self, times, points, prices):
+        times = np.asarray(times, dtype=np.int64)[-self.capacity:]
+        prices = np.asarray(prices, dtype=np.float32)[-self.capacity:]
+        with self.lock:
+            columns = self._columns_for(points)
+            for time_ns, values in zip(times, prices, strict=True):
+                self._write_row(time_ns, columns, values)
+
+    # Function to seed the history from the RT LMP snapshots kept in the price store
+    def load_store(self, store, now):
+        start = (now - timedelta(days=self.capacity // SNAPSHOTS_PER_DAY)).date()
+        df = store.load('lmp', start, now.date(),
+                        columns=['timestamp', 'settlement_point', 'lmp'])
+        if df is None or df.empty:
+            return 0
+        stamps = pd.DatetimeIndex(df['timestamp']).as_unit('ns').asi8
+        times, time_rows = np.unique(stamps, return_inverse=True)
+        points = df['settlement_point'].astype('category')
+        grid = np.full((len(times), len(points.cat.categories)), np.nan,
+                       dtype=np.float32)
+        grid[time_rows, points.cat.codes.to_numpy()] = df['lmp'].to_numpy(np.float32)
+        # The store only keeps the points that changed in each snapshot: carry the rest
+        # forward
+        filled = np.where(~np.isnan(grid), np.arange(len(times))[:, None], 0)
+        np.maximum.accumulate(filled, axis=0, out=filled)
+        grid = grid[filled, np.arange(grid.shape[1])]
+        self.extend(times, list(points.cat.categories), grid)
+        return len(times)
+
+    # Function to get the last `rows` snapshots oldest first: (times, prices with a
+    # column per point)
+    def window(self, rows=None):
+        with self.lock:
+            rows = self.count if rows is None else min(rows, self.count)
+            index = (self.head - rows + np.arange(rows)) % self.capacity
+            return self.times[index], self.prices[index, :len(self.points)]
+
+    # Function to compute, for every snapshot held, the mean, std and z-score against
+    # the `window` snapshots before it: (times, mean, std, zscore)
+    def rolling(self, window=SPIKE_WINDOW):
+        times, prices = self.window()
+        return (times, *_rolling_stats(prices, window))
+
+    # Function to flag the points whose latest price spiked; returns a bool per column
+    # (self.points)
+    def spikes(self, window=SPIKE_WINDOW, z=SPIKE_Z, price=SPIKE_PRICE,
+               jump=SPIKE_JUMP):
+        # The z-score of the latest row only needs the `window` rows before it
+        _, prices = self.window(window + 1)
+        if len(prices) == 0:
+            return np.zeros(len(self.points), dtype=bool)
+        latest = prices[-1]
+        zscore = _rolling_stats(prices, window)[2][-1]
+        with np.errstate(invalid='ignore'):
+            flags = zscore >= z  # NaN (too few samples) is never a spike
+            if price:
+                flags |= latest >= price
+            if jump and len(prices) > 1:
+                flags |= latest - prices[-2] >= jump
+        return flags
+
+    # Function to get the spike flags in the row order of the snapshot appended last
+    def latest_spikes(self, **thresholds):
+        flags = self.spikes(**thresholds)
+        return flags[self.last_columns] if self.last_columns is not None else flags
+
+# Function to compute each row's mean, std and z-score against the `window` rows before
+# it (cumulative sums, so the whole history costs O(rows x points)); the z-score is NaN
+# where fewer than MIN_SAMPLES of those rows have a price
+def _rolling_stats(prices, window):
+    valid = ~np.isnan(prices)
+    values = np.where(valid, prices, 0).astype(np.float64)
+    zero = np.zeros((1, prices.shape[1]))
+    sums = np.concatenate([zero, np.cumsum(values, axis=0)])
+    squares = np.concatenate([zero, np.cumsum(values * values, axis=0)])
+    counts = np.concatenate([zero, np.cumsum(valid, axis=0)])
+
+    end = np.arange(len(prices))
+    start = np.maximum(end - window, 0)
+    n = counts[end] - counts[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = (sums[end] - sums[start]) / n
+        variance = (squares[end] - squares[start]) / n - mean * mean
+        std = np.sqrt(np.maximum(variance, 0))
+        zscore = (prices - mean) / np.maximum(std, MIN_STD)
+    zscore[n < MIN_SAMPLES] = np.nan
+    return mean, std, zscore
+
+# Function to turn a timestamp (datetime, pandas Timestamp or int ns) into UTC ns
+def _as_ns(timestamp):
+    if isinstance(timestamp, (int, np.integer)):
+        return int(timestamp)
+    return pd.Timestamp(timestamp).value
+
@@ -0,0 +1,131 @@
+import hashlib
+import re
+import threading
+import time
+from datetime import datetime
+
+import pytz
+
+from ercot_dart.cdr_parser import parse_cdr_table
+from ercot_dart.metrics import inc, span
+from ercot_dart.page_cache import fetch_page
+from ercot_dart.price_store import default_store, record_scrape
+
+# Define the CST timezone
+cst = pytz.timezone('US/Central')
+
+# SCED runs every 5 minutes and the CDR page is updated shortly after each run
+SCED_INTERVAL = 300
+SCED_POST_DELAY = 45  # Seconds after the 5-minute boundary to expect new prices
+
+# Backoff between polls while the page has not changed yet
+MIN_BACKOFF = 15
+MAX_BACKOFF = 120
+
+# hb_lz.html carries its own timestamp, e.g. "Last Updated: Oct 18, 2026 10:25:13"
+_last_updated = re.compile(
+    rb'Last Updated:\s*([A-Z][a-z]{2} \d{1,2}, \d{4} \d{1,2}:\d{2}:\d{2})')
+
+# Function to find the next time (epoch seconds) a SCED result should be on the page
+def next_sced_time(now, post_delay=SCED_POST_DELAY):
+    boundary = (now - post_delay) // SCED_INTERVAL * SCED_INTERVAL + SCED_INTERVAL
+    return boundary + post_delay
+
+# Function to read the page's own Last Updated stamp, falling back to the current time
+def page_timestamp(content):
+    match = _last_updated.search(content)
+    if match is not None:
+        try:
+            stamp = datetime.strptime(match.group(1).decode(), '%b %d, %Y %H:%M:%S')
+            return cst.localize(stamp)
+        except ValueError:
+            pass
+    return datetime.now(cst)
+
+# Keeps the previous RT LMP snapshot and works out what changed in a new copy of it
+class LmpChangeTracker:
+    def __init__(self, store_history=True, store=None, history=None):
+        self.store_history = store_history
+        self.store = store  # Defaults to the shared price store
+        self.history = history  # Optional LmpHistory that new snapshots are appended to
+        self.last_digest = None
+        self.previous = None  # Last snapshot, indexed by Settlement Point
+        self.lmp_day = None  # Operating day of the last stored snapshot
+        self.lock = threading.Lock()
+
+    # Function to compare a fetched page with the last one; None when nothing changed
+    def update(self, content):
+        digest = hashlib.sha1(content).digest()
+        with self.lock:
+            if digest == self.last_digest:
+                inc('rt_unchanged_polls_total')
+                return None  # Same bytes as last time: skip parsing entirely
+
+            with span('parse', feed='rt'):
+                snapshot = parse_cdr_table(content)
+            if snapshot is None or snapshot.empty:
+                return None
+            inc('rows_parsed_total', len(snapshot), feed='rt')
+            indexed = snapshot.set_index('Settlement Point')
+
+            if self.previous is None:
+                delta = snapshot
+            else:
+                # Rows that differ from the previous snapshot, plus points that are new
+                previous = self.previous.reindex(indexed.index)
+                both_missing = (indexed.isna() & previous.isna()).all(axis=1)
+                changed = (indexed != previous).any(axis=1) & ~both_missing
+                delta = snapshot[changed.to_numpy()]
+
+            timestamp = page_timestamp(content)
+            if self.history is not None:
+                self.history.append(timestamp, snapshot['Settlement Point'].to_numpy(),
+                                    snapshot['LMP'].to_numpy())
+
+            self.last_digest = digest
+            self.previous = indexed
+            return snapshot, delta, timestamp
+
+    # Function to fetch the page and report (snapshot, delta, timestamp) if it changed
+    def poll(self, url):
+        with span('fetch', feed='rt'):
+            content = fetch_page(url)
+        result = self.update(content)
+        if result is not None and self.store_history and not result[1].empty:
+            snapshot, delta, timestamp = result
+            record_scrape('lmp', delta, snapshot_time=timestamp, store=self.store)
+            self.compact_on_rollover(timestamp.date())
+        return result
+
+    # Function to merge the previous day's small append files (one per stored snapshot)
+    # once the day has rolled over
+    def compact_on_rollover(self, day):
+        previous, self.lmp_day = self.lmp_day, day
+        if previous is None or previous == day:
+            return
+        store = self.store or default_store
+        try:
+            if store.has_day('lmp', previous):
+                store.compact('lmp', previous)
+        except Exception as e:
+            print(f"Error compacting RT LMP snapshots for {previous}: {e}")
+
+# Works out how long to wait before the next poll: the next SCED run after a change,
+# a doubling backoff while the page stays the same
+class PollSchedule:
+    def __init__(self, min_backoff=MIN_BACKOFF, max_backoff=MAX_BACKOFF):
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.backoff = min_backoff
+
+    # Function to get the delay (seconds) after a poll that found new prices
+    def after_change(self):
+        self.backoff = self.min_backoff
+        now = time.time()
+        return next_sced_time(now) - now
+
+    # Function to get the delay (seconds) after a poll that found nothing new or failed
+    def after_no_change(self):
+        delay = self.backoff
+        self.backoff = min(self.backoff * 2, self.max_backoff)
+        return delay
@@ -0,0 +1,349 @@
+import atexit
+import io
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Process-wide timing spans and counters for the fetch / parse / store / render
+# stages, readable as Prometheus text (serve_metrics) or as periodic JSON lines
+# (start_json_log).
+#
+#   with span('parse', feed='dam'):
+#       df = parse_cdr_table(content)
+#   inc('rows_parsed_total', len(df), feed='dam')
+#
+# Environment toggles, read by start_from_env() (called by main.py and the CLI):
+#   ERCOT_DART_METRICS_PORT=9108        serve /metrics and /metrics.json on this port
+#   ERCOT_DART_METRICS_LOG=path|-       append a JSON snapshot every
+#                                       ERCOT_DART_METRICS_INTERVAL seconds (default 60)
+#   ERCOT_DART_PROFILE=cprofile|tracemalloc   profile the whole run, report at exit
+#                                             (to ERCOT_DART_PROFILE_OUT)
+
+PREFIX = 'ercot_dart_'
+
+# Upper bounds (seconds) of the span duration histogram buckets
+SPAN_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+                30.0)
+
+# Durations of one stage (for one set of labels)
+class SpanStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(SPAN_BUCKETS)
+
+    def add(self, seconds, error=False):
+        self.count += 1
+        self.errors += error
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(SPAN_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_seconds': self.total,
+            'avg_seconds': self.total / self.count if self.count else 0.0,
+            'max_seconds': self.max,
+        }
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}  # (name, label key) -> value
+        self.spans = {}  # (stage, label key) -> SpanStats
+        # Functions returning [(name, labels dict, value, 'counter' | 'gauge')]
+        self.collectors = []
+        self.started_at = time.time()
+
+    # Function to add to a counter
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    # Function to record how long one run of a stage took
+    def observe(self, stage, seconds, error=False, **labels):
+        key = (stage, _label_key(labels))
+        with self.lock:
+            stats = self.spans.get(key)
+            if stats is None:
+                stats = self.spans[key] = SpanStats()
+            stats.add(seconds, error)
+
+    # Context manager timing the block as one run of a stage (errors are counted, then
+    # re-raised)
+    @contextmanager
+    def span(self, stage, **labels):
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start, error, **labels)
+
+    # Function to register a source of values kept elsewhere (HTTP client, page cache)
+    def add_collector(self, collector):
+        self.collectors.append(collector)
+
+    def _collected(self):
+        samples = []
+        for collector in self.collectors:
+            try:
+                samples.extend(collector())
+            except Exception as e:
+                print(f"Error collecting metrics: {e}")
+        return samples
+
+    # Function to get every value as plain data (for the JSON log and /metrics.json)
+    def snapshot(self):
+        with self.lock:
+            counters = [{'name': name, 'labels': dict(key), 'value': value}
+                        for (name, key), value in self.counters.items()]
+            spans = [{'stage': stage, 'labels': dict(key), **stats.as_dict()}
+                     for (stage, key), stats in self.spans.items()]
+        collected = [{'name': name, 'labels': {k: str(v) for k, v in labels.items()},
+                      'value': value, 'type': kind}
+                     for name, labels, value, kind in self._collected()]
+        return {
+            'time': time.time(),
+            'uptime_seconds': time.time() - self.started_at,
+            'counters': counters,
+            'spans': spans,
+            'collected': collected,
+        }
+
+    # Function to render every value in the Prometheus text exposition format
+    def prometheus_text(self):
+        out = io.StringIO()
+        typed = set()
+
+        def header(name, kind):
+            if name not in typed:
+                typed.add(name)
+                out.write(f"# TYPE {name} {kind}\n")
+
+        with self.lock:
+            counters = sorted(self.counters.items())
+            spans = sorted(((('stage', stage),) + key, stats.count, stats.errors,
+                            stats.total, stats.max, list(stats.buckets))
+                           for (stage, key), stats in self.spans.items())
+
+        for (name, key), value in counters:
+            header(PREFIX + name, 'counter')
+            out.write(f"{PREFIX}{name}{_format_labels(key)} {value}\n")
+
+        collected = sorted(self._collected(), key=lambda sample: sample[0])
+        for name, labels, value, kind in collected:
+            header(PREFIX + name, kind)
+            out.write(f"{PREFIX}{name}{_format_labels(_label_key(labels))} {value}\n")
+
+        # One pass per series, so each family's samples stay together
+        for stage_key, count, _errors, total, _max, buckets in spans:
+            header(PREFIX + 'stage_seconds', 'histogram')
+            cumulative = 0
+            for bound, n in zip(SPAN_BUCKETS, buckets, strict=True):
+                cumulative += n
+                le = _format_labels(stage_key, (('le', str(bound)),))
+                out.write(f"{PREFIX}stage_seconds_bucket{le} {cumulative}\n")
+            le = _format_labels(stage_key, (('le', '+Inf'),))
+            out.write(f"{PREFIX}stage_seconds_bucket{le} {count}\n")
+            labels = _format_labels(stage_key)
+            out.write(f"{PREFIX}stage_seconds_sum{labels} {total}\n")
+            out.write(f"{PREFIX}stage_seconds_count{labels} {count}\n")
+        for stage_key, _count, errors, _total, _max, _buckets in spans:
+            header(PREFIX + 'stage_errors_total', 'counter')
+            labels = _format_labels(stage_key)
+            out.write(f"{PREFIX}stage_errors_total{labels} {errors}\n")
+        for stage_key, _count, _errors, _total, max_seconds, _buckets in spans:
+            header(PREFIX + 'stage_max_seconds', 'gauge')
+            labels = _format_labels(stage_key)
+            out.write(f"{PREFIX}stage_max_seconds{labels} {max_seconds}\n")
+        return out.getvalue()
+
+# Shared registry used by every module
+default_metrics = Metrics()
+inc = default_metrics.inc
+span = default_metrics.span
+add_collector = default_metrics.add_collector
+
+# Memory seen by tracemalloc, while it is tracing
+def _tracemalloc_collector():
+    import tracemalloc
+    if not tracemalloc.is_tracing():
+        return []
+    current, peak = tracemalloc.get_traced_memory()
+    return [('tracemalloc_current_bytes', {}, current, 'gauge'),
+            ('tracemalloc_peak_bytes', {}, peak, 'gauge')]
+
+add_collector(_tracemalloc_collector)
+
+# Function to serve /metrics (Prometheus text) and /metrics.json from a background
+# thread
+def serve_metrics(port, host='127.0.0.1', metrics=default_metrics):
+    # Only needed when serving
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split('?', 1)[0]
+            if path == '/metrics':
+                body = metrics.prometheus_text().encode()
+                content_type = 'text/plain; version=0.0.4'
+            elif path == '/metrics.json':
+                body = json.dumps(metrics.snapshot()).encode()
+                content_type = 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name='ercot-metrics',
+                     daemon=True).start()
+    print(f"Serving metrics at http://{host}:{httpd.server_address[1]}/metrics")
+    return httpd
+
+# Function to append a JSON snapshot to a file (or stdout for '-') every `interval`
+# seconds
+def start_json_log(path, interval=60.0, metrics=default_metrics):
+    stop = threading.Event()
+
+    def write_snapshot():
+        line = json.dumps(metrics.snapshot())
+        if path == '-':
+            print(line, flush=True)
+            return
+        try:
+            with open(path, 'a') as f:
+                f.write(line + '\n')
+        except OSError as e:
+            print(f"Error writing metrics log: {e}")
+
+    def loop():
+        while not stop.wait(interval):
+            write_snapshot()
+
+    threading.Thread(target=loop, name='ercot-metrics-log', daemon=True).start()
+    atexit.register(write_snapshot)  # Last snapshot on the way out
+    return stop
+
+# Whole-run profiler: cProfile for where the time goes, tracemalloc for where the
+# memory goes
+class Profiler:
+    def __init__(self, mode, output=None, top=25):
+        if mode not in ('cprofile', 'tracemalloc'):
+            raise ValueError(
+                f"Unknown profile mode {mode!r} (use cprofile or tracemalloc)")
+        self.mode = mode
+        self.output = output
+        self.top = top
+        self.profile = None  # cProfile of the thread that called start()
+        self.thread_profiles = []  # One per thread started after that
+        self.lock = threading.Lock()
+
+    def start(self):
+        if self.mode == 'cprofile':
+            import cProfile
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+            # Before 3.12 a cProfile only sees the thread that enabled it, so every
+            # thread started from now on (the fetch pool, the API and collector
+            # loaders) gets its own, merged into the report. Threads already running
+            # are not profiled.
+            if sys.version_info < (3, 12):
+                threading.setprofile(self._profile_thread)
+        else:
+            import tracemalloc
+            tracemalloc.start(10)
+        atexit.register(self.stop)
+        return self
+
+    # Function run on the first profile event of each new thread: swaps the hook for a
+    # cProfile of that thread
+    def _profile_thread(self, *_args):
+        import cProfile
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        with self.lock:
+            self.thread_profiles.append(profile)
+        profile.enable()
+
+    # Function to stop profiling and print (and optionally save) the report
+    def stop(self):
+        if self.mode == 'cprofile':
+            if self.profile is None:
+                return
+            import pstats
+            threading.setprofile(None)
+            self.profile.disable()
+            stats = pstats.Stats(self.profile, stream=sys.stdout)
+            with self.lock:
+                for profile in self.thread_profiles:
+                    stats.add(profile)
+                self.thread_profiles = []
+            if self.output:
+                stats.dump_stats(self.output)  # Open with snakeviz / pstats
+                print(f"Saved cProfile stats to {self.output}")
+            stats.sort_stats('cumulative').print_stats(self.top)
+            self.profile = None
+        else:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                return
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            if self.output:
+                snapshot.dump(self.output)
+                print(f"Saved tracemalloc snapshot to {self.output}")
+            print(f"tracemalloc: {current / 2 ** 20:.1f} MB in use, "
+                  f"peak {peak / 2 ** 20:.1f} MB; top allocation sites:")
+            for stat in snapshot.statistics('lineno')[:self.top]:
+                print(f"  {stat}")
+
+# Function to switch on whatever the ERCOT_DART_METRICS_* / ERCOT_DART_PROFILE
+# variables ask for
+def start_from_env(port=None, log_path=None, profile=None):
+    port = port or os.environ.get('ERCOT_DART_METRICS_PORT')
+    log_path = log_path or os.environ.get('ERCOT_DART_METRICS_LOG')
+    profile = profile or os.environ.get('ERCOT_DART_PROFILE')
+    if port:
+        serve_metrics(int(port))
+    if log_path:
+        interval = float(os.environ.get('ERCOT_DART_METRICS_INTERVAL', 60))
+        start_json_log(log_path, interval)
+    if profile:
+        Profiler(profile, os.environ.get('ERCOT_DART_PROFILE_OUT')).start()
@@ -0,0 +1,191 @@
+import contextlib
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+from ercot_dart.http_client import default_client
+from ercot_dart.metrics import add_collector
+
+# Define the CST timezone
+cst = pytz.timezone('US/Central')
+
+# Where scraped pages are kept between runs (override with ERCOT_DART_CACHE)
+default_cache_dir = os.environ.get('ERCOT_DART_CACHE', os.path.join(
+    os.path.expanduser('~'), '.cache', 'ercot-dart', 'pages'))
+
+# CDR pages for a past operating day stop changing shortly after the day ends;
+# a copy fetched this long after midnight is treated as final and never re-requested
+FINAL_GRACE = timedelta(hours=1)
+
+# Dated CDR pages look like .../20240801_dam_spp.html
+_url_date = re.compile(r'/(\d{8})_[^/]*$')
+
+# Function to find the operating day a CDR url is for (None for undated pages)
+def operating_day_from_url(url):
+    match = _url_date.search(url)
+    if match is None:
+        return None
+    return datetime.strptime(match.group(1), '%Y%m%d').date()
+
+# Function to get the end of an operating day (the following midnight, CST)
+def day_end(oper_day):
+    midnight = datetime(oper_day.year, oper_day.month, oper_day.day)
+    return cst.localize(midnight + timedelta(days=1))
+
+# Function to check whether a page fetched at fetched_at (epoch seconds) is final
+def is_final(url, fetched_at):
+    oper_day = operating_day_from_url(url)
+    if oper_day is None:
+        return False
+    return fetched_at >= (day_end(oper_day) + FINAL_GRACE).timestamp()
+
+# Function to check whether an operating day's prices are settled and can't change
+def is_final_day(oper_day):
+    return datetime.now(cst) >= day_end(oper_day) + FINAL_GRACE
+
+# On-disk cache of raw CDR pages keyed by URL, with conditional revalidation
+class PageCache:
+    def __init__(self, directory=default_cache_dir, max_age=timedelta(days=400),
+                 max_bytes=500 * 1024 * 1024, client=default_client):
+        self.directory = directory
+        self.client = client
+        self.max_age = max_age  # Entries not used for this long are evicted
+        self.max_bytes = max_bytes  # Least recently used entries go above this size
+        self.lock = threading.Lock()
+        self.hits = 0  # Served from disk with no network call
+        self.revalidated = 0  # Server answered 304 Not Modified
+        self.misses = 0  # Full body downloaded
+        self.evictions = 0
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.html', base + '.json'
+
+    def _count(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _read(self, url):
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        return meta, body
+
+    def _write(self, url, body, meta):
+        body_path, meta_path = self._paths(url)
+        os.makedirs(self.directory, exist_ok=True)
+        # Write to temp files and rename so concurrent readers never see half a page
+        files = ((body_path, body, 'wb'), (meta_path, json.dumps(meta), 'w'))
+        for path, data, mode in files:
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, mode) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    # Function to get the body of a page, from disk when possible
+    def fetch(self, url, timeout=None):
+        meta, body = self._read(url)
+        body_path, _ = self._paths(url)
+
+        if meta is not None and meta.get('final'):
+            self._count('hits')
+            with contextlib.suppress(OSError):
+                os.utime(body_path)  # Mark as recently used for eviction
+            return body
+
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = self.client.get(url, headers=headers, timeout=timeout)
+        now = time.time()
+
+        if response.status_code == 304 and meta is not None:
+            self._count('revalidated')
+            meta['fetched_at'] = now
+            meta['final'] = is_final(url, now)
+            self._write(url, body, meta)
+            return body
+
+        response.raise_for_status()  # Check for HTTP errors
+        self._count('misses')
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': now,
+            'final': is_final(url, now),
+        }
+        self._write(url, response.content, meta)
+        self.evict()
+        return response.content
+
+    # Function to drop entries that are too old, then the least recently used ones until
+    # the cache is under max_bytes
+    def evict(self):
+        entries = []
+        if not os.path.isdir(self.directory):
+            return
+        cutoff = time.time() - self.max_age.total_seconds()
+        for name in os.listdir(self.directory):
+            if not name.endswith('.html'):
+                continue
+            body_path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(body_path)
+            except OSError:
+                continue  # Removed by another thread
+            entries.append((stat.st_mtime, stat.st_size, body_path))
+
+        entries.sort()  # Oldest use first
+        total = sum(size for _, size, _ in entries)
+        for last_used, size, body_path in entries:
+            if last_used >= cutoff and total <= self.max_bytes:
+                break
+            for path in (body_path, body_path[:-len('.html')] + '.json'):
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+            total -= size
+            self._count('evictions')
+
+    # Function to report cache hit/miss counters
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.revalidated + self.misses
+            return {
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': ((self.hits + self.revalidated) / lookups
+                              if lookups else 0.0),
+            }
+
+    # Function to report the hit/miss counters as metrics samples
+    def metrics(self):
+        stats = self.stats()
+        return [(f'page_cache_{name}_total', {}, stats[name], 'counter')
+                for name in ('hits', 'revalidated', 'misses', 'evictions')]
+
+# Shared cache used by all scrapers
+default_cache = PageCache()
+add_collector(default_cache.metrics)
+
+# Function to fetch a CDR page through the shared cache
+def fetch_page(url):
+    return default_cache.fetch(url)
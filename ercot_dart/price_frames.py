@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+# Conversions between the wide tables on the CDR pages (one column per
+# settlement point, Oper Day + Hour/Interval Ending strings) and a long
+# format with real timestamps, used for storage and analysis.
+
+# ERCOT operating days are in Central Prevailing Time
+ERCOT_TZ = 'US/Central'
+
+# Columns on the CDR pages that are not settlement point prices
+LABEL_COLUMNS = ('Oper Day', 'Hour Ending', 'Interval Ending')
+REPEATED_HOUR_COLUMNS = ('Repeated Hour Flag', 'DSTFlag')
+
+# Function to turn Hour Ending ("01".."24") or Interval Ending ("0015".."2400") labels
+# into minutes after midnight
+def label_minutes(labels, interval_minutes):
+    labels = pd.Series(labels).astype(str).str.strip().str.replace(':', '', regex=False)
+    numbers = labels.astype(int).to_numpy()
+    if interval_minutes >= 60:
+        return numbers * 60  # Hour Ending
+    return (numbers // 100) * 60 + numbers % 100  # HHMM
+
+# Function to build a tz-aware interval-ending DatetimeIndex from the Oper Day / Ending
+# label pair
+def interval_ending_index(oper_day, ending_labels, interval_minutes,
+                          repeated_hour_flag=None):
+    days = pd.to_datetime(pd.Series(oper_day).astype(str), format='%m/%d/%Y').to_numpy()
+    minutes = label_minutes(ending_labels, interval_minutes)
+
+    # Localize interval *starts*: they are real wall-clock times, unlike an ending label
+    # of 0200 in the first pass through the repeated hour, and ERCOT skips the missing
+    # hour's labels
+    offsets = (minutes - interval_minutes).astype('timedelta64[m]')
+    starts = pd.DatetimeIndex(days + offsets)
+
+    if repeated_hour_flag is not None:
+        flag = pd.Series(repeated_hour_flag).astype(str).str.upper()
+        flag = flag.isin(['Y', 'TRUE', '1']).to_numpy()
+        ambiguous = ~flag  # True means the first (daylight time) pass through the hour
+    else:
+        # Without a flag, the second copy of a wall time is the repeated hour
+        ambiguous = ~starts.duplicated()
+
+    starts = starts.tz_localize(ERCOT_TZ, ambiguous=ambiguous,
+                                nonexistent='shift_forward')
+    return starts + pd.Timedelta(minutes=interval_minutes)
+
+# Function to find the settlement point price columns of a CDR table
+def price_columns(df):
+    not_prices = LABEL_COLUMNS + REPEATED_HOUR_COLUMNS
+    return [col for col in df.columns if col not in not_prices]
+
+# Function to find the repeated-hour flag column of a CDR table, if it has one
+def repeated_hour_flag(df):
+    for col in REPEATED_HOUR_COLUMNS:
+        if col in df.columns:
+            return df[col]
+    return None
+
+# Function to melt a wide DAM/RT SPP table into oper_day, interval_end,
+# settlement_point, price rows
+def wide_to_long(df, label_column, interval_minutes):
+    points = price_columns(df)
+    index = interval_ending_index(df['Oper Day'], df[label_column], interval_minutes,
+                                  repeated_hour_flag(df))
+    oper_day = pd.to_datetime(df['Oper Day'].astype(str), format='%m/%d/%Y').to_numpy()
+
+    n_rows, n_points = len(df), len(points)
+    # Row-major: each interval's points are contiguous
+    prices = df[points].to_numpy(dtype=np.float32).ravel()
+    codes = np.tile(np.arange(n_points), n_rows)
+    return pd.DataFrame({
+        'oper_day': np.repeat(oper_day, n_points),
+        'interval_end': index.repeat(n_points),
+        'settlement_point': pd.Categorical.from_codes(codes, categories=points),
+        'price': prices,
+    })
+
+# Function to convert a scraped DAM SPP table to long format
+def dam_to_long(df):
+    return wide_to_long(df, 'Hour Ending', 60)
+
+# Function to convert a scraped RT SPP table to long format
+def spp_to_long(df):
+    return wide_to_long(df, 'Interval Ending', 15)
+
+# Function to convert a scraped RT LMP snapshot to long format, stamped with the time it
+# was taken
+def lmp_to_long(df, snapshot_time):
+    snapshot_time = pd.Timestamp(snapshot_time).tz_convert(ERCOT_TZ)
+    oper_day = snapshot_time.tz_localize(None).normalize()
+    n_rows = len(df)
+    return pd.DataFrame({
+        'oper_day': np.repeat(oper_day.to_datetime64(), n_rows),
+        'timestamp': pd.DatetimeIndex([snapshot_time] * n_rows),
+        'settlement_point': pd.Categorical(df['Settlement Point']),
+        'lmp': df['LMP'].to_numpy(dtype=np.float32),
+        'change': df['5 Min Change to LMP'].to_numpy(dtype=np.float32),
+    })
+
+# Function to count the intervals in an operating day (23, 24 or 25 hours with DST)
+def intervals_in_day(day, interval_minutes):
+    start = pd.Timestamp(day).tz_localize(ERCOT_TZ)
+    end = (pd.Timestamp(day) + pd.Timedelta(days=1)).tz_localize(ERCOT_TZ)
+    return int((end - start) / pd.Timedelta(minutes=interval_minutes))
+
+# Function to turn long-format rows back into the wide CDR layout (Oper Day,
+# Hour/Interval Ending, one column per point). On the fall-back day a Repeated Hour
+# Flag column marks the second pass through the repeated hour with Y.
+def long_to_wide(long_df, label_column, interval_minutes):
+    wide = long_df.pivot_table(index='interval_end', columns='settlement_point',
+                               values='price', observed=True, sort=True)
+    interval_end = pd.DatetimeIndex(wide.index)
+    interval = pd.Timedelta(minutes=interval_minutes)
+    local_start = (interval_end - interval).tz_localize(None)
+    oper_day = local_start.normalize()  # Interval ending 2400 belongs to its day
+
+    # Labels count from the wall-clock start, as ERCOT's do: the first pass through
+    # the repeated hour ends at 0200 daylight time, which the end timestamp alone
+    # would read as 0100 standard time
+    minutes = (local_start - oper_day) // pd.Timedelta(minutes=1) + interval_minutes
+    if interval_minutes >= 60:
+        labels = minutes // 60  # Hour Ending 1..24
+    else:
+        clock = pd.Index(minutes // 60 * 100 + minutes % 60)
+        labels = clock.astype(str).str.zfill(4)  # "0015".."2400"
+
+    result = pd.DataFrame({
+        'Oper Day': oper_day.strftime('%m/%d/%Y'),
+        label_column: np.asarray(labels),
+    })
+    # The second pass starts at the same wall-clock times as the first
+    repeated = local_start.duplicated()
+    if repeated.any():
+        result['Repeated Hour Flag'] = np.where(repeated, 'Y', 'N')
+    prices = wide.reset_index(drop=True).astype(np.float64).round(2)
+    prices.columns = [str(col) for col in prices.columns]
+    return pd.concat([result, prices], axis=1)
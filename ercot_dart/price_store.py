@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ercot_dart.metrics import inc, span
+from ercot_dart.price_frames import (
+    dam_to_long,
+    intervals_in_day,
+    lmp_to_long,
+    spp_to_long,
+)
+
+# Date-partitioned Parquet store for scraped prices, in the long format from
+# ercot_dart.price_frames:
+#
+#   <root>/dam/date=2024-08-01/part-0.parquet      interval_end, settlement_point, price
+#   <root>/spp/date=2024-08-01/part-0.parquet
+#   <root>/lmp/date=2024-08-01/part-<ms>.parquet   one file per RT LMP snapshot
+#
+# The date=... directory is the oper_day partition.
+#
+# Prices are float32, settlement points are dictionary encoded (categorical in
+# pandas) and interval_end/timestamp are tz-aware timestamps.
+
+# Where scraped prices are stored (override with ERCOT_DART_STORE)
+default_store_dir = os.environ.get('ERCOT_DART_STORE', os.path.join(
+    os.path.expanduser('~'), '.local', 'share', 'ercot-dart', 'prices'))
+
+FEEDS = ('dam', 'spp', 'lmp')
+
+# Length (minutes) of the intervals a full DAM or RT SPP day is made of
+INTERVAL_MINUTES = {'dam': 60, 'spp': 15}
+
+# Partition key: the operating day the rows belong to
+_partitioning = ds.partitioning(pa.schema([('date', pa.date32())]), flavor='hive')
+
+class PriceStore:
+    def __init__(self, root=default_store_dir):
+        self.root = root
+        self.lock = threading.Lock()
+
+    def _day_dir(self, feed, day):
+        return os.path.join(self.root, feed, f"date={day.isoformat()}")
+
+    def _write(self, path, df):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = pa.Table.from_pandas(df.drop(columns=['oper_day']),
+                                     preserve_index=False)
+        directory, name = os.path.split(path)
+        tmp_path = os.path.join(directory, '.' + name + '.tmp')  # Hidden from scans
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, path)  # Readers never see a half-written file
+
+    # Function to check whether a feed has anything stored for a day
+    def has_day(self, feed, day):
+        day_dir = self._day_dir(feed, day)
+        if not os.path.isdir(day_dir):
+            return False
+        return any(name.endswith('.parquet') for name in os.listdir(day_dir))
+
+    # Function to check whether every interval of a DAM or RT SPP day is stored; a day
+    # stored while it was still in progress (by the GUI or a collector) is not complete
+    def has_complete_day(self, feed, day):
+        if not self.has_day(feed, day):
+            return False
+        dataset = ds.dataset(self._day_dir(feed, day), format='parquet')
+        interval_end = dataset.to_table(columns=['interval_end'])['interval_end']
+        stored = pc.count_distinct(interval_end)
+        return stored.as_py() >= intervals_in_day(day, INTERVAL_MINUTES[feed])
+
+    # Function to store (or replace) a whole operating day of DAM or RT SPP rows
+    def write_day(self, feed, day, df):
+        with self.lock:
+            self._write(os.path.join(self._day_dir(feed, day), 'part-0.parquet'), df)
+
+    # Function to store a day's rows for every operating day in a long-format frame
+    def write_days(self, feed, df):
+        for oper_day, rows in df.groupby('oper_day', sort=False, observed=True):
+            self.write_day(feed, oper_day.date(), rows)
+
+    # Function to add rows to a day without touching what is already stored (RT LMP
+    # snapshots)
+    def append(self, feed, df):
+        for oper_day, rows in df.groupby('oper_day', sort=False, observed=True):
+            day = oper_day.date()
+            name = f"part-{int(time.time() * 1000)}-{threading.get_ident()}.parquet"
+            with self.lock:
+                self._write(os.path.join(self._day_dir(feed, day), name), rows)
+
+    # Function to merge a day's appended files into one
+    def compact(self, feed, day):
+        day_dir = self._day_dir(feed, day)
+        with self.lock:
+            parts = sorted(name for name in os.listdir(day_dir)
+                           if name.endswith('.parquet'))
+            if len(parts) < 2:
+                return
+            tables = [pq.read_table(os.path.join(day_dir, name)) for name in parts]
+            table = pa.concat_tables(tables, promote_options='permissive')
+            tmp_path = os.path.join(day_dir, '.compacted.tmp')
+            pq.write_table(table, tmp_path, compression='zstd')
+            for name in parts:
+                os.remove(os.path.join(day_dir, name))
+            os.replace(tmp_path, os.path.join(day_dir, 'part-0.parquet'))
+
+    # Function to list the operating days stored for a feed
+    def days(self, feed):
+        feed_dir = os.path.join(self.root, feed)
+        if not os.path.isdir(feed_dir):
+            return []
+        days = [datetime.strptime(name[len('date='):], '%Y-%m-%d').date()
+                for name in os.listdir(feed_dir) if name.startswith('date=')]
+        return sorted(day for day in days if self.has_day(feed, day))
+
+    # Function to load a date range for some settlement points, reading only the needed
+    # files and columns
+    def load(self, feed, start, end, points=None, columns=None):
+        feed_dir = os.path.join(self.root, feed)
+        if not os.path.isdir(feed_dir):
+            return None
+
+        dataset = ds.dataset(feed_dir, format='parquet', partitioning=_partitioning)
+        # The dates prune whole partitions, the points are pushed down to row groups
+        condition = (ds.field('date') >= start) & (ds.field('date') <= end)
+        if points is not None:
+            condition &= ds.field('settlement_point').isin(list(points))
+
+        if columns is not None:
+            columns = list(columns)
+            if 'date' not in columns:
+                columns = ['date'] + columns
+        table = dataset.to_table(filter=condition, columns=columns)
+        df = table.to_pandas(date_as_object=False)
+        return df.rename(columns={'date': 'oper_day'})
+
+# Shared store used by the scrapers and the backfill
+default_store = PriceStore()
+
+# Function to keep a copy of a freshly scraped table in the shared store (RT LMP needs
+# the snapshot time)
+def record_scrape(feed, df, snapshot_time=None, store=None):
+    store = store or default_store
+    try:
+        with span('store', feed=feed):
+            if feed == 'dam':
+                store.write_days('dam', dam_to_long(df))
+            elif feed == 'spp':
+                store.write_days('spp', spp_to_long(df))
+            elif feed == 'lmp':
+                store.append('lmp', lmp_to_long(df, snapshot_time))
+        inc('rows_stored_total', len(df), feed=feed)
+    except Exception as e:
+        print(f"Error storing {feed} data: {e}")
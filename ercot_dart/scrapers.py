@@ -0,0 +1,93 @@
+import pandas as pd
+
+from ercot_dart.cdr_parser import parse_cdr_table
+from ercot_dart.cdr_site import (  # noqa: F401 (re-exported)
+    cdr_base,
+    cst,
+    dam_url_base,
+    get_next_and_last_four_days,
+    real_time_spp_url_base,
+    real_time_url,
+)
+from ercot_dart.metrics import inc, span
+from ercot_dart.page_cache import fetch_page, is_final_day
+from ercot_dart.price_frames import intervals_in_day, long_to_wide
+from ercot_dart.price_store import default_store, record_scrape
+
+# Scrapers for the ERCOT CDR html reports. Nothing here touches tkinter, so the
+# same functions back the GUI, the collector and the backfill.
+
+# Function to scrape the first table of a CDR page into a DataFrame
+def scrape_cdr_page(url, name, feed, text_columns=()):
+    try:
+        with span('fetch', feed=feed):
+            content = fetch_page(url)  # From the local page cache while it is current
+
+        # Parse the first table in the HTML straight into a DataFrame
+        with span('parse', feed=feed):
+            df = parse_cdr_table(content, text_columns=text_columns)
+        if df is None:
+            print("Error: Could not find table in the HTML")
+            inc('scrape_errors_total', feed=feed, reason='no_table')
+            return pd.DataFrame()  # Return an empty DataFrame if no table is found
+        inc('rows_parsed_total', len(df), feed=feed)
+        return df
+    except Exception as e:
+        print(f"Error scraping {name} data: {e}")
+        inc('scrape_errors_total', feed=feed, reason=type(e).__name__)
+        return pd.DataFrame()  # Return an empty DataFrame on error
+
+# Function to scrape Real-Time ERCOT data
+def scrape_real_time_data(url):
+    return scrape_cdr_page(url, "Real-Time", 'rt')
+
+# Function to scrape DAM ERCOT data
+def scrape_dam_data(url):
+    return scrape_cdr_page(url, "DAM", 'dam')
+
+# Function to scrape Real-Time Settlement Points ERCOT data
+def scrape_real_time_spp_data(url):
+    df = scrape_cdr_page(url, "Real-Time Settlement Points", 'spp',
+                         text_columns=('Interval Ending',))
+
+    # Ensure the Interval Ending column is correctly formatted
+    if 'Interval Ending' in df.columns:
+        df['Interval Ending'] = df['Interval Ending'].str.zfill(4)
+
+    return df
+
+# Function to read a settled day from the price store, if a complete copy of it is there
+def load_settled_day(store, feed, day, label_column, interval_minutes):
+    if not (is_final_day(day) and store.has_day(feed, day)):
+        return None
+    long_df = store.load(feed, day, day)
+    if long_df['interval_end'].nunique() < intervals_in_day(day, interval_minutes):
+        return None  # Stored while the day was still in progress
+    return long_to_wide(long_df, label_column, interval_minutes)
+
+# Function to load a day of DAM data: settled days come from the price store, others
+# are scraped (and stored)
+def load_dam_day(day, store=None):
+    store = store or default_store
+    df = load_settled_day(store, 'dam', day, 'Hour Ending', 60)
+    if df is not None:
+        inc('store_reads_total', feed='dam')
+        return df
+    df = scrape_dam_data(dam_url_base.format(date=day.strftime('%Y%m%d')))
+    if not df.empty:
+        record_scrape('dam', df, store=store)
+    return df
+
+# Function to load a day of Real-Time Settlement Points data: settled days come from
+# the price store, others are scraped (and stored)
+def load_real_time_spp_day(day, store=None):
+    store = store or default_store
+    df = load_settled_day(store, 'spp', day, 'Interval Ending', 15)
+    if df is not None:
+        inc('store_reads_total', feed='spp')
+        return df
+    url = real_time_spp_url_base.format(date=day.strftime('%Y%m%d'))
+    df = scrape_real_time_spp_data(url)
+    if not df.empty:
+        record_scrape('spp', df, store=store)
+    return df
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from ercot_dart.cdr_site import cst
+from ercot_dart.decimate import break_gaps
+from ercot_dart.metrics import span
+from ercot_dart.price_store import default_store
+
+# Price series for the chart tab: one (x, y) pair of arrays per settlement point for a
+# date window, read from the price store. x is in matplotlib date numbers (days since
+# 1970-01-01 UTC), so the arrays can go straight to Line2D.set_data.
+#
+#   series = load_series('spp', date(2024, 1, 1), date(2024, 12, 31),
+#                        ['HB_NORTH', 'HB_WEST'])
+
+SERIES_FEEDS = ('lmp', 'spp', 'dam', 'basis')
+
+# Longest step (days) a line is drawn across; anything longer is shown as a gap
+MAX_STEP = {'lmp': 1 / 8, 'spp': 1 / 48, 'dam': 1 / 12, 'basis': 1 / 12}
+
+_day_ns = 86400 * 10 ** 9
+
+# Function to convert timestamps to matplotlib date numbers
+def to_date_numbers(timestamps):
+    return pd.DatetimeIndex(timestamps).as_unit('ns').asi8 / _day_ns
+
+# Function to make sure the days still on the CDR site are in the store (scraping them
+# if not); older days are only ever read from the store, filled by the backfill /
+# collector
+def fetch_recent_days(feed, start, end, store):
+    from ercot_dart.scrapers import load_dam_day, load_real_time_spp_day
+    today = datetime.now(cst).date()
+    first = max(start, today - timedelta(days=3))
+    last = min(end, today + timedelta(days=1) if feed == 'dam' else today)
+    day = first
+    while day <= last:
+        (load_dam_day if feed == 'dam' else load_real_time_spp_day)(day, store=store)
+        day += timedelta(days=1)
+
+# Function to read one feed for a date range: returns the long rows as (time column,
+# value column, frame)
+def _load_rows(feed, start, end, points, store, fetch_recent):
+    if feed == 'lmp':
+        columns = ['timestamp', 'settlement_point', 'lmp']
+        df = store.load('lmp', start, end, points, columns=columns)
+        return 'timestamp', 'lmp', df
+    if feed in ('spp', 'dam'):
+        if fetch_recent:
+            fetch_recent_days(feed, start, end, store)
+        columns = ['interval_end', 'settlement_point', 'price']
+        df = store.load(feed, start, end, points, columns=columns)
+        return 'interval_end', 'price', df
+
+    from ercot_dart.basis_engine import BasisCache, default_basis_cache
+    if fetch_recent:
+        fetch_recent_days('dam', start, end, store)
+        fetch_recent_days('spp', start, end, store)
+    cache = default_basis_cache if store is default_store else BasisCache(store)
+    df = cache.get_range(start, end)
+    wanted = df['settlement_point'].astype(str).isin(list(points))
+    return 'interval_end', 'dart', df[wanted]
+
+# Function to load a feed's prices for a date range as {point: (x, y)}, sorted by time
+def load_series(feed, start, end, points, store=None, fetch_recent=True):
+    if feed not in SERIES_FEEDS:
+        raise ValueError(f"Unknown series {feed!r}, expected one of {SERIES_FEEDS}")
+    store = store or default_store
+    empty = (np.empty(0), np.empty(0))
+    with span('load', tab='chart', feed=feed):
+        time_column, value_column, df = _load_rows(feed, start, end, points, store,
+                                                   fetch_recent)
+    if df is None or df.empty:
+        return dict.fromkeys(points, empty)
+
+    # Sort once by (point, time) and cut the arrays at the point boundaries
+    names = df['settlement_point'].astype(str).astype('category')
+    codes = names.cat.codes.to_numpy()
+    x = to_date_numbers(df[time_column])
+    y = df[value_column].to_numpy(dtype=np.float64)
+    order = np.lexsort((x, codes))
+    codes, x, y = codes[order], x[order], y[order]
+    bounds = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    series = {}
+    for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(codes)], strict=True):
+        point = names.cat.categories[codes[lo]]
+        series[point] = break_gaps(x[lo:hi], y[lo:hi], MAX_STEP[feed])
+    return {point: series.get(point, empty) for point in points}
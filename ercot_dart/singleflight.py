@@ -0,0 +1,42 @@
+import threading
+from concurrent.futures import Future
+
+# Request coalescing: while a call for a key is running, other callers asking for
+# the same key wait for that call's result instead of starting their own.
+#
+#   flight = SingleFlight()
+#   # one fetch however many threads ask
+#   df = flight.do(('spp', day), load_real_time_spp_day, day)
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}  # Key -> Future of the call in flight
+        self.coalesced = 0  # Callers that shared another caller's result
+
+    # Function to run func(*args) for a key, or wait for the run already in flight;
+    # errors reach every waiter
+    def do(self, key, func, *args):
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self.lock:
+                del self.calls[key]
+        return future.result()
+
+    # Function to count the calls in flight and the callers coalesced so far
+    def stats(self):
+        with self.lock:
+            return {'in_flight': len(self.calls), 'coalesced': self.coalesced}
@@ -0,0 +1,132 @@
+import threading
+import tkinter as tk
+from datetime import datetime
+from functools import partial
+from tkinter import filedialog, ttk
+
+from fetch_executor import run_in_background
+
+# How often (in ms) the dialog reads the export's progress
+PROGRESS_INTERVAL_MS = 100
+
+# Function to open the export dialog for 'hourly' or 'dam' data, starting from the day
+# the tab shows
+def open_export_dialog(parent, kind, default_day):
+    dialog = tk.Toplevel(parent)
+    if kind == 'hourly':
+        dialog.title("Export Hourly Settlement Data")
+    else:
+        dialog.title("Export DAM Data")
+    dialog.resizable(False, False)
+
+    # Date range, format and settlement points
+    tk.Label(dialog, text="From (YYYY-MM-DD):", font=("Helvetica", 12)).grid(
+        row=0, column=0, padx=10, pady=5, sticky=tk.W)
+    start_entry = ttk.Entry(dialog, font=("Helvetica", 12))
+    start_entry.insert(0, default_day.isoformat())
+    start_entry.grid(row=0, column=1, padx=10, pady=5)
+
+    tk.Label(dialog, text="To (YYYY-MM-DD):", font=("Helvetica", 12)).grid(
+        row=1, column=0, padx=10, pady=5, sticky=tk.W)
+    end_entry = ttk.Entry(dialog, font=("Helvetica", 12))
+    end_entry.insert(0, default_day.isoformat())
+    end_entry.grid(row=1, column=1, padx=10, pady=5)
+
+    tk.Label(dialog, text="Format:", font=("Helvetica", 12)).grid(
+        row=2, column=0, padx=10, pady=5, sticky=tk.W)
+    format_combobox = ttk.Combobox(dialog, values=['csv', 'csv.gz', 'parquet'],
+                                   state='readonly', font=("Helvetica", 12))
+    format_combobox.set('csv')
+    format_combobox.grid(row=2, column=1, padx=10, pady=5)
+
+    tk.Label(dialog, text="Points (blank = all):", font=("Helvetica", 12)).grid(
+        row=3, column=0, padx=10, pady=5, sticky=tk.W)
+    points_entry = ttk.Entry(dialog, font=("Helvetica", 12))
+    points_entry.grid(row=3, column=1, padx=10, pady=5)
+
+    progress_bar = ttk.Progressbar(dialog, length=300, mode='determinate')
+    progress_bar.grid(row=4, column=0, columnspan=2, padx=10, pady=5)
+    status = tk.StringVar()
+    tk.Label(dialog, textvariable=status, font=("Helvetica", 12)).grid(
+        row=5, column=0, columnspan=2, padx=10, sticky=tk.W)
+
+    # Progress is written by the export thread and read here on the Tk thread
+    progress = {'done': 0, 'total': 1, 'day': None}
+    cancel_event = threading.Event()
+    running = []
+
+    def on_progress(done, total, day):
+        progress.update(done=done, total=total, day=day)
+
+    def show_progress():
+        if not running:
+            return
+        progress_bar['value'] = 100 * progress['done'] / progress['total']
+        if progress['day'] is not None:
+            status.set(f"Exported {progress['day']} "
+                       f"({progress['done']}/{progress['total']} days)")
+        dialog.after(PROGRESS_INTERVAL_MS, show_progress)
+
+    def finished(message):
+        running.clear()
+        status.set(message)
+        export_button.config(state=tk.NORMAL)
+        cancel_button.config(text="Close")
+
+    def on_done(rows):
+        progress_bar['value'] = 100
+        finished(f"Done: {rows} rows written")
+
+    def on_error(error):
+        finished(f"Export stopped: {error}")
+
+    # Function to handle the export button click: ask where to save, then stream the
+    # range in the background
+    def start_export():
+        from ercot_dart.export import default_export_name, export_range
+        try:
+            start = datetime.strptime(start_entry.get().strip(), '%Y-%m-%d').date()
+            end = datetime.strptime(end_entry.get().strip(), '%Y-%m-%d').date()
+        except ValueError:
+            status.set("Dates must look like 2024-08-01")
+            return
+        if end < start:
+            status.set("The range ends before it starts")
+            return
+
+        fmt = format_combobox.get()
+        path = filedialog.asksaveasfilename(
+            parent=dialog, initialfile=default_export_name(kind, start, end, fmt),
+            defaultextension='.' + fmt)
+        if not path:
+            return
+        points = [point.strip() for point in points_entry.get().split(',')
+                  if point.strip()] or None
+
+        cancel_event.clear()
+        progress.update(done=0, total=(end - start).days + 1, day=None)
+        running.append(True)
+        export_button.config(state=tk.DISABLED)
+        cancel_button.config(text="Cancel")
+        status.set("Starting export...")
+        export = partial(export_range, kind, start, end, path, fmt=fmt, points=points,
+                         progress=on_progress, cancel=cancel_event.is_set)
+        run_in_background(dialog, export, on_done=on_done, on_error=on_error)
+        show_progress()
+
+    # Function to cancel a running export, or close the dialog when nothing is running
+    def cancel_or_close():
+        if running:
+            cancel_event.set()
+            status.set("Cancelling...")
+        else:
+            dialog.destroy()
+
+    export_button = tk.Button(dialog, text="Export", font=("Helvetica", 12),
+                              command=start_export)
+    export_button.grid(row=6, column=0, pady=10)
+    cancel_button = tk.Button(dialog, text="Close", font=("Helvetica", 12),
+                              command=cancel_or_close)
+    cancel_button.grid(row=6, column=1, pady=10)
+    dialog.protocol("WM_DELETE_WINDOW", cancel_or_close)
+    return dialog
@@ -0,0 +1,70 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared pool used for every network fetch so the Tk event loop never blocks
+fetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ercot-fetch")
+
+# How often (in ms) the Tk thread checks whether a background fetch has finished
+POLL_INTERVAL_MS = 50
+
+# Latest future submitted for each widget, so a
+# slow older fetch can't overwrite a newer one
+latest_futures = {}
+
+# Function to run a scrape function in the background
+# and hand its result back on the Tk thread
+def run_in_background(widget, func, *args, on_done=None, on_error=None):
+    future = fetch_pool.submit(func, *args)
+    latest_futures[widget] = future
+
+    # Tk widgets may only be touched from the main thread, so the result is
+    # picked up by polling with widget.after instead of a worker-side callback
+    def check_future():
+        if not future.done():
+            widget.after(POLL_INTERVAL_MS, check_future)
+            return
+        if latest_futures.get(widget) is not future:
+            return  # A newer fetch for this widget was started; drop the stale result
+        del latest_futures[widget]
+        try:
+            result = future.result()
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            else:
+                print(f"Error in background fetch: {e}")
+            return
+        if on_done:
+            on_done(result)
+
+    widget.after(POLL_INTERVAL_MS, check_future)
+    return future
+
+# Calls handed to the Tk thread from other threads (e.g. data bus subscribers), run
+# by start_tk_dispatch
+tk_calls = queue.SimpleQueue()
+
+# Function to run func(*args) on the Tk thread; safe to call from any thread
+def call_on_tk(func, *args):
+    tk_calls.put((func, args))
+
+# Function to start running the queued calls on the Tk thread (call once, after the
+# root window is created)
+def start_tk_dispatch(widget):
+    def dispatch():
+        while True:
+            try:
+                func, args = tk_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Error in Tk callback: {e}")
+        widget.after(POLL_INTERVAL_MS, dispatch)
+
+    widget.after(POLL_INTERVAL_MS, dispatch)
+
+# Function to stop the pool when the window is closed
+def shutdown_fetch_pool():
+    fetch_pool.shutdown(wait=False, cancel_futures=True)
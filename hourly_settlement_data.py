@@ -1,69 +1,128 @@
 import tkinter as tk
 from tkinter import ttk
-import pandas as pd
-from datetime import datetime, timedelta
-import pytz
-
-# Define the CST timezone
-cst = pytz.timezone('US/Central')
-
-# Function to calculate hourly settlement averages from 15-minute intervals
-def calculate_hourly_averages(spp_data):
-    spp_data['Interval Ending'] = spp_data['Interval Ending'].astype(int) // 100  # Convert to hour
-    hourly_data = spp_data.groupby(['Oper Day', 'Interval Ending']).mean().reset_index()
-
-    # Round the results to 2 decimal places
-    hourly_data = hourly_data.round(2)
-
-    return hourly_data
-
-# Function to refresh and display hourly settlement data
-def refresh_hourly_settlement_data(tree, time_label, spp_data):
-    hourly_data = calculate_hourly_averages(spp_data)
-
-    # Clear the tree
-    for row in tree.get_children():
-        tree.delete(row)
-
-    # Insert new data
-    for index, row in hourly_data.iterrows():
-        values = row.tolist()
-        tree.insert('', tk.END, values=values)
+from datetime import datetime
+from ercot_dart.cdr_site import cst, get_next_and_last_four_days
+from ercot_dart.data_bus import default_bus
+from ercot_dart.metrics import span
+from export_dialog import open_export_dialog
+from fetch_executor import call_on_tk, run_in_background
+from snapshot_cache import save_snapshot, show_snapshot
+from table_view import VirtualTable
+
+# Function to load a day's hourly settlement averages (runs on the fetch pool). The
+# data bus averages the day's 15-minute RT SPP intervals (intervals 0015-0100 make up
+# hour ending 1) once per version of that data, sharing the intervals with the RT SPP
+# tab; refresh=True re-fetches them first
+def load_hourly_settlement_data(day, refresh=False):
+    with span('load', tab='hourly'):
+        hourly_data = default_bus.get('hourly', day, refresh)
+    if hourly_data.empty:
+        return hourly_data
+
+    # Keep the layout the tab shows: the hour ending goes in the Interval Ending column
+    hourly_data = hourly_data.drop(columns=['Repeated Hour Flag', 'Interval End'])
+    return hourly_data.rename(columns={'Hour Ending': 'Interval Ending'})
+
+# Function to refresh hourly settlement data in the background and update the GUI
+# when it arrives
+def refresh_hourly_settlement_data(table, time_label, day, refresh=False):
+    return run_in_background(table.frame, load_hourly_settlement_data, day, refresh,
+                             on_done=lambda hourly_data: update_hourly_settlement_table(
+                                 table, time_label, hourly_data))
+
+# Function to show hourly settlement data in the GUI (runs on the Tk thread)
+def update_hourly_settlement_table(table, time_label, hourly_data):
+    if hourly_data.empty:
+        print("No data available.")
+        return
+
+    # Only the cells that changed since the last refresh are redrawn
+    with span('render', tab='hourly'):
+        table.set_data(hourly_data)
 
     # Update the time label to CST
     now_cst = datetime.now(cst)
     time_label.set("Last Updated: " + now_cst.strftime("%H:%M:%S %Z"))
+    save_snapshot('hourly_settlement', hourly_data,
+                  now_cst.strftime("%Y-%m-%d %H:%M:%S %Z"))
 
 # Function to create the Hourly Settlement Data tab and its elements
 def create_hourly_settlement_tab(frame):
-    # Define columns for the Treeview
+    # Create a label for the drop-down menu
+    tk.Label(frame, text="Operating Day:", font=("Helvetica", 12)).grid(
+        row=0, column=0, padx=10, pady=10, sticky=tk.W)
+
+    # Create a Combobox for the Operating Day
+    operating_days = get_next_and_last_four_days()
+    operating_day_combobox = ttk.Combobox(frame, values=operating_days,
+                                          font=("Helvetica", 12))
+    operating_day_combobox.grid(row=0, column=1, padx=10, pady=10, sticky=tk.W)
+
+    # Set the default value to today's date
+    today = datetime.now(cst).strftime('%Y-%m-%d')
+    if today in operating_days:
+        operating_day_combobox.set(today)
+    else:
+        operating_day_combobox.current(0)
+
+    # Define columns for the table
     columns = ['Oper Day', 'Interval Ending', 'HB_BUSAVG', 'HB_HOUSTON', 'HB_HUBAVG', 'HB_NORTH', 'HB_PAN',
                'HB_SOUTH', 'HB_WEST', 'LZ_AEN', 'LZ_CPS', 'LZ_HOUSTON', 'LZ_LCRA', 'LZ_NORTH', 'LZ_RAYBN', 'LZ_SOUTH', 'LZ_WEST']
 
-    tree = ttk.Treeview(frame, columns=columns, show='headings', height=24)
-    for col in columns:
-        tree.heading(col, text=col)
-        tree.column(col, width=130, anchor=tk.CENTER)  # Adjust the width as necessary
-
-    tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-
-    # Add a vertical scrollbar
-    scrollbar_y = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
-    tree.configure(yscroll=scrollbar_y.set)
-    scrollbar_y.grid(row=0, column=1, sticky=(tk.N, tk.S))
+    # Table with vertical and horizontal scrollbars
+    table = VirtualTable(frame, columns, column_width=130, height=24,
+                         horizontal_scroll=True)
+    table.grid(row=1, column=0, columnspan=3, rowspan=2,
+               sticky=(tk.W, tk.E, tk.N, tk.S))
 
-    # Add a horizontal scrollbar
-    scrollbar_x = ttk.Scrollbar(frame, orient=tk.HORIZONTAL, command=tree.xview)
-    tree.configure(xscroll=scrollbar_x.set)
-    scrollbar_x.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E))
+    # Make the frame and table expandable
+    frame.grid_rowconfigure(1, weight=1)
+    frame.grid_columnconfigure(0, weight=1)
 
     # Add a time label
     time_label = tk.StringVar()
-    tk.Label(frame, textvariable=time_label, font=("Helvetica", 12)).grid(row=2, column=0, sticky=tk.W)
-
-    # Function to handle the refresh of hourly data when the date changes in the real-time tab
-    def update_hourly_data(spp_data):
-        refresh_hourly_settlement_data(tree, time_label, spp_data)
-
-    # Return the update function to be used as a callback
-    return update_hourly_data
+    tk.Label(frame, textvariable=time_label, font=("Helvetica", 12)).grid(
+        row=3, column=0, sticky=tk.W)
+
+    # Function to get the day selected in the Combobox
+    def selected_day():
+        return datetime.strptime(operating_day_combobox.get(), '%Y-%m-%d').date()
+
+    # Function to handle the refresh button click
+    def refresh_hourly_data_button():
+        print(f"Loading hourly settlement data for {selected_day()}")
+        refresh_hourly_settlement_data(table, time_label, selected_day(), refresh=True)
+
+    refresh_button = tk.Button(frame, text="Refresh Now", font=("Helvetica", 12),
+                               command=refresh_hourly_data_button)
+    refresh_button.grid(row=4, column=0, pady=10, sticky=tk.W)
+
+    # Switching days shows the data bus's copy of the day, fetched only the first time
+    # it is selected
+    operating_day_combobox.bind(
+        '<<ComboboxSelected>>',
+        lambda _event: refresh_hourly_settlement_data(table, time_label,
+                                                      selected_day()))
+
+    # Function to redraw when the RT SPP data behind the day on screen changes (e.g.
+    # refreshed in the RT SPP tab)
+    def on_hourly_update(day):
+        if day == selected_day():
+            refresh_hourly_settlement_data(table, time_label, day)
+
+    # Export the selected day (or any range) to CSV / Parquet without blocking the GUI
+    def export_hourly_data_button():
+        open_export_dialog(frame, 'hourly', selected_day())
+
+    export_button = tk.Button(frame, text="Export...", font=("Helvetica", 12),
+                              command=export_hourly_data_button)
+    export_button.grid(row=4, column=1, pady=10, sticky=tk.W)
+
+    # Function to load the tab when first shown: last snapshot, then the selected day
+    def load():
+        show_snapshot(table, time_label, 'hourly_settlement')
+        default_bus.subscribe('hourly',
+                              lambda _view, day: call_on_tk(on_hourly_update, day))
+        refresh_hourly_settlement_data(table, time_label, selected_day())
+
+    return load
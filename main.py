@@ -1,14 +1,35 @@
-from real_time_data import create_real_time_tab
-from dam_data import create_dam_tab
-from real_time_settlement_data import create_real_time_spp_tab
-from hourly_settlement_data import create_hourly_settlement_tab
-import tkinter as tk
-from tkinter import ttk
+import time
+
+# Start of the cold-start clock: everything below, imports included, counts towards
+# first paint
+start_time = time.perf_counter()
+
+import tkinter as tk  # noqa: E402
+from tkinter import ttk  # noqa: E402
+
+from basis_data import create_basis_tab  # noqa: E402
+from chart_tab import create_chart_tab  # noqa: E402
+from dam_data import create_dam_tab  # noqa: E402
+from ercot_dart.metrics import start_from_env  # noqa: E402
+from fetch_executor import shutdown_fetch_pool, start_tk_dispatch  # noqa: E402
+from hourly_settlement_data import create_hourly_settlement_tab  # noqa: E402
+from real_time_data import create_real_time_tab  # noqa: E402
+from real_time_settlement_data import create_real_time_spp_tab  # noqa: E402
+
 
 def main():
+    imports_done = time.perf_counter()
+
+    # Metrics endpoint / JSON log / profiler, if switched on in the environment (see
+    # ercot_dart.metrics)
+    start_from_env()
+
     root = tk.Tk()
     root.title("ERCOT Data")
 
+    # Data bus updates arrive on the fetch pool; this runs the tab handlers on Tk
+    start_tk_dispatch(root)
+
     # Set the window size
     root.geometry("1200x800")
 
@@ -21,28 +42,81 @@ def main():
     dam_frame = ttk.Frame(notebook, padding="10")
     real_time_spp_frame = ttk.Frame(notebook, padding="10")
     hourly_settlement_frame = ttk.Frame(notebook, padding="10")
+    basis_frame = ttk.Frame(notebook, padding="10")
+    chart_frame = ttk.Frame(notebook, padding="10")
     real_time_frame.pack(fill='both', expand=True)
     dam_frame.pack(fill='both', expand=True)
     real_time_spp_frame.pack(fill='both', expand=True)
     hourly_settlement_frame.pack(fill='both', expand=True)
+    basis_frame.pack(fill='both', expand=True)
+    chart_frame.pack(fill='both', expand=True)
 
     # Add frames to the notebook
     notebook.add(real_time_frame, text="Real-Time Data")
     notebook.add(dam_frame, text="Day-Ahead Market (DAM)")
     notebook.add(real_time_spp_frame, text="Real-Time Settlement Points")
     notebook.add(hourly_settlement_frame, text="Hourly Settlement Data")
+    notebook.add(basis_frame, text="DART Basis")
+    notebook.add(chart_frame, text="Charts")
+
+    # Building the tabs only creates widgets; each returns a loader that shows the tab's
+    # last snapshot and starts its first fetch, run the first time the tab is selected
 
     # Real-Time Data Tab
-    create_real_time_tab(real_time_frame)
+    load_real_time = create_real_time_tab(real_time_frame)
 
     # Day-Ahead Market (DAM) Tab
-    create_dam_tab(dam_frame)
+    load_dam = create_dam_tab(dam_frame)
+
+    # Real-Time Settlement Points Tab
+    load_real_time_spp = create_real_time_spp_tab(real_time_spp_frame)
+
+    # Hourly Settlement Data Tab (averaged from the shared RT SPP data on the data bus)
+    load_hourly = create_hourly_settlement_tab(hourly_settlement_frame)
+
+    # DART Basis Tab (DAM minus hourly RT, per settlement point)
+    load_basis = create_basis_tab(basis_frame)
+
+    # Charts Tab (price history from the store; matplotlib loads on first showing)
+    load_chart = create_chart_tab(chart_frame)
+
+    loaders = {
+        str(real_time_frame): load_real_time,
+        str(dam_frame): load_dam,
+        str(real_time_spp_frame): load_real_time_spp,
+        str(hourly_settlement_frame): load_hourly,
+        str(basis_frame): load_basis,
+        str(chart_frame): load_chart,
+    }
+    loaded = set()
+
+    # Function to run a tab's loader once
+    def load_tab(tab):
+        if tab in loaded or tab not in loaders:
+            return
+        loaded.add(tab)
+        loaders[tab]()
+
+    notebook.bind('<<NotebookTabChanged>>', lambda _event: load_tab(notebook.select()))
+
+    # Report cold-start-to-first-paint once the window is actually drawn, then load the
+    # visible tab
+    def on_first_paint(_event):
+        notebook.unbind('<Expose>')
+        painted = time.perf_counter()
+        print(f"First paint after {(painted - start_time) * 1000:.0f} ms "
+              f"(imports {(imports_done - start_time) * 1000:.0f} ms, "
+              f"widgets {(painted - imports_done) * 1000:.0f} ms)")
+        load_tab(notebook.select())
+
+    notebook.bind('<Expose>', on_first_paint)
 
-    # Hourly Settlement Data Tab (to be used as a callback)
-    update_hourly_data = create_hourly_settlement_tab(hourly_settlement_frame)
+    # Stop pending fetches when the window is closed
+    def on_close():
+        shutdown_fetch_pool()
+        root.destroy()
 
-    # Real-Time Settlement Points Tab (with callback for hourly data update)
-    create_real_time_spp_tab(real_time_spp_frame, on_date_change_callback=update_hourly_data)
+    root.protocol("WM_DELETE_WINDOW", on_close)
 
     root.mainloop()
 
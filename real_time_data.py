@@ -1,57 +1,31 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import tkinter as tk
 from tkinter import ttk
-from datetime import datetime
-import pytz
-
-# Define the URL for real-time data
-real_time_url = "https://www.ercot.com/content/cdr/html/hb_lz.html"
-
-# Define the CST timezone
-cst = pytz.timezone('US/Central')
-
-# Function to scrape Real-Time ERCOT data
-def scrape_real_time_data(url):
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # Check for HTTP errors
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Find the table in the HTML
-        table = soup.find('table')
-        if table is None:
-            print("Error: Could not find table in the HTML")
-            return pd.DataFrame()  # Return an empty DataFrame if no table is found
-
-        # Parse the table into a DataFrame
-        df = pd.read_html(str(table))[0]
-        return df
-    except Exception as e:
-        print(f"Error scraping Real-Time data: {e}")
-        return pd.DataFrame()  # Return an empty DataFrame on error
-
-# Function to refresh Real-Time data and update the GUI
-def refresh_real_time_data(tree, time_label, url):
-    df = scrape_real_time_data(url)
-
-    if df.empty:
+from ercot_dart.cdr_site import cst, real_time_url
+from ercot_dart.metrics import span
+from rt_poller import RealTimePoller
+from snapshot_cache import save_snapshot, show_snapshot
+from table_view import VirtualTable
+
+# Function to show a new Real-Time snapshot in the GUI (runs on the Tk thread)
+def update_real_time_table(table, time_label, spike_flags, snapshot, delta, timestamp,
+                           spikes):
+    if snapshot.empty:
         print("No data available.")
         return
 
-    # Clear the tree
-    for row in tree.get_children():
-        tree.delete(row)
+    # The table only redraws the cells that changed, i.e. the rows in delta (and rows
+    # whose spike flag flipped)
+    spike_flags[:] = spikes.tolist() if spikes is not None else []
+    with span('render', tab='rt'):
+        table.set_data(snapshot)
 
-    # Insert new data
-    for index, row in df.iterrows():
-        values = row.tolist()
-        tree.insert('', tk.END, values=values)
-
-    # Update the time label to CST
-    now_cst = datetime.now(cst)
-    time_label.set("Last Updated: " + now_cst.strftime("%H:%M:%S %Z"))
+    # Show the time ERCOT published the prices, in CST
+    n_spikes = sum(spike_flags)
+    changed = f"{len(delta)} changed" + (f", {n_spikes} spiking" if n_spikes else "")
+    time_label.set("Last Updated: " + timestamp.astimezone(cst).strftime("%H:%M:%S %Z")
+                   + f" ({changed})")
+    published = timestamp.astimezone(cst).strftime("%Y-%m-%d %H:%M:%S %Z")
+    save_snapshot('real_time', snapshot, published)
 
 # Function to create the Real-Time Data tab and its elements
 def create_real_time_tab(frame):
@@ -61,31 +35,52 @@ def create_real_time_tab(frame):
     style.configure("Treeview.Heading", font=("Helvetica", 12))
     style.configure("Treeview", font=("Helvetica", 12))
 
-    tree = ttk.Treeview(frame, columns=columns, show='headings', height=24)
-    for col in columns:
-        tree.heading(col, text=col)
-        tree.column(col, width=100, anchor=tk.CENTER)
-
-    tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+    # Rows whose latest price spiked against the recent history are shown in red
+    spike_flags = []
+    def row_tags(row):
+        return ('spike',) if row < len(spike_flags) and spike_flags[row] else ()
 
-    # Add a scrollbar
-    scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
-    tree.configure(yscroll=scrollbar.set)
-    scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+    table = VirtualTable(frame, columns, column_width=100, height=24, row_tags=row_tags)
+    table.tree.tag_configure('spike', foreground='red')
+    table.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
 
     # Add a refresh button and time label
     time_label = tk.StringVar()
     tk.Label(frame, textvariable=time_label, font=("Helvetica", 12)).grid(row=1, column=0, sticky=tk.W)
-    now_cst = datetime.now(cst)
-    time_label.set("Last Updated: " + now_cst.strftime("%H:%M:%S %Z"))
 
-    refresh_button = tk.Button(frame, text="Refresh Now", font=("Helvetica", 12), command=lambda: refresh_real_time_data(tree, time_label, real_time_url))
+    # Poll the page after each SCED run; only changed snapshots reach the table
+    def on_change(*result):
+        update_real_time_table(table, time_label, spike_flags, *result)
+
+    poller = RealTimePoller(table.frame, real_time_url, on_change=on_change)
+
+    refresh_button = tk.Button(frame, text="Refresh Now", font=("Helvetica", 12),
+                               command=poller.poll_now)
     refresh_button.grid(row=2, column=0, pady=10)
 
-    # Make the frame and treeview expandable
+    # Let the user turn automatic polling off and on
+    auto_refresh = tk.BooleanVar(value=True)
+
+    def toggle_auto_refresh():
+        if auto_refresh.get():
+            poller.start()
+        else:
+            poller.stop()
+
+    tk.Checkbutton(frame, text="Auto Refresh", variable=auto_refresh,
+                   font=("Helvetica", 12),
+                   command=toggle_auto_refresh).grid(row=2, column=1, pady=10)
+
+    # Make the frame and table expandable
     frame.grid_rowconfigure(0, weight=1)
     frame.grid_columnconfigure(0, weight=1)
-    tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
-    # Initial load of data
-    refresh_real_time_data(tree, time_label, real_time_url)
+    # Function to load the tab when first shown: last snapshot first, then keep polling
+    def load():
+        show_snapshot(table, time_label, 'real_time')
+        if auto_refresh.get():
+            poller.start()
+        else:
+            poller.poll_now()
+
+    return load
@@ -0,0 +1,85 @@
+from datetime import datetime
+
+from fetch_executor import run_in_background
+
+
+# Polls the RT LMP page from the Tk event loop, in step with SCED, backing off while
+# nothing changes
+class RealTimePoller:
+    def __init__(self, widget, url, on_change, tracker=None):
+        self.widget = widget
+        self.url = url
+        # Called on the Tk thread with (snapshot, delta, timestamp, spikes)
+        self.on_change = on_change
+        self.tracker = tracker  # Made on first poll so pandas loads off the Tk thread
+        self.history = None  # Recent snapshots (LmpHistory), seeded on the first poll
+        self.schedule = None
+        self.after_id = None
+        self.in_flight = False
+        self.running = False
+
+    def start(self):
+        self.running = True
+        self.poll_now()
+
+    def stop(self):
+        self.running = False
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    # Function to poll straight away (also used by the Refresh Now button)
+    def poll_now(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        if self.in_flight:
+            return
+        self.in_flight = True
+        run_in_background(self.widget, self._poll, on_done=self._on_result,
+                          on_error=self._on_error)
+
+    # Function to fetch and diff the page, then flag spiking points (on the fetch pool)
+    def _poll(self):
+        if self.schedule is None:
+            self._start_tracking()
+        result = self.tracker.poll(self.url)
+        if result is None:
+            return None
+        spikes = self.history.latest_spikes() if self.history is not None else None
+        return (*result, spikes)
+
+    def _start_tracking(self):
+        from ercot_dart.lmp_history import LmpHistory
+        from ercot_dart.lmp_tracker import LmpChangeTracker, PollSchedule, cst
+        from ercot_dart.price_store import default_store
+        self.tracker = self.tracker or LmpChangeTracker()
+        if self.tracker.history is None:
+            self.tracker.history = LmpHistory()
+            try:
+                store = self.tracker.store or default_store
+                self.tracker.history.load_store(store, datetime.now(cst))
+            except Exception as e:
+                print(f"Error loading RT LMP history: {e}")
+        self.history = self.tracker.history
+        self.schedule = PollSchedule()
+
+    def _on_result(self, result):
+        self.in_flight = False
+        if result is not None:
+            self.on_change(*result)
+            self._schedule(self.schedule.after_change())  # Wait for the next SCED run
+        else:
+            self._schedule(self.schedule.after_no_change())
+
+    def _on_error(self, error):
+        self.in_flight = False
+        print(f"Error polling Real-Time data: {error}")
+        if self.schedule is None:
+            self._schedule(60)  # The core modules failed to load; try again in a minute
+            return
+        self._schedule(self.schedule.after_no_change())
+
+    def _schedule(self, delay):
+        if self.running:
+            self.after_id = self.widget.after(int(max(1, delay) * 1000), self.poll_now)
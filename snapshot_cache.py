@@ -0,0 +1,48 @@
+import json
+import os
+
+# Last table each tab displayed, saved as small JSON files so the next start-up can
+# show it before pandas is even imported. Stale by definition: it is only a
+# placeholder until the tab's fresh data arrives.
+
+snapshot_dir = os.environ.get(
+    'ERCOT_DART_SNAPSHOTS',
+    os.path.join(os.path.expanduser('~'), '.cache', 'ercot-dart', 'snapshots'))
+
+def _path(name):
+    return os.path.join(snapshot_dir, f"{name}.json")
+
+# Function to save the table a tab is showing (a DataFrame) with its time label text
+def save_snapshot(name, df, label):
+    snapshot = df.to_dict(orient='split', index=False)
+    snapshot['label'] = label
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        tmp_path = _path(name) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, default=str)
+        os.replace(tmp_path, _path(name))
+    except OSError as e:
+        print(f"Error saving {name} snapshot: {e}")
+
+# Function to read a saved snapshot; returns (columns, rows, label) or None
+def load_snapshot(name):
+    try:
+        with open(_path(name)) as f:
+            snapshot = json.load(f)
+        return snapshot['columns'], snapshot['data'], snapshot.get('label', '')
+    except (OSError, ValueError, KeyError):
+        return None
+
+# Function to put a tab's last snapshot in its table while fresh data loads; returns
+# True if there was one
+def show_snapshot(table, time_label, name):
+    if table.n_rows:
+        return False  # Fresh data got there first
+    snapshot = load_snapshot(name)
+    if snapshot is None:
+        return False
+    columns, rows, label = snapshot
+    table.set_rows(rows, columns)
+    time_label.set(f"Cached copy ({label}), refreshing...")
+    return True
@@ -0,0 +1,148 @@
+import tkinter as tk
+from tkinter import font as tkfont
+from tkinter import ttk
+
+# Treeview-based table that only materializes the rows on screen. The data is
+# kept as one array per DataFrame column; scrolling re-points the existing row
+# items at a different slice, and a refresh only touches cells whose text changed.
+
+class VirtualTable:
+    def __init__(self, parent, columns, column_width=100, height=24,
+                 horizontal_scroll=False, row_tags=None):
+        self.columns = list(columns)
+        self.row_tags = row_tags  # Optional function(row index) -> Treeview tags
+        self.data = [[] for _ in self.columns]  # One array per column
+        self.n_rows = 0
+        self.offset = 0  # Index of the first row on screen
+        self.visible = height
+        self.items = []  # Treeview items, one per row on screen
+        self.shown = []  # (values, tags) each item is currently showing
+
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=self.columns, show='headings',
+                                 height=height)
+        for col in self.columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=column_width, anchor=tk.CENTER)
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        # The vertical scrollbar drives the row offset rather than the Treeview itself
+        self.scrollbar_y = ttk.Scrollbar(self.frame, orient=tk.VERTICAL,
+                                         command=self.yview)
+        self.scrollbar_y.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        if horizontal_scroll:
+            scrollbar_x = ttk.Scrollbar(self.frame, orient=tk.HORIZONTAL,
+                                        command=self.tree.xview)
+            self.tree.configure(xscroll=scrollbar_x.set)
+            scrollbar_x.grid(row=1, column=0, sticky=(tk.W, tk.E))
+
+        self.frame.grid_rowconfigure(0, weight=1)
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda _event: self._scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda _event: self._scroll_by(3))
+        self.tree.bind('<Prior>', lambda _event: self._scroll_by(-self.visible))
+        self.tree.bind('<Next>', lambda _event: self._scroll_by(self.visible))
+
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    # Function to replace the table's data; only cells whose text changed are sent to Tk
+    def set_data(self, df):
+        self.data = [df[col].to_numpy() if col in df.columns else [''] * len(df)
+                     for col in self.columns]
+        self.n_rows = len(df)
+        self._render()
+
+    # Function to show plain row lists (e.g. a cached snapshot) without using pandas
+    def set_rows(self, rows, columns=None):
+        index = {col: i for i, col in enumerate(columns or self.columns)}
+        blank = [''] * len(rows)
+        self.data = [[row[index[col]] for row in rows] if col in index else blank
+                     for col in self.columns]
+        self.n_rows = len(rows)
+        self._render()
+
+    # Function to scroll so the given row is at the top of the view
+    def scroll_to(self, row):
+        self.offset = row
+        self._render()
+
+    def _max_offset(self):
+        return max(0, self.n_rows - self.visible)
+
+    def _scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+        return 'break'  # Stop the Treeview from scrolling its own (recycled) items
+
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    # Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units' | 'pages')
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * self.n_rows))
+        elif args[0] == 'scroll':
+            step = self.visible if args[2] == 'pages' else 1
+            self._scroll_by(int(args[1]) * step)
+
+    def _on_resize(self, event):
+        style = ttk.Style()
+        row_height = style.lookup('Treeview', 'rowheight')
+        if not row_height:
+            font = style.lookup('Treeview', 'font') or 'TkDefaultFont'
+            row_font = tkfont.Font(font=font)
+            row_height = row_font.metrics('linespace') + 2
+        row_height = int(row_height)
+        # Less the heading row
+        visible = max(1, (event.height - row_height - 4) // row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self._render()
+
+    def _render(self):
+        self.offset = min(max(0, self.offset), self._max_offset())
+        count = min(self.visible, self.n_rows - self.offset)
+
+        # Add or remove row items so there is exactly one per visible row
+        while len(self.items) < count:
+            self.items.append(self.tree.insert('', tk.END))
+            self.shown.append((None, ()))
+        while len(self.items) > count:
+            self.tree.delete(self.items.pop())
+            self.shown.pop()
+
+        # Slice every column once; tolist() turns a slice into Python values in one call
+        window = slice(self.offset, self.offset + count)
+        slices = [column[window] for column in self.data]
+        slices = [part.tolist() if hasattr(part, 'tolist') else list(part)
+                  for part in slices]
+
+        for i, values in enumerate(zip(*slices, strict=True)):
+            item = self.items[i]
+            old_values, old_tags = self.shown[i]
+            tags = self.row_tags(self.offset + i) if self.row_tags else ()
+            if old_values is None:
+                self.tree.item(item, values=values, tags=tags)
+            else:
+                # NaN equals NaN here
+                pairs = enumerate(zip(values, old_values, strict=True))
+                changed = [j for j, (value, old) in pairs
+                           if value != old and (value == value or old == old)]
+                if len(changed) > len(values) // 2:
+                    self.tree.item(item, values=values)
+                else:
+                    for j in changed:
+                        self.tree.set(item, self.columns[j], values[j])
+                if tags != old_tags:
+                    self.tree.item(item, tags=tags)
+            self.shown[i] = (values, tags)
+
+        # Keep the scrollbar in step with the offset
+        if self.n_rows:
+            self.scrollbar_y.set(self.offset / self.n_rows,
+                                 (self.offset + count) / self.n_rows)
+        else:
+            self.scrollbar_y.set(0, 1)
@@ -0,0 +1,65 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Local HTTP server answering each GET with the next scripted (status, headers, body);
+# once the script runs out the last response is repeated
+
+
+class StubServer:
+    def __init__(self):
+        self.responses = [(404, {}, b'Not Found')]
+        self.requests = []  # (path, headers) of every request, in order
+        self.client_ports = set()  # One per connection the clients opened
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # Function to set the responses for the next requests
+    def script(self, *responses):
+        self.responses = list(responses)
+
+    def _next(self, path, headers, client_address):
+        self.requests.append((path, dict(headers)))
+        self.client_ports.add(client_address[1])
+        if len(self.responses) > 1:
+            return self.responses.pop(0)
+        return self.responses[0]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                status, headers, body = server._next(self.path, self.headers,
+                                                     self.client_address)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
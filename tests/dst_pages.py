@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+# Wide DAM and RT SPP tables laid out like the CDR pages for operating days around the
+# DST changes: on the fall-back day the intervals ending 0115-0200 appear twice (the
+# second pass flagged Y), on the spring-forward day the labels ending 0215-0300 are
+# skipped
+
+
+# Function to list (Interval Ending, Repeated Hour Flag) labels for an operating day
+def interval_labels(day):
+    labels = []
+    for minutes in range(15, 24 * 60 + 1, 15):
+        label = f"{minutes // 60:02d}{minutes % 60:02d}"
+        if day.month == 3 and 135 <= minutes <= 180:
+            continue  # 0215-0300 never happen on the spring-forward day
+        labels.append((label, 'N'))
+        if day.month == 11 and minutes == 120:
+            labels += [(f"01{m:02d}", 'Y') for m in (15, 30, 45)] + [('0200', 'Y')]
+    return labels
+
+
+# Function to build the page for a day; prices[i] is the HB_NORTH price of the i-th
+# interval (HB_WEST is twice that), defaulting to 1, 2, 3, ...
+def rt_spp_page(day, prices=None):
+    labels = interval_labels(day)
+    if prices is None:
+        prices = np.arange(1, len(labels) + 1, dtype=np.float64)
+    return pd.DataFrame({
+        'Oper Day': day.strftime('%m/%d/%Y'),
+        'Interval Ending': [label for label, _ in labels],
+        'Repeated Hour Flag': [flag for _, flag in labels],
+        'HB_NORTH': prices,
+        'HB_WEST': prices * 2,
+    })
+
+
+# Function to build a DAM page: hour endings 1..24, with hour ending 2 repeated on the
+# fall-back day and hour ending 3 missing on the spring-forward day
+def dam_page(day):
+    hours = [(1, 'N'), (2, 'N'), (2, 'Y')] if day.month == 11 else [(1, 'N'), (2, 'N')]
+    skipped = 3 if day.month == 3 else None
+    hours += [(hour, 'N') for hour in range(3, 25) if hour != skipped]
+    prices = np.arange(1, len(hours) + 1, dtype=np.float64) * 10
+    return pd.DataFrame({
+        'Oper Day': day.strftime('%m/%d/%Y'),
+        'Hour Ending': [hour for hour, _ in hours],
+        'Repeated Hour Flag': [flag for _, flag in hours],
+        'HB_NORTH': prices,
+    })
+
+
+# Function to drop the flag column, as on pages that don't carry one
+def without_flag(page):
+    return page.drop(columns=['Repeated Hour Flag'])
+
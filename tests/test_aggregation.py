@@ -0,0 +1,69 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+from dst_pages import rt_spp_page, without_flag
+
+from ercot_dart.aggregation import peak_block, resample_prices
+from ercot_dart.price_frames import intervals_in_day, spp_to_long
+
+FALL_BACK = date(2024, 11, 3)
+SPRING_FORWARD = date(2024, 3, 10)
+
+
+def test_intervals_in_dst_days():
+    assert intervals_in_day(FALL_BACK, 15) == 100
+    assert intervals_in_day(SPRING_FORWARD, 15) == 92
+    assert intervals_in_day(date(2024, 8, 1), 60) == 24
+    assert len(rt_spp_page(FALL_BACK)) == 100
+    assert len(rt_spp_page(SPRING_FORWARD)) == 92
+
+
+@pytest.mark.parametrize('flagged', [True, False])
+def test_fall_back_day_has_25_hours(flagged):
+    page = rt_spp_page(FALL_BACK)
+    hourly = resample_prices(page if flagged else without_flag(page), 'hour')
+
+    assert len(hourly) == 25
+    assert hourly['Hour Ending'].tolist() == [1, 2, 2] + list(range(3, 25))
+    assert hourly['Repeated Hour Flag'].tolist() == ['N', 'N', 'Y'] + ['N'] * 22
+    # Intervals 1-4, 5-8 (first pass through 01:00-02:00) and 9-12 (second pass)
+    assert hourly['HB_NORTH'].tolist()[:4] == [2.5, 6.5, 10.5, 14.5]
+    assert hourly['Interval End'].is_unique
+
+
+def test_spring_forward_day_has_23_hours():
+    hourly = resample_prices(rt_spp_page(SPRING_FORWARD), 'hour')
+
+    assert len(hourly) == 23
+    assert 3 not in hourly['Hour Ending'].tolist()
+    assert hourly['HB_NORTH'].tolist()[:3] == [2.5, 6.5, 10.5]  # HE1, HE2, then HE4
+
+
+def test_interval_ends_are_unique_instants_on_the_fall_back_day():
+    long_df = spp_to_long(rt_spp_page(FALL_BACK))
+    ends = pd.DatetimeIndex(long_df['interval_end'].unique())
+
+    assert len(ends) == 100
+    assert ends.is_monotonic_increasing
+    assert (np.diff(ends.as_unit('s').asi8) == 15 * 60).all()
+
+
+def test_daily_average_weights_every_interval():
+    page = rt_spp_page(FALL_BACK)
+    daily = resample_prices(page, 'day')
+
+    assert daily['HB_NORTH'].iloc[0] == pytest.approx(page['HB_NORTH'].mean(), abs=0.01)
+    assert daily['HB_WEST'].iloc[0] == pytest.approx(page['HB_WEST'].mean(), abs=0.01)
+
+
+def test_peak_blocks():
+    days = pd.to_datetime(['2024-08-01', '2024-08-03', '2024-07-04', '2024-08-01'])
+    blocks = peak_block(days, np.array([7, 7, 12, 23]))
+    assert blocks.tolist() == ['5x16', '2x16', '2x16', '7x8']
+
+
+def test_unknown_granularity():
+    with pytest.raises(ValueError):
+        resample_prices(rt_spp_page(FALL_BACK), 'week')
@@ -0,0 +1,120 @@
+import gzip
+import json
+import os
+import threading
+import time
+import urllib.request
+from datetime import date
+
+import pytest
+from dst_pages import dam_page
+
+from ercot_dart import api_server, lmp_tracker
+from ercot_dart.api_server import PriceApi, serve_api
+from ercot_dart.price_store import PriceStore
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'fixtures')
+DAY = date(2024, 8, 1)
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    with open(os.path.join(FIXTURE_DIR, 'hb_lz.html'), 'rb') as f:
+        page = f.read()
+    monkeypatch.setattr(lmp_tracker, 'fetch_page', lambda _url: page)
+    return PriceApi(store=PriceStore(str(tmp_path)))
+
+
+def test_rt_serves_the_snapshot_without_storing_it(api):
+    status, _, body = api.handle('/rt', '')
+
+    assert status == 200
+    assert b'HB_HOUSTON' in body
+    assert api.store.days('lmp') == []
+    assert not api.store.has_day('lmp', date(2024, 8, 1))
+
+
+def test_an_empty_settled_day_is_loaded_again(tmp_path, monkeypatch):
+    page = dam_page(date(2024, 8, 1))
+    calls = []
+
+    # The first fetch times out (the scraper returns an empty frame), the second works
+    def load_dam_day(day, **_kwargs):
+        calls.append(day)
+        return page.iloc[:0] if len(calls) == 1 else page
+
+    monkeypatch.setattr(api_server, 'load_dam_day', load_dam_day)
+    api = PriceApi(store=PriceStore(str(tmp_path)), live_ttl=0)
+
+    assert json.loads(api.handle('/dam', 'start=2024-08-01')[2])['count'] == 0
+    assert json.loads(api.handle('/dam', 'start=2024-08-01')[2])['count'] == 24
+    assert json.loads(api.handle('/dam', 'start=2024-08-01')[2])['count'] == 24
+    assert len(calls) == 2
+
+
+def test_concurrent_requests_for_a_day_share_one_load(tmp_path, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def load_dam_day(day, **_kwargs):
+        calls.append(day)
+        release.wait(5)
+        return dam_page(day)
+
+    monkeypatch.setattr(api_server, 'load_dam_day', load_dam_day)
+    api = PriceApi(store=PriceStore(str(tmp_path)))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(api.day('dam', DAY)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while api.flight.stats()['coalesced'] < 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [DAY]
+    assert len(results) == 8
+    assert all(rows is results[0] for rows in results)
+    assert len(results[0]) == 24
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(api_server, 'load_dam_day',
+                        lambda day, **_kwargs: dam_page(day))
+    httpd = serve_api(0, store=PriceStore(str(tmp_path)))
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+# Function to GET a path; returns (status, headers, body as sent)
+def get(url, **headers):
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_each_encoding_has_its_own_etag(server):
+    url = server + '/dam?start=2024-08-01'
+    _, plain_headers, plain = get(url)
+    _, gzip_headers, zipped = get(url, **{'Accept-Encoding': 'gzip'})
+
+    assert gzip_headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(zipped) == plain
+    assert gzip_headers['ETag'] == plain_headers['ETag'][:-1] + '-gz"'
+
+    # A tag only matches the encoding it was sent with
+    assert get(url, **{'If-None-Match': plain_headers['ETag']})[0] == 304
+    status, _, body = get(url, **{'If-None-Match': gzip_headers['ETag']})
+    assert (status, body) == (200, plain)
+    status, headers, body = get(url, **{'Accept-Encoding': 'gzip',
+                                        'If-None-Match': gzip_headers['ETag']})
+    assert (status, body) == (304, b'')
+    assert 'Content-Encoding' not in headers
@@ -0,0 +1,80 @@
+from datetime import date, datetime
+
+import pytest
+from dst_pages import rt_spp_page
+
+from ercot_dart import backfill
+from ercot_dart.page_cache import cst
+from ercot_dart.price_frames import spp_to_long
+from ercot_dart.price_store import PriceStore
+
+SETTLED = date(2024, 8, 1)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(str(tmp_path))
+
+
+# Replaces the RT SPP scraper with one serving full pages and counting the requests
+@pytest.fixture
+def scraped(monkeypatch):
+    urls = []
+
+    def scrape(url):
+        urls.append(url)
+        day = datetime.strptime(url.rsplit('/', 1)[1][:8], '%Y%m%d').date()
+        return rt_spp_page(day)
+
+    url_base = 'https://cdr.test/{date}_real_time_spp.html'
+    monkeypatch.setitem(backfill.FEEDS, 'spp', (url_base, scrape, spp_to_long))
+    return urls
+
+
+def stored_intervals(store, day):
+    return store.load('spp', day, day)['interval_end'].nunique()
+
+
+def run(store, start, end=None):
+    return backfill.run_backfill(start, end or start, ['spp'], store, workers=1,
+                                 rate=1000)
+
+
+def test_partial_day_is_fetched_again(store, scraped, capsys):
+    # 40 of 96 intervals, as stored by the GUI while the day was in progress
+    store.write_day('spp', SETTLED, spp_to_long(rt_spp_page(SETTLED).iloc[:40]))
+    assert store.has_day('spp', SETTLED)
+    assert not store.has_complete_day('spp', SETTLED)
+
+    stored, failed = run(store, SETTLED)
+
+    assert (stored, failed) == (1, [])
+    assert len(scraped) == 1
+    assert stored_intervals(store, SETTLED) == 96
+    assert store.has_complete_day('spp', SETTLED)
+    assert 'Backfilling 1 feed-days (0 already complete)' in capsys.readouterr().out
+
+
+def test_complete_settled_days_are_skipped(store, scraped):
+    store.write_day('spp', SETTLED, spp_to_long(rt_spp_page(SETTLED)))
+
+    assert run(store, SETTLED, date(2024, 8, 2)) == (1, [])
+    assert len(scraped) == 1  # Only Aug 2
+
+
+def test_fall_back_day_needs_all_100_intervals(store, scraped):
+    day = date(2024, 11, 3)
+    store.write_day('spp', day, spp_to_long(rt_spp_page(day).iloc[:96]))
+    assert not store.has_complete_day('spp', day)
+
+    run(store, day)
+    assert len(scraped) == 1
+    assert stored_intervals(store, day) == 100
+
+
+def test_days_still_in_progress_are_never_done(store, scraped):
+    today = datetime.now(cst).date()
+    store.write_day('spp', today, spp_to_long(rt_spp_page(today)))
+
+    run(store, today)
+    assert len(scraped) == 1
@@ -0,0 +1,38 @@
+from datetime import date
+
+import pytest
+from dst_pages import dam_page, rt_spp_page
+
+from ercot_dart.basis_engine import BasisCache
+from ercot_dart.price_frames import dam_to_long, spp_to_long
+from ercot_dart.price_store import PriceStore
+
+DAY = date(2024, 8, 1)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(str(tmp_path))
+
+
+def test_settled_day_with_complete_inputs_is_stored(store):
+    store.write_day('dam', DAY, dam_to_long(dam_page(DAY)))
+    store.write_day('spp', DAY, spp_to_long(rt_spp_page(DAY)))
+
+    spreads = BasisCache(store).get_day(DAY)
+
+    assert len(spreads) == 24
+    assert store.has_day('basis', DAY)
+
+
+def test_spreads_from_partial_inputs_are_recomputed(store):
+    store.write_day('dam', DAY, dam_to_long(dam_page(DAY)))
+    store.write_day('spp', DAY, spp_to_long(rt_spp_page(DAY).iloc[:40]))
+    cache = BasisCache(store)
+
+    assert len(cache.get_day(DAY)) == 10
+    assert not store.has_day('basis', DAY)
+
+    store.write_day('spp', DAY, spp_to_long(rt_spp_page(DAY)))
+    assert len(cache.get_day(DAY)) == 24
+    assert store.has_day('basis', DAY)
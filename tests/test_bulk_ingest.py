@@ -0,0 +1,81 @@
+import json
+import os
+from datetime import date
+
+import pytest
+from dst_pages import rt_spp_page
+
+from ercot_dart.bulk_ingest import bulk_ingest, find_pages
+from ercot_dart.price_frames import spp_to_long
+from ercot_dart.price_store import PriceStore
+
+DAY = date(2024, 8, 1)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(str(tmp_path / 'store'))
+
+
+# Function to save a page as {date}_real_time_spp.html, keeping only its first `rows`
+def save_page(directory, day, rows=None, prices=None):
+    page = rt_spp_page(day, prices)
+    path = os.path.join(directory, f"{day:%Y%m%d}_real_time_spp.html")
+    page.iloc[:rows].to_html(path, index=False)
+    return path
+
+
+# Function to save a page the way the page cache does: <key>.html plus <key>.json
+def cache_page(directory, key, day, final):
+    page_path = os.path.join(directory, key + '.html')
+    rt_spp_page(day).to_html(page_path, index=False)
+    url = f"https://www.ercot.com/content/cdr/html/{day:%Y%m%d}_real_time_spp.html"
+    with open(os.path.join(directory, key + '.json'), 'w') as f:
+        json.dump({'url': url, 'final': final}, f)
+
+
+def ingest(directory, store, **kwargs):
+    return bulk_ingest(str(directory), store, workers=1, **kwargs)
+
+
+def stored_intervals(store, day):
+    return store.load('spp', day, day)['interval_end'].nunique()
+
+
+def test_only_final_page_cache_entries_are_found(tmp_path):
+    cache_page(tmp_path, 'a' * 64, DAY, final=True)
+    cache_page(tmp_path, 'b' * 64, date(2024, 8, 2), final=False)
+
+    assert [(feed, day) for feed, day, _ in find_pages(str(tmp_path))] == [('spp', DAY)]
+
+
+def test_partially_stored_day_is_completed(tmp_path, store):
+    store.write_day('spp', DAY, spp_to_long(rt_spp_page(DAY).iloc[:40]))
+    save_page(tmp_path, DAY)
+
+    assert ingest(tmp_path, store) == (1, [])
+    assert stored_intervals(store, DAY) == 96
+
+
+def test_complete_days_are_skipped_unless_overwriting(tmp_path, store):
+    store.write_day('spp', DAY, spp_to_long(rt_spp_page(DAY)))
+    save_page(tmp_path, DAY)
+
+    assert ingest(tmp_path, store) == (0, [])
+    assert ingest(tmp_path, store, overwrite=True) == (1, [])
+
+
+def test_partial_pages_never_replace_a_complete_day(tmp_path, store):
+    store.write_day('spp', DAY, spp_to_long(rt_spp_page(DAY)))
+    save_page(tmp_path, DAY, rows=40)
+
+    assert ingest(tmp_path, store, overwrite=True) == (0, [])
+    assert stored_intervals(store, DAY) == 96
+
+
+def test_fall_back_day_page_is_complete_with_100_intervals(tmp_path, store):
+    day = date(2024, 11, 3)
+    save_page(tmp_path, day)
+
+    assert ingest(tmp_path, store) == (1, [])
+    assert stored_intervals(store, day) == 100
@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from bs4 import BeautifulSoup
+
+from ercot_dart.cdr_parser import convert_column, parse_cdr_table, parse_table_columns
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'fixtures')
+FIXTURES = ['20240801_dam_spp.html', '20240801_real_time_spp.html', 'hb_lz.html']
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+
+# Function to read the first table with BeautifulSoup, as the scrapers did before the
+# single-pass parser
+def soup_table(content):
+    table = BeautifulSoup(content, 'html.parser').find('table')
+    rows = [[cell.get_text(' ', strip=True) for cell in tr.find_all(['th', 'td'])]
+            for tr in table.find_all('tr')]
+    return rows[0], [list(column) for column in zip(*rows[1:], strict=True)]
+
+
+@pytest.mark.parametrize('name', FIXTURES)
+def test_fixture_cells_match_beautifulsoup(name):
+    content = read_fixture(name)
+    assert parse_table_columns(content) == soup_table(content)
+
+
+def test_real_time_spp_page():
+    df = parse_cdr_table(read_fixture('20240801_real_time_spp.html'),
+                         text_columns=('Interval Ending',))
+
+    assert df.shape == (96, 17)
+    assert list(df.columns[:3]) == ['Oper Day', 'Interval Ending', 'HB_BUSAVG']
+    assert df['Interval Ending'].iloc[0] == '0015'  # Kept as zero-padded text
+    assert df['Interval Ending'].iloc[-1] == '2400'
+    assert (df['Oper Day'] == '08/01/2024').all()
+    assert df['HB_NORTH'].dtype == np.float64
+
+
+def test_dam_page():
+    df = parse_cdr_table(read_fixture('20240801_dam_spp.html'))
+
+    assert df.shape == (24, 17)
+    assert df['Hour Ending'].dtype == np.int64
+    assert df['Hour Ending'].tolist() == list(range(1, 25))
+    assert df.iloc[:, 2:].dtypes.eq(np.float64).all()
+
+
+def test_real_time_lmp_page():
+    df = parse_cdr_table(read_fixture('hb_lz.html'))
+
+    assert list(df.columns) == ['Settlement Point', 'LMP', '5 Min Change to LMP']
+    assert df['Settlement Point'].iloc[0] == 'HB_BUSAVG'
+    assert df['LMP'].iloc[0] == pytest.approx(21.05)
+
+
+def test_cells_are_cleaned_like_read_html():
+    page = """<html><body><p>Last Updated</p>
+    <table><tr><th>Name</th><th>Price</th></tr>
+    <tr><td><b>A&amp;B</b></td><td> 1,234.50 </td></tr>
+    <tr><td>C
+        D</td><td></td></tr>
+    <tr><td>E</td><td>-3</td>
+    </table><table><tr><th>Second</th></tr></table></body></html>"""
+    df = parse_cdr_table(page)
+
+    assert df['Name'].tolist() == ['A&B', 'C D', 'E']
+    prices = df['Price'].to_numpy()
+    assert prices[0] == 1234.5
+    assert np.isnan(prices[1])  # Blank cell
+    assert prices[2] == -3.0
+
+
+def test_page_without_a_table():
+    assert parse_cdr_table('<html><body>Maintenance</body></html>') is None
+
+
+def test_convert_column():
+    assert convert_column(['1', '2', '24']).dtype == np.int64
+    assert convert_column(['1', '', '3']).dtype == np.float64
+    assert convert_column(['1.5', '2']).tolist() == [1.5, 2.0]
+    assert convert_column(['HB_NORTH', 'HB_WEST']).dtype == object
+    assert pd.isna(convert_column(['', '']).tolist()).all()
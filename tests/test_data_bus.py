@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from dst_pages import dam_page, rt_spp_page
+
+from ercot_dart.data_bus import DataBus, basis_view, hourly_view
+
+DAY = date(2024, 8, 1)
+OTHER_DAY = DAY + timedelta(days=1)
+
+
+@pytest.fixture
+def bus():
+    page = pd.DataFrame({
+        'Oper Day': ['08/01/2024', '08/01/2024'],
+        'Hour Ending': [1, 2],
+        'HB_NORTH': [21.5, 23.0],
+        'Settlement Point': pd.Categorical(['HB_NORTH', 'HB_NORTH']),
+    })
+    bus = DataBus()
+    bus.add_feed('dam', lambda _day: page.copy())
+    return bus
+
+
+# Function to wrap a feed or view function so the calls to it are recorded
+def counted(func, calls):
+    def wrapper(*args):
+        calls.append(args)
+        return func(*args)
+    return wrapper
+
+
+def test_writes_to_the_shared_arrays_raise(bus):
+    frame = bus.get('dam', DAY)
+
+    with pytest.raises(ValueError):
+        frame['HB_NORTH'].to_numpy()[0] = 99.0
+    assert bus.get('dam', DAY)['HB_NORTH'].tolist() == [21.5, 23.0]
+
+
+def test_frames_share_the_cached_arrays(bus):
+    first = bus.get('dam', DAY)
+    second = bus.get('dam', DAY)
+
+    north = first['HB_NORTH'].to_numpy()
+    assert np.shares_memory(north, second['HB_NORTH'].to_numpy())
+    assert list(first.columns) == list(second.columns)
+    assert list(first.columns)[2:] == ['HB_NORTH', 'Settlement Point']
+    assert isinstance(first['Settlement Point'].dtype, pd.CategoricalDtype)
+
+
+def test_switching_days_back_loads_each_day_once():
+    calls = []
+    bus = DataBus()
+    bus.add_feed('dam', counted(dam_page, calls))
+
+    for day in (DAY, OTHER_DAY, DAY, OTHER_DAY):
+        assert len(bus.get('dam', day)) == 24
+    assert calls == [(DAY,), (OTHER_DAY,)]
+
+
+def test_least_recently_used_day_is_evicted_at_max_entries():
+    calls = []
+    bus = DataBus(max_entries=2)
+    bus.add_feed('dam', counted(dam_page, calls))
+    days = [DAY + timedelta(days=offset) for offset in range(3)]
+
+    bus.get('dam', days[0])
+    bus.get('dam', days[1])
+    bus.get('dam', days[0])  # days[1] is now the least recently used
+    bus.get('dam', days[2])
+    assert list(bus.entries) == [('dam', days[0]), ('dam', days[2])]
+
+    bus.get('dam', days[0])
+    bus.get('dam', days[1])
+    assert calls == [(days[0],), (days[1],), (days[2],), (days[1],)]
+
+
+def test_subscribers_hear_about_new_versions_only():
+    prices = [np.arange(1.0, 97.0)]
+    bus = DataBus()
+    bus.add_feed('spp', lambda day: rt_spp_page(day, prices[0]))
+    heard = []
+    bus.subscribe('spp', lambda feed, day: heard.append((feed, day)))
+    unsubscribe = bus.subscribe('hourly', lambda view, day: heard.append((view, day)))
+
+    bus.get('spp', DAY)
+    assert heard == [('spp', DAY), ('hourly', DAY)]
+
+    bus.get('spp', DAY, refresh=True)  # Same prices: same version, nobody is told
+    assert len(heard) == 2
+
+    prices[0] = prices[0] + 1
+    unsubscribe()
+    bus.get('spp', DAY, refresh=True)
+    assert heard[2:] == [('spp', DAY)]
+
+
+def test_views_are_recomputed_only_when_an_input_changes():
+    prices = [np.arange(1.0, 97.0)]
+    hourly_calls, basis_calls = [], []
+    bus = DataBus()
+    bus.add_feed('dam', dam_page)
+    bus.add_feed('spp', lambda day: rt_spp_page(day, prices[0]))
+    bus.add_view('hourly', ('spp',), counted(hourly_view, hourly_calls))
+    bus.add_view('basis', ('dam', 'spp'), counted(basis_view, basis_calls))
+
+    hourly = bus.get('hourly', DAY)
+    assert hourly['HB_NORTH'].iloc[0] == 2.5  # Mean of intervals 0015-0100
+    bus.get('basis', DAY)
+    bus.get('hourly', DAY)
+    bus.get('basis', DAY, refresh=True)  # Re-fetched, but nothing changed
+    assert (len(hourly_calls), len(basis_calls)) == (1, 1)
+
+    prices[0] = prices[0] + 1
+    assert bus.get('hourly', DAY, refresh=True)['HB_NORTH'].iloc[0] == 3.5
+    assert len(hourly_calls) == 2
+    bus.get('basis', DAY)
+    assert len(basis_calls) == 2
+    bus.get('dam', DAY, refresh=True)
+    bus.get('basis', DAY)
+    assert len(basis_calls) == 2
@@ -0,0 +1,72 @@
+import numpy as np
+
+from ercot_dart.decimate import break_gaps, minmax_decimate, visible_slice
+
+
+# Function to build a gappy series: 15-minute steps with a 10-day hole in the middle
+def gappy_series(n=20000, hole=10.0):
+    x = np.arange(n) / 96.0
+    x[n // 2:] += hole
+    y = np.sin(np.arange(n) / 50.0) * 40 + 50
+    return x, y
+
+
+# Function to check that no drawn segment (two consecutive non-NaN points) spans a hole
+def spans_a_hole(x, y, holes):
+    drawn = ~(np.isnan(y[:-1]) | np.isnan(y[1:]))
+    left, right = x[:-1][drawn], x[1:][drawn]
+    return any(((left <= a) & (right >= b)).any() for a, b in holes)
+
+
+def test_gaps_survive_decimation():
+    x, y = break_gaps(*gappy_series(), max_step=1 / 48)
+    assert np.isnan(y).sum() == 1
+
+    dx, dy = minmax_decimate(x, y, 100)
+
+    assert len(dx) < len(x)
+    assert np.isnan(dy).sum() == 1
+    marker = np.flatnonzero(np.isnan(y))[0]
+    assert not spans_a_hole(dx, dy, [(x[marker - 1], x[marker + 1])])
+
+
+def test_several_gaps_in_one_bin_still_break_the_line():
+    x = np.arange(1000, dtype=np.float64)
+    x[400:] += 50
+    x[410:] += 50
+    y = np.ones(1000)
+    y[400:410] = 5
+    x, y = break_gaps(x, y, max_step=2)
+
+    dx, dy = minmax_decimate(x, y, 10)
+
+    assert np.isnan(dy).any()
+    assert not spans_a_hole(dx, dy, [(399, 450), (459, 510)])
+
+
+def test_spikes_and_time_order_are_kept():
+    x = np.arange(10000, dtype=np.float64)
+    y = np.zeros(10000)
+    y[1234] = 9000.0
+    y[8765] = -250.0
+
+    dx, dy = minmax_decimate(x, y, 50)
+
+    assert dy.max() == 9000.0
+    assert dy.min() == -250.0
+    assert (np.diff(dx) >= 0).all()
+    assert len(dx) <= 3 * 50
+
+
+def test_short_series_are_returned_as_is():
+    x = np.arange(10.0)
+    dx, dy = minmax_decimate(x, x * 2, 100)
+    assert dx is x
+
+
+def test_break_gaps_and_visible_slice():
+    x = np.array([0.0, 1.0, 2.0, 10.0, 11.0])
+    bx, by = break_gaps(x, x.copy(), max_step=1.5)
+    assert np.isnan(by).sum() == 1
+    assert bx[3] == 2.75
+    assert visible_slice(x, 1.5, 10.5) == slice(1, 5)
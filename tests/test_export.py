@@ -0,0 +1,77 @@
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+from dst_pages import dam_page, rt_spp_page, without_flag
+
+from ercot_dart import export
+from ercot_dart.export import export_range
+
+FALL_BACK = date(2024, 11, 3)
+START, END = FALL_BACK - timedelta(days=1), FALL_BACK + timedelta(days=1)
+
+
+@pytest.fixture(autouse=True)
+def pages(monkeypatch):
+    monkeypatch.setattr(export, 'load_real_time_spp_day',
+                        lambda day, **_kwargs: rt_spp_page(day))
+    # Only the November pages come with a Repeated Hour Flag column
+    monkeypatch.setattr(export, 'load_dam_day',
+                        lambda day, **_kwargs: dam_page(day) if day.month == 11
+                        else without_flag(dam_page(day)))
+
+
+# Function to read an export back the way a user would
+def read_back(path, fmt):
+    if fmt == 'parquet':
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype={'Repeated Hour Flag': str})
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'csv.gz', 'parquet'])
+def test_hourly_export_round_trips(tmp_path, fmt):
+    path = str(tmp_path / f'hourly.{fmt}')
+
+    rows = export_range('hourly', START, END, path)
+
+    expected = pd.concat([export.hourly_day(START + timedelta(days=offset))
+                          for offset in range(3)], ignore_index=True)
+    assert rows == len(expected) == 24 + 25 + 24
+    result = read_back(path, fmt)
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert os.listdir(tmp_path) == [f'hourly.{fmt}']
+
+
+def test_dam_days_without_a_flag_column_get_one(tmp_path):
+    path = str(tmp_path / 'dam.csv')
+
+    assert export_range('dam', date(2024, 10, 31), date(2024, 11, 1), path) == 24 + 25
+    result = read_back(path, 'csv')
+    assert list(result.columns) == ['Oper Day', 'Hour Ending', 'Repeated Hour Flag',
+                                    'HB_NORTH']
+    assert result['Repeated Hour Flag'].tolist() == ['N'] * 26 + ['Y'] + ['N'] * 22
+
+
+def test_points_filter_keeps_only_the_chosen_points(tmp_path):
+    path = str(tmp_path / 'hourly.parquet')
+
+    export_range('hourly', START, START, path, points=['HB_WEST'])
+
+    result = read_back(path, 'parquet')
+    assert list(result.columns) == ['Oper Day', 'Hour Ending', 'Repeated Hour Flag',
+                                    'HB_WEST']
+    assert len(result) == 24
+
+
+def test_cancel_removes_the_partial_file(tmp_path):
+    path = str(tmp_path / 'hourly.csv')
+    done = []
+
+    with pytest.raises(InterruptedError):
+        export_range('hourly', START, END, path,
+                     progress=lambda finished, _total, _day: done.append(finished),
+                     cancel=lambda: len(done) == 2)
+    assert done == [1, 2]
+    assert os.listdir(tmp_path) == []
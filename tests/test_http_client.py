@@ -0,0 +1,105 @@
+import socket
+
+import pytest
+import requests
+
+from ercot_dart.http_client import HttpClient
+
+
+# Function to build a client that records its back-off sleeps instead of sleeping
+def make_client(**kwargs):
+    sleeps = []
+    client = HttpClient(connect_timeout=1.0, read_timeout=2.0, sleep=sleeps.append,
+                        **kwargs)
+    return client, sleeps
+
+
+def test_retries_server_errors_then_succeeds(stub_server):
+    stub_server.script((503, {}, b'busy'), (502, {}, b'bad gateway'),
+                       (200, {}, b'prices'))
+    client, sleeps = make_client(max_retries=3)
+
+    response = client.get(stub_server.url + '/page.html')
+
+    assert response.status_code == 200
+    assert response.content == b'prices'
+    assert len(stub_server.requests) == 3
+    assert len(sleeps) == 2
+    stats = client.stats()[stub_server.url[len('http://'):]]
+    assert (stats['requests'], stats['errors'], stats['retries']) == (3, 2, 2)
+
+
+def test_gives_up_after_max_retries(stub_server):
+    stub_server.script((503, {}, b'busy'))
+    client, sleeps = make_client(max_retries=2)
+
+    response = client.get(stub_server.url + '/page.html')
+
+    assert response.status_code == 503  # Left for the caller's raise_for_status
+    assert len(stub_server.requests) == 3
+    assert len(sleeps) == 2
+
+
+def test_client_errors_are_not_retried(stub_server):
+    stub_server.script((404, {}, b'missing'))
+    client, sleeps = make_client(max_retries=3)
+
+    assert client.get(stub_server.url + '/page.html').status_code == 404
+    assert len(stub_server.requests) == 1
+    assert sleeps == []
+
+
+def test_retry_after_is_honoured(stub_server):
+    stub_server.script((429, {'Retry-After': '4'}, b'slow down'), (200, {}, b'ok'))
+    client, sleeps = make_client(backoff_base=0.01, backoff_max=10.0)
+
+    assert client.get(stub_server.url + '/page.html').status_code == 200
+    assert sleeps == [4.0]
+
+
+def test_backoff_is_jittered_and_capped():
+    client, _ = make_client(backoff_base=0.5, backoff_max=3.0)
+    for attempt in range(6):
+        delays = [client.backoff(attempt) for _ in range(200)]
+        assert min(delays) >= 0
+        assert max(delays) <= min(3.0, 0.5 * 2 ** attempt)
+    assert len(set(delays)) > 1
+
+
+def test_connection_errors_are_retried_then_raised():
+    # A port nothing listens on: every attempt is refused
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    client, sleeps = make_client(max_retries=2)
+
+    with pytest.raises(requests.ConnectionError):
+        client.get(f'http://127.0.0.1:{port}/page.html')
+    assert len(sleeps) == 2
+    assert client.stats()[f'127.0.0.1:{port}']['errors'] == 3
+
+
+def test_conditional_get_headers_are_sent_and_304_is_returned(stub_server):
+    stub_server.script((304, {'ETag': '"v1"'}, b''))
+    client, sleeps = make_client()
+
+    since = 'Thu, 01 Aug 2024 10:25:13 GMT'
+    response = client.get(stub_server.url + '/page.html',
+                          headers={'If-None-Match': '"v1"', 'If-Modified-Since': since})
+
+    assert response.status_code == 304
+    assert sleeps == []
+    _, headers = stub_server.requests[0]
+    assert headers['If-None-Match'] == '"v1"'
+    assert headers['If-Modified-Since'] == since
+
+
+def test_connections_are_reused(stub_server):
+    stub_server.script((200, {}, b'ok'))
+    client, _ = make_client()
+
+    for _ in range(3):
+        assert client.get(stub_server.url + '/page.html').content == b'ok'
+
+    assert len(stub_server.requests) == 3
+    assert len(stub_server.client_ports) == 1
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from ercot_dart.lmp_history import LmpHistory
+from ercot_dart.price_store import PriceStore, record_scrape
+
+POINTS = ['HB_NORTH', 'HB_WEST']
+START = pytz.timezone('US/Central').localize(datetime(2024, 8, 1, 10, 0))
+
+
+# Function to append one snapshot per row of prices, five minutes apart
+def fill(history, rows, points=POINTS):
+    for i, prices in enumerate(rows):
+        history.append(START + timedelta(minutes=5 * i), points, prices)
+
+
+def test_ring_buffer_keeps_the_latest_snapshots_past_capacity():
+    history = LmpHistory(days=1, snapshots_per_day=4)
+    fill(history, [[i, 10 * i] for i in range(6)])
+
+    times, prices = history.window()
+    assert len(history) == 4
+    expected = [START + timedelta(minutes=5 * i) for i in range(2, 6)]
+    assert list(pd.to_datetime(times, utc=True)) == expected
+    assert prices.tolist() == [[2, 20], [3, 30], [4, 40], [5, 50]]
+
+    # The same snapshot again replaces the last row instead of adding one
+    history.append(START + timedelta(minutes=25), POINTS, [7, 70])
+    assert len(history) == 4
+    assert history.window(1)[1].tolist() == [[7, 70]]
+
+
+def test_price_and_jump_thresholds():
+    history = LmpHistory()
+    fill(history, [[20, 20], [20, 20], [1000, 125]])
+
+    assert history.spikes(price=1000, jump=0).tolist() == [True, False]
+    assert history.spikes(price=0, jump=100).tolist() == [True, True]
+    assert history.spikes(price=0, jump=0).tolist() == [False, False]
+
+
+def test_zscore_threshold_needs_a_baseline():
+    baseline = [[20 + i % 2, 20] for i in range(12)]
+    history = LmpHistory()
+    fill(history, baseline + [[40, 30]])
+
+    # HB_NORTH is 4 floored stds above its baseline, HB_WEST only 2
+    assert history.spikes(z=3, price=0, jump=0).tolist() == [True, False]
+    zscore = history.rolling()[3][-1]
+    assert np.allclose(zscore, [(40 - 20.5) / 5, (30 - 20) / 5])
+
+    short = LmpHistory()
+    fill(short, baseline[:5] + [[40, 30]])
+    assert short.spikes(z=3, price=0, jump=0).tolist() == [False, False]
+
+
+def test_latest_spikes_follow_the_row_order_of_the_last_snapshot():
+    history = LmpHistory()
+    fill(history, [[20, 20]])
+    history.append(START + timedelta(minutes=5), ['LZ_WEST', 'HB_WEST', 'HB_NORTH'],
+                   [20, 2000, 20])
+
+    assert history.points == ['HB_NORTH', 'HB_WEST', 'LZ_WEST']
+    assert history.latest_spikes(jump=0).tolist() == [False, True, False]
+
+
+def test_load_store_carries_unchanged_points_forward(tmp_path):
+    store = PriceStore(str(tmp_path))
+    changes = [(['HB_NORTH', 'HB_WEST'], [20.0, 30.0]), (['HB_NORTH'], [25.0])]
+    for i, (points, lmps) in enumerate(changes):
+        snapshot = pd.DataFrame({'Settlement Point': points, 'LMP': lmps,
+                                 '5 Min Change to LMP': [0.0] * len(points)})
+        record_scrape('lmp', snapshot, START + timedelta(minutes=5 * i), store=store)
+
+    history = LmpHistory()
+    assert history.load_store(store, START + timedelta(hours=1)) == 2
+    _, prices = history.window()
+    assert history.points == ['HB_NORTH', 'HB_WEST']
+    assert prices.tolist() == [[20, 30], [25, 30]]
@@ -0,0 +1,35 @@
+import os
+from datetime import date
+
+from ercot_dart import lmp_tracker
+from ercot_dart.lmp_tracker import LmpChangeTracker
+from ercot_dart.price_store import PriceStore
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'fixtures')
+
+
+# Function to make a copy of the RT LMP page stamped at `stamp` with HB_BUSAVG at `lmp`
+def lmp_page(stamp, lmp):
+    with open(os.path.join(FIXTURE_DIR, 'hb_lz.html'), 'rb') as f:
+        page = f.read()
+    page = page.replace(b'Aug 01, 2024 10:25:13', stamp.encode())
+    return page.replace(b'>21.05<', f'>{lmp:.2f}<'.encode(), 1)
+
+
+def test_previous_day_is_compacted_when_the_day_rolls_over(tmp_path, monkeypatch):
+    pages = [lmp_page('Aug 01, 2024 23:50:13', 21.05),
+             lmp_page('Aug 01, 2024 23:55:13', 22.10),
+             lmp_page('Aug 02, 2024 00:00:13', 23.15)]
+    monkeypatch.setattr(lmp_tracker, 'fetch_page', lambda _url: pages.pop(0))
+    store = PriceStore(str(tmp_path))
+    tracker = LmpChangeTracker(store=store)
+
+    tracker.poll('hb_lz')
+    tracker.poll('hb_lz')
+    day_dir = os.path.join(str(tmp_path), 'lmp', 'date=2024-08-01')
+    assert len(os.listdir(day_dir)) == 2
+
+    tracker.poll('hb_lz')
+    assert os.listdir(day_dir) == ['part-0.parquet']
+    assert len(store.load('lmp', date(2024, 8, 1), date(2024, 8, 1))) == 16
+    assert store.has_day('lmp', date(2024, 8, 2))
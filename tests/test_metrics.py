@@ -0,0 +1,66 @@
+import pstats
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ercot_dart.metrics import Metrics, Profiler
+
+
+def test_prometheus_text_exposition():
+    metrics = Metrics()
+    metrics.inc('rows_parsed_total', 24, feed='dam')
+    metrics.inc('rows_parsed_total', 96, feed='spp')
+    metrics.observe('parse', 0.02, feed='dam')
+    metrics.observe('parse', 3.0, True, feed='dam')
+    metrics.add_collector(lambda: [('cache_entries', {'dir': 'a"b'}, 7, 'gauge')])
+
+    lines = metrics.prometheus_text().splitlines()
+
+    assert lines[:4] == [
+        '# TYPE ercot_dart_rows_parsed_total counter',
+        'ercot_dart_rows_parsed_total{feed="dam"} 24',
+        'ercot_dart_rows_parsed_total{feed="spp"} 96',
+        '# TYPE ercot_dart_cache_entries gauge',
+    ]
+    assert lines[4] == 'ercot_dart_cache_entries{dir="a\\"b"} 7'
+    assert lines.count('# TYPE ercot_dart_stage_seconds histogram') == 1
+    bucket = 'ercot_dart_stage_seconds_bucket{stage="parse",feed="dam",le="%s"} %d'
+    assert bucket % ('0.01', 0) in lines
+    assert bucket % ('0.025', 1) in lines
+    assert bucket % ('5.0', 2) in lines
+    assert bucket % ('+Inf', 2) in lines
+    assert 'ercot_dart_stage_seconds_count{stage="parse",feed="dam"} 2' in lines
+    assert 'ercot_dart_stage_errors_total{stage="parse",feed="dam"} 1' in lines
+    assert 'ercot_dart_stage_max_seconds{stage="parse",feed="dam"} 3.0' in lines
+
+
+def test_span_times_the_block_and_counts_errors():
+    metrics = Metrics()
+
+    with metrics.span('fetch', feed='rt'):
+        time.sleep(0.05)
+    with pytest.raises(OSError), metrics.span('fetch', feed='rt'):
+        raise OSError("timed out")
+
+    (stats,) = metrics.snapshot()['spans']
+    assert stats['labels'] == {'feed': 'rt'}
+    assert (stats['count'], stats['errors']) == (2, 1)
+    assert 0.05 <= stats['total_seconds'] < 1.0
+    assert stats['max_seconds'] >= 0.05
+
+
+def busy_parse(n):
+    return sum(i * i for i in range(n))
+
+
+def test_cprofile_covers_pool_threads(tmp_path):
+    output = str(tmp_path / 'run.prof')
+    profiler = Profiler('cprofile', output, top=5).start()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(busy_parse, [10000] * 4))
+    profiler.stop()
+
+    stats = pstats.Stats(output).stats
+    calls = {func[2]: info[1] for func, info in stats.items()}
+    assert calls['busy_parse'] == 4
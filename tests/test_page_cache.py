@@ -0,0 +1,80 @@
+import os
+import time
+from datetime import date, datetime, timedelta
+
+from ercot_dart.http_client import HttpClient
+from ercot_dart.page_cache import PageCache, cst, is_final, operating_day_from_url
+
+
+def make_cache(directory, **kwargs):
+    client = HttpClient(sleep=lambda _seconds: None)
+    return PageCache(directory=str(directory), client=client, **kwargs)
+
+
+# Function to get a dated CDR-style url for an operating day
+def day_url(server, day):
+    return f"{server.url}/{day:%Y%m%d}_dam_spp.html"
+
+
+def test_revalidates_with_etag_and_serves_body_on_304(stub_server, tmp_path):
+    today = datetime.now(cst).date()
+    url = day_url(stub_server, today)  # Today's page can still change
+    modified = 'Thu, 01 Aug 2024 10:25:13 GMT'
+    stub_server.script((200, {'ETag': '"v1"', 'Last-Modified': modified}, b'v1'),
+                       (304, {'ETag': '"v1"'}, b''))
+    cache = make_cache(tmp_path)
+
+    assert cache.fetch(url) == b'v1'
+    assert cache.fetch(url) == b'v1'
+
+    _, headers = stub_server.requests[1]
+    assert headers['If-None-Match'] == '"v1"'
+    assert headers['If-Modified-Since'] == modified
+    stats = cache.stats()
+    assert (stats['misses'], stats['revalidated'], stats['hits']) == (1, 1, 0)
+
+
+def test_changed_page_replaces_the_cached_copy(stub_server, tmp_path):
+    url = day_url(stub_server, datetime.now(cst).date())
+    stub_server.script((200, {'ETag': '"v1"'}, b'v1'), (200, {'ETag': '"v2"'}, b'v2'),
+                       (304, {'ETag': '"v2"'}, b''))
+    cache = make_cache(tmp_path)
+
+    assert [cache.fetch(url) for _ in range(3)] == [b'v1', b'v2', b'v2']
+    assert stub_server.requests[2][1]['If-None-Match'] == '"v2"'
+
+
+def test_final_pages_are_served_without_a_request(stub_server, tmp_path):
+    url = day_url(stub_server, date(2024, 8, 1))  # Settled long ago
+    stub_server.script((200, {'ETag': '"v1"'}, b'settled'))
+    cache = make_cache(tmp_path)
+
+    assert cache.fetch(url) == b'settled'
+    assert cache.fetch(url) == b'settled'
+    assert len(stub_server.requests) == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_is_final_waits_for_the_grace_period():
+    url = 'https://example.test/content/cdr/html/20240801_dam_spp.html'
+    assert operating_day_from_url(url) == date(2024, 8, 1)
+    day_end = cst.localize(datetime(2024, 8, 2))
+    assert not is_final(url, (day_end + timedelta(minutes=30)).timestamp())
+    assert is_final(url, (day_end + timedelta(hours=2)).timestamp())
+    assert not is_final('https://example.test/content/cdr/html/hb_lz.html', 2e9)
+
+
+def test_evicts_least_recently_used_pages_over_max_bytes(stub_server, tmp_path):
+    stub_server.script((200, {}, b'x' * 1000))
+    cache = make_cache(tmp_path, max_bytes=2500)
+    urls = [day_url(stub_server, date(2024, 8, day)) for day in (1, 2, 3)]
+    now = time.time()
+    for age, url in enumerate(urls):
+        cache.fetch(url)
+        # Space the last-used times out so the eviction order is deterministic
+        body_path, _ = cache._paths(url)
+        os.utime(body_path, (now - 100 + age, now - 100 + age))
+    cache.evict()
+
+    assert not os.path.exists(cache._paths(urls[0])[0])
+    assert all(os.path.exists(cache._paths(url)[0]) for url in urls[1:])
@@ -0,0 +1,60 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+from dst_pages import dam_page, rt_spp_page, without_flag
+
+from ercot_dart.aggregation import resample_prices
+from ercot_dart.price_frames import dam_to_long, long_to_wide, spp_to_long
+
+FALL_BACK = date(2024, 11, 3)
+SPRING_FORWARD = date(2024, 3, 10)
+ORDINARY = date(2024, 8, 1)
+
+
+@pytest.mark.parametrize('day', [FALL_BACK, SPRING_FORWARD, ORDINARY])
+def test_rt_spp_round_trip(day):
+    page = rt_spp_page(day)
+    wide = long_to_wide(spp_to_long(page), 'Interval Ending', 15)
+
+    assert wide['Interval Ending'].tolist() == page['Interval Ending'].tolist()
+    assert wide['HB_NORTH'].tolist() == page['HB_NORTH'].tolist()
+    pd.testing.assert_frame_equal(spp_to_long(wide), spp_to_long(page))
+
+
+def test_fall_back_round_trip_keeps_the_repeated_hour():
+    page = rt_spp_page(FALL_BACK)
+    wide = long_to_wide(spp_to_long(page), 'Interval Ending', 15)
+
+    assert wide['Repeated Hour Flag'].tolist() == page['Repeated Hour Flag'].tolist()
+    assert spp_to_long(wide)['interval_end'].nunique() == 100
+    # The store keeps no flag, so the same must hold for pages that never had one
+    unflagged = long_to_wide(spp_to_long(without_flag(page)), 'Interval Ending', 15)
+    pd.testing.assert_frame_equal(unflagged, wide)
+
+
+def test_fall_back_hourly_averages_survive_the_round_trip():
+    page = rt_spp_page(FALL_BACK)
+    wide = long_to_wide(spp_to_long(page), 'Interval Ending', 15)
+
+    hourly = resample_prices(wide, 'hour')
+    pd.testing.assert_frame_equal(hourly, resample_prices(page, 'hour'))
+    assert hourly['HB_NORTH'].tolist()[:3] == [2.5, 6.5, 10.5]
+
+
+def test_ordinary_days_keep_the_page_layout():
+    wide = long_to_wide(spp_to_long(rt_spp_page(ORDINARY)), 'Interval Ending', 15)
+    assert list(wide.columns) == ['Oper Day', 'Interval Ending', 'HB_NORTH', 'HB_WEST']
+
+
+@pytest.mark.parametrize('day', [FALL_BACK, SPRING_FORWARD, ORDINARY])
+def test_dam_round_trip(day):
+    page = dam_page(day)
+    wide = long_to_wide(dam_to_long(page), 'Hour Ending', 60)
+
+    assert wide['Hour Ending'].tolist() == page['Hour Ending'].tolist()
+    assert wide['HB_NORTH'].tolist() == page['HB_NORTH'].tolist()
+    if day == FALL_BACK:
+        flags = page['Repeated Hour Flag'].tolist()
+        assert wide['Repeated Hour Flag'].tolist() == flags
+    pd.testing.assert_frame_equal(dam_to_long(wide), dam_to_long(page))